@@ -0,0 +1,41 @@
+"""
+Débit (requêtes par seconde) de `SearchEngine.search_batch` comparé à des appels
+successifs à `SearchEngine.search`.
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.batch_throughput
+"""
+
+import time
+import numpy as np
+from Benchmarks.synthetic import synthetic_corpus
+from Classes.SearchEngine import SearchEngine
+
+NDOC = 20000
+N_QUERIES = 5000
+
+
+def random_queries(engine, n_queries, seed=0):
+    """
+    Tire des requêtes de un à quatre mots du vocabulaire du moteur.
+    """
+    rng = np.random.default_rng(seed)
+    words = np.array(list(engine.vocab))
+    return [list(rng.choice(words, rng.integers(1, 5))) for _ in range(n_queries)]
+
+
+if __name__ == "__main__":
+    engine = SearchEngine(synthetic_corpus(NDOC))
+    queries = random_queries(engine, N_QUERIES)
+
+    start = time.perf_counter()
+    for query in queries[:500]:
+        engine.search(query, top_n=10)
+    single = 500 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    engine.search_batch(queries, top_n=10)
+    batch = N_QUERIES / (time.perf_counter() - start)
+
+    print(f"search       : {single:>10.0f} requêtes/s")
+    print(f"search_batch : {batch:>10.0f} requêtes/s ({N_QUERIES} requêtes, {NDOC} documents)")
@@ -0,0 +1,71 @@
+"""
+Sauvegarde et chargement d'un corpus : format JSON comparé au format binaire en
+colonnes (`Corpus.save_to_binary` / `Corpus.load_from_binary`).
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.binary_corpus
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+from Benchmarks.synthetic import synthetic_corpus
+from Classes.Corpus import Corpus
+
+SIZES = [10000, 40000]
+
+
+def disk_size_mb(path):
+    """
+    Taille sur disque d'un fichier ou d'un répertoire, en Mo.
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path) / 1024**2
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)) / 1024**2
+
+
+def timed(function):
+    """
+    Exécute `function` sans afficher ses messages et retourne sa durée en secondes.
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+    return time.perf_counter() - start
+
+
+def load(method, path):
+    """
+    Charge un corpus neuf avec la méthode donnée et retourne ce corpus.
+    """
+    Corpus.reset_instance()
+    corpus = Corpus("Chargement")
+    getattr(corpus, method)(path)
+    return corpus
+
+
+if __name__ == "__main__":
+    print(
+        f"{'ndoc':>8} {'format':>8} {'disque (Mo)':>12} {'sauvegarde (s)':>15} "
+        f"{'chargement (s)':>15} {'+ textes (s)':>13}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for ndoc in SIZES:
+            corpus = synthetic_corpus(ndoc)
+            for name, save, method, path in [
+                ("json", "save_to_json", "load_from_json", f"{directory}/c{ndoc}.json"),
+                ("binaire", "save_to_binary", "load_from_binary", f"{directory}/c{ndoc}.qpc"),
+            ]:
+                save_time = timed(lambda: getattr(corpus, save)(path))
+                loaded = []
+                load_time = timed(lambda: loaded.append(load(method, path)))
+                text_time = timed(
+                    lambda: [doc.text for doc in loaded[0].id2doc.values()]
+                )
+                print(
+                    f"{ndoc:>8} {name:>8} {disk_size_mb(path):>12.1f} {save_time:>15.2f} "
+                    f"{load_time:>15.2f} {load_time + text_time:>13.2f}"
+                )
+            Corpus.reset_instance()
@@ -0,0 +1,75 @@
+"""
+Latence des requêtes booléennes de `SearchEngine.search_query` face à la recherche
+par mots-clés (`search`), en fonction de la taille du corpus.
+
+Chaque requête associe un mot fréquent à un mot rare : par mots-clés, tous les
+documents contenant l'un des deux mots sont évalués ; en conjonction (`AND`), les
+postings sont d'abord intersectés par sauts exponentiels et seuls les documents qui
+contiennent les deux mots sont évalués. Les expressions (`"a b"`) et proximités
+(`a NEAR/5 b`) vérifient en outre les positions des documents restants.
+
+Seule l'évaluation est mesurée (documents retenus et scores) : la mise en forme des
+résultats (`SearchEngine.results_frame`) est commune aux deux recherches.
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.boolean_queries
+"""
+
+import numpy as np
+from Benchmarks.query_latency import rare_queries, timeit
+from Benchmarks.synthetic import synthetic_corpus
+from Classes.BooleanQuery import parse_query
+from Classes.SearchEngine import SearchEngine
+
+SIZES = [2000, 8000, 32000]
+N_QUERIES = 200
+
+
+def frequent_words(engine, n_words, seed=0):
+    """
+    Tire des mots présents dans au moins un document sur dix.
+    """
+    rng = np.random.default_rng(seed)
+    doc_count = np.diff(engine.index.indptr)
+    words = np.array(list(engine.vocab))
+    frequent = words[doc_count >= engine.n_docs / 10]
+    return list(rng.choice(frequent, n_words))
+
+
+def keyword_scores(engine, pair):
+    """
+    Évaluation de `search` : tous les documents contenant l'un des mots.
+    """
+    return engine.scorer.score(engine, engine.query_term_ids(list(pair)))
+
+
+def boolean_scores(engine, query):
+    """
+    Évaluation de `search_query` : intersection des postings positionnels, puis
+    scores des seuls documents retenus.
+    """
+    node = parse_query(query)
+    doc_ids = np.asarray(node.documents(engine.corpus.get_positional_index()), dtype=np.int64)
+    return engine.scorer.score(engine, engine.query_term_ids(node.terms()), doc_ids)
+
+
+if __name__ == "__main__":
+    print(
+        f"{'ndoc':>8} {'mots-clés (µs)':>15} {'AND (µs)':>10} "
+        f"{'expression (µs)':>16} {'NEAR/5 (µs)':>12}"
+    )
+    for ndoc in SIZES:
+        corpus = synthetic_corpus(ndoc)
+        engine = SearchEngine(corpus)
+        corpus.get_positional_index()
+        pairs = list(
+            zip(
+                frequent_words(engine, N_QUERIES),
+                [query[0] for query in rare_queries(engine, N_QUERIES)],
+            )
+        )
+        keywords = timeit(lambda pair: keyword_scores(engine, pair), pairs)
+        conjunction = timeit(lambda pair: boolean_scores(engine, " AND ".join(pair)), pairs)
+        phrase = timeit(lambda pair: boolean_scores(engine, f'"{pair[0]} {pair[1]}"'), pairs)
+        near = timeit(lambda pair: boolean_scores(engine, f"{pair[0]} NEAR/5 {pair[1]}"), pairs)
+        print(f"{ndoc:>8} {keywords:>15.1f} {conjunction:>10.1f} {phrase:>16.1f} {near:>12.1f}")
@@ -0,0 +1,104 @@
+"""
+Mémoire occupée par document (hors texte) : représentation d'origine (objets à
+`__dict__`, chaînes non internées, production des auteurs en liste de références)
+face aux classes actuelles (`__slots__`, auteurs et dates internés, production en
+tableau d'identifiants).
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.document_memory
+"""
+
+import gc
+import tracemalloc
+from Classes.Author import Author
+from Classes.Document import RedditDocument, ArxivDocument
+
+SIZES = [10000, 100000]
+TEXT = "texte partagé par tous les documents, exclu de la mesure"
+
+
+class LegacyDocument:
+    """
+    Document tel qu'il était représenté avant : attributs dans un `__dict__`.
+    """
+
+    def __init__(self, title, author, date, url, text, num_comments=None, co_authors=None):
+        self.title = title
+        self.author = author
+        self.date = date
+        self.url = url
+        self.text = text
+        if co_authors is None:
+            self.num_comments = num_comments
+        else:
+            self.co_authors = co_authors
+
+
+class LegacyAuthor:
+    """
+    Auteur tel qu'il était représenté avant : liste de références vers les documents.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.ndoc = 0
+        self.production = []
+
+    def add(self, production):
+        self.ndoc += 1
+        self.production.append(production)
+
+
+def fields(i):
+    """
+    Champs du document `i`, construits comme à la lecture d'un fichier JSON : chaque
+    document reçoit ses propres objets chaînes, même pour des valeurs répétées.
+    """
+    date = f"{2015 + i % 10}/{1 + i % 12:02d}/{1 + i % 28:02d}"
+    return f"Titre {i}", f"Auteur {i % 997}", date, f"http://synthetic/{i}", [f"Auteur {i % 491}"]
+
+
+def build(ndoc, legacy):
+    """
+    Construit `ndoc` documents (moitié Reddit, moitié ArXiv) et leurs auteurs.
+    """
+    documents, authors = {}, {}
+    for i in range(ndoc):
+        title, author, date, url, co_authors = fields(i)
+        if legacy:
+            if i % 2:
+                doc = LegacyDocument(title, author, date, url, TEXT, co_authors=co_authors)
+            else:
+                doc = LegacyDocument(title, author, date, url, TEXT, num_comments=i % 50)
+        elif i % 2:
+            doc = ArxivDocument(title, author, co_authors, date, url, TEXT)
+        else:
+            doc = RedditDocument(title, author, date, url, TEXT, i % 50)
+        documents[i] = doc
+        names = [doc.author] + (doc.co_authors if i % 2 else [])
+        for name in names:
+            if name not in authors:
+                authors[name] = LegacyAuthor(name) if legacy else Author(name, documents)
+            authors[name].add(doc if legacy else i)
+    return documents, authors
+
+
+def bytes_per_document(ndoc, legacy):
+    """
+    Mesure (avec tracemalloc) la mémoire allouée par document.
+    """
+    gc.collect()
+    tracemalloc.start()
+    corpus = build(ndoc, legacy)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del corpus
+    return current / ndoc
+
+
+if __name__ == "__main__":
+    print(f"{'ndoc':>8} {'avant (o/doc)':>14} {'après (o/doc)':>14} {'gain':>6}")
+    for ndoc in SIZES:
+        before = bytes_per_document(ndoc, legacy=True)
+        after = bytes_per_document(ndoc, legacy=False)
+        print(f"{ndoc:>8} {before:>14.0f} {after:>14.0f} {1 - after / before:>6.0%}")
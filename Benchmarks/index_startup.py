@@ -0,0 +1,36 @@
+"""
+Temps de démarrage d'un moteur de recherche : construction complète depuis le corpus
+comparée au chargement (projeté en mémoire ou non) d'un index sauvegardé.
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.index_startup
+"""
+
+import tempfile
+import time
+from Benchmarks.synthetic import synthetic_corpus
+from Classes.SearchEngine import SearchEngine
+
+NDOC = 50000
+
+
+if __name__ == "__main__":
+    corpus = synthetic_corpus(NDOC)
+
+    start = time.perf_counter()
+    engine = SearchEngine(corpus)
+    build = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as path:
+        engine.save(path)
+        timings = {}
+        for mmap in (False, True):
+            start = time.perf_counter()
+            loaded = SearchEngine.load(path, corpus, mmap=mmap)
+            loaded.search(["virus"])
+            timings[mmap] = time.perf_counter() - start
+
+    print(f"{NDOC} documents, {len(engine.vocab)} termes")
+    print(f"construction        : {build * 1000:>10.1f} ms")
+    print(f"chargement          : {timings[False] * 1000:>10.1f} ms")
+    print(f"chargement (mmap)   : {timings[True] * 1000:>10.1f} ms")
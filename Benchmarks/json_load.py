@@ -0,0 +1,62 @@
+"""
+Pic de mémoire allouée pendant la lecture d'un fichier JSON de corpus : `json.load`
+comparé à la lecture en flux de `Corpus.read_json_batches`, en fonction du nombre de
+documents. Les documents lus ne sont pas conservés, afin de ne mesurer que le coût
+de la lecture.
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.json_load
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import tracemalloc
+from Benchmarks.synthetic import synthetic_corpus
+from Classes.Corpus import Corpus
+
+SIZES = [5000, 10000, 20000, 40000]
+
+
+def peak_mb(function):
+    """
+    Exécute `function` et retourne le pic de mémoire allouée (en Mo).
+    """
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024**2
+
+
+def read_streaming(filename):
+    """
+    Lit le fichier lot par lot sans conserver les documents.
+    """
+    for _ in Corpus.read_json_batches(filename, batch_size=1000):
+        pass
+
+
+def read_json_load(filename):
+    """
+    Lit le fichier d'un bloc avec `json.load`.
+    """
+    with open(filename, "r", encoding="utf-8") as f:
+        json.load(f)
+
+
+if __name__ == "__main__":
+    print(f"{'ndoc':>8} {'fichier (Mo)':>13} {'json.load (Mo)':>15} {'flux (Mo)':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for ndoc in SIZES:
+            filename = os.path.join(directory, f"corpus_{ndoc}.json")
+            with contextlib.redirect_stdout(io.StringIO()):
+                synthetic_corpus(ndoc).save_to_json(filename)
+            Corpus.reset_instance()
+            size = os.path.getsize(filename) / 1024**2
+            print(
+                f"{ndoc:>8} {size:>13.1f} {peak_mb(lambda: read_json_load(filename)):>15.1f} "
+                f"{peak_mb(lambda: read_streaming(filename)):>10.1f}"
+            )
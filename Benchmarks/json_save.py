@@ -0,0 +1,29 @@
+"""
+Temps de sauvegarde JSON (`Corpus.save_to_json`) en fonction du nombre de documents.
+Le temps par document doit rester constant : la sauvegarde est linéaire en `ndoc`.
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.json_save
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+from Benchmarks.synthetic import synthetic_corpus
+
+SIZES = [5000, 10000, 20000, 40000]
+
+
+if __name__ == "__main__":
+    print(f"{'ndoc':>8} {'total (s)':>10} {'par doc (µs)':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for ndoc in SIZES:
+            corpus = synthetic_corpus(ndoc)
+            filename = os.path.join(directory, f"corpus_{ndoc}.json")
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                corpus.save_to_json(filename, atomic=True)
+            elapsed = time.perf_counter() - start
+            print(f"{ndoc:>8} {elapsed:>10.2f} {elapsed / ndoc * 1e6:>14.1f}")
@@ -0,0 +1,53 @@
+"""
+Latence de `Corpus.search` (index positionnel) face à l'ancien parcours par
+expression régulière du texte complet, pour des mots rares, selon la taille du corpus.
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.keyword_search
+"""
+
+import re
+import time
+import numpy as np
+from Benchmarks.synthetic import synthetic_corpus
+
+SIZES = [2000, 4000, 8000]
+N_QUERIES = 10
+
+
+def regex_search(full_text, keyword):
+    """
+    Référence : parcours du texte complet par expression régulière.
+    """
+    pattern = rf"(.{{0,30}}{re.escape(keyword)}.{{0,30}})"
+    return re.findall(pattern, full_text, re.IGNORECASE)
+
+
+def timeit(function, keywords):
+    """
+    Retourne la latence médiane (en millisecondes) de `function` sur les mots-clés.
+    """
+    timings = []
+    for keyword in keywords:
+        start = time.perf_counter()
+        function(keyword)
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1e3
+
+
+if __name__ == "__main__":
+    print(f"{'ndoc':>8} {'index (ms)':>12} {'regex (ms)':>12} {'construction (s)':>18}")
+    for ndoc in SIZES:
+        corpus = synthetic_corpus(ndoc)
+        start = time.perf_counter()
+        index = corpus.get_positional_index()
+        build = time.perf_counter() - start
+
+        rng = np.random.default_rng(0)
+        rare = [term for term, docs in index.postings.items() if 2 <= len(docs) <= 20]
+        keywords = list(rng.choice(rare, N_QUERIES, replace=False))
+        full_text = "\n".join(doc.text for doc in corpus.id2doc.values())
+
+        index_ms = timeit(index.concordance, keywords)
+        regex_ms = timeit(lambda keyword: regex_search(full_text, keyword), keywords)
+        print(f"{ndoc:>8} {index_ms:>12.3f} {regex_ms:>12.1f} {build:>18.2f}")
@@ -0,0 +1,72 @@
+"""
+Latence par requête de `SearchEngine.search` en fonction de la taille du corpus.
+
+Compare le parcours de l'index inversé au produit matrice-vecteur sur toute la
+matrice TF-IDF, pour des requêtes de deux mots rares.
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.query_latency
+"""
+
+import time
+import numpy as np
+from Benchmarks.synthetic import synthetic_corpus
+from Classes.SearchEngine import SearchEngine
+
+SIZES = [2000, 8000, 32000]
+N_QUERIES = 200
+
+
+def rare_queries(engine, n_queries, seed=0):
+    """
+    Tire des requêtes de deux termes apparaissant dans peu de documents.
+
+    Args:
+        engine (SearchEngine): Moteur de recherche construit.
+        n_queries (int): Nombre de requêtes.
+        seed (int): Graine du générateur aléatoire.
+
+    Returns:
+        list: Liste de requêtes (listes de deux mots).
+    """
+    rng = np.random.default_rng(seed)
+    doc_count = np.diff(engine.index.indptr)
+    words = np.array(list(engine.vocab))
+    rare = words[(doc_count >= 2) & (doc_count <= 20)]
+    return [list(rng.choice(rare, 2, replace=False)) for _ in range(n_queries)]
+
+
+def full_matrix_search(engine, query):
+    """
+    Référence : similarité cosinus calculée sur toute la matrice TF-IDF.
+    """
+    query_vector = np.zeros(len(engine.vocab), dtype=engine.dtype)
+    for word in query:
+        query_vector[engine.vocab[word]] = 1
+    dot = engine.mat_TFxIDF @ query_vector
+    return np.argsort(-dot / np.maximum(engine.doc_norms, 1e-12))[:10]
+
+
+def timeit(function, queries):
+    """
+    Retourne la latence médiane (en microsecondes) de `function` sur les requêtes.
+    """
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        function(query)
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1e6
+
+
+if __name__ == "__main__":
+    print(f"{'ndoc':>8} {'index (µs)':>12} {'matrice (µs)':>14}")
+    for ndoc in SIZES:
+        engine = SearchEngine(synthetic_corpus(ndoc))
+        queries = rare_queries(engine, N_QUERIES)
+        index_us = timeit(
+            lambda q: engine.index.cosine_scores(sorted(engine.vocab[w] for w in q)),
+            queries,
+        )
+        matrix_us = timeit(lambda q: full_matrix_search(engine, q), queries)
+        print(f"{ndoc:>8} {index_us:>12.1f} {matrix_us:>14.1f}")
@@ -0,0 +1,55 @@
+"""
+Latence et classement des modèles de pondération de `SearchEngine` : similarité
+cosinus TF-IDF (modèle historique), BM25 et BM25+, en fonction de la taille du corpus.
+
+Le recouvrement mesure la proportion des 10 premiers documents de BM25 (ou BM25+)
+qui figurent aussi parmi les 10 premiers de la similarité cosinus.
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.ranking_models
+"""
+
+import numpy as np
+from Benchmarks.query_latency import rare_queries, timeit
+from Benchmarks.synthetic import synthetic_corpus
+from Classes.Scorer import BM25PlusScorer, BM25Scorer, CosineScorer
+from Classes.SearchEngine import SearchEngine, top_k
+
+SIZES = [2000, 8000, 32000]
+N_QUERIES = 200
+TOP_N = 10
+SCORERS = {"cosinus": CosineScorer(), "BM25": BM25Scorer(), "BM25+": BM25PlusScorer()}
+
+
+def ranking(engine, scorer, term_ids):
+    """
+    Retourne les `TOP_N` premiers documents d'une requête selon un modèle.
+    """
+    doc_ids, scores = scorer.score(engine, term_ids)
+    return set(doc_ids[top_k(scores, TOP_N)].tolist())
+
+
+if __name__ == "__main__":
+    names = list(SCORERS)
+    header = " ".join(f"{name + ' (µs)':>14}" for name in names)
+    print(f"{'ndoc':>8} {header} {'recouvrement BM25':>18} {'recouvrement BM25+':>19}")
+    for ndoc in SIZES:
+        engine = SearchEngine(synthetic_corpus(ndoc))
+        queries = [
+            sorted(engine.vocab[word] for word in query)
+            for query in rare_queries(engine, N_QUERIES)
+        ]
+        latencies = [
+            timeit(lambda q, scorer=scorer: scorer.score(engine, q), queries)
+            for scorer in SCORERS.values()
+        ]
+        overlaps = []
+        for name in ["BM25", "BM25+"]:
+            overlap = [
+                len(ranking(engine, SCORERS["cosinus"], q) & ranking(engine, SCORERS[name], q))
+                / max(len(ranking(engine, SCORERS["cosinus"], q)), 1)
+                for q in queries
+            ]
+            overlaps.append(np.mean(overlap))
+        timings = " ".join(f"{latency:>14.1f}" for latency in latencies)
+        print(f"{ndoc:>8} {timings} {overlaps[0]:>18.2f} {overlaps[1]:>19.2f}")
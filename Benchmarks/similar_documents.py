@@ -0,0 +1,67 @@
+"""
+Rappel@10 et latence de la recherche de documents semblables par l'index de plus
+proches voisins approché (`SimilarityIndex`), selon le nombre de listes parcourues,
+face à la similarité cosinus exacte sur toute la matrice TF-IDF.
+
+Les textes synthétiques sont répartis en `N_TOPICS` thèmes : sans thème, des textes
+tirés indépendamment n'ont pas de voisins significatifs.
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.similar_documents
+"""
+
+import time
+import numpy as np
+from Benchmarks.synthetic import synthetic_corpus
+from Classes.SearchEngine import SearchEngine, top_k
+
+SIZES = [8000, 32000]
+N_QUERIES = 100
+N_PROBES = [1, 2, 4, 8, 16, 32]
+N_TOPICS = 50
+K = 10
+
+
+def exact_similar(engine, doc_id, k):
+    """
+    Référence : similarité cosinus du document avec tous les documents.
+    """
+    matrix = engine.mat_TFxIDF
+    dot = np.asarray((matrix @ matrix[doc_id].T).todense()).ravel()
+    scores = dot / np.maximum(engine.doc_norms * engine.doc_norms[doc_id], 1e-12)
+    scores[doc_id] = -1
+    return top_k(scores, k)
+
+
+def timed(function, doc_ids):
+    """
+    Retourne les résultats de `function` et sa latence médiane (en millisecondes).
+    """
+    results, timings = [], []
+    for doc_id in doc_ids:
+        start = time.perf_counter()
+        results.append(function(doc_id))
+        timings.append(time.perf_counter() - start)
+    return results, np.median(timings) * 1e3
+
+
+if __name__ == "__main__":
+    for ndoc in SIZES:
+        engine = SearchEngine(synthetic_corpus(ndoc, n_topics=N_TOPICS))
+        start = time.perf_counter()
+        index = engine.build_similarity_index()
+        build = time.perf_counter() - start
+        doc_ids = np.random.default_rng(0).choice(ndoc, N_QUERIES, replace=False)
+
+        expected, exact_ms = timed(lambda doc_id: set(exact_similar(engine, doc_id, K)), doc_ids)
+        print(
+            f"\nndoc = {ndoc} ({index.n_lists} listes, construction {build:.1f} s) : "
+            f"cosinus exact {exact_ms:.2f} ms"
+        )
+        print(f"{'n_probe':>8} {'rappel@10':>10} {'latence (ms)':>13}")
+        for n_probe in N_PROBES:
+            found, ann_ms = timed(
+                lambda doc_id: set(index.similar(doc_id, K, n_probe)[0].tolist()), doc_ids
+            )
+            recall = np.mean([len(f & e) / K for f, e in zip(found, expected)])
+            print(f"{n_probe:>8} {recall:>10.3f} {ann_ms:>13.2f}")
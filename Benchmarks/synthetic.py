@@ -0,0 +1,103 @@
+import json
+import os
+import numpy as np
+from Classes.Corpus import Corpus
+from Classes.Document import RedditDocument, ArxivDocument
+from tokenizer import NO_STOPWORDS, tokenize
+
+DATA_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "Data",
+    "coronavirus_data.json",
+)
+
+
+def base_words():
+    """
+    Extrait la liste des mots distincts présents dans le jeu de données COVID.
+
+    Returns:
+        list: Mots distincts (en minuscules) des titres et textes du fichier de données.
+    """
+    with open(DATA_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    words = set()
+    for rows in data.values():
+        for row in rows:
+            words.update(tokenize(row["title"], NO_STOPWORDS))
+            words.update(tokenize(row["text"], NO_STOPWORDS))
+    return sorted(words)
+
+
+def synthetic_texts(ndoc, vocab_size=50000, doc_len=120, seed=0, n_topics=0):
+    """
+    Génère des textes synthétiques dont les mots suivent une loi de Zipf.
+
+    Le vocabulaire part des mots du jeu de données COVID et est complété par des
+    mots artificiels jusqu'à atteindre `vocab_size`.
+
+    Avec `n_topics` thèmes, chaque texte appartient à un thème et la moitié de ses
+    mots suit la loi de Zipf sur un ordre du vocabulaire propre à ce thème : les
+    textes d'un même thème se ressemblent, comme dans un corpus réel.
+
+    Args:
+        ndoc (int): Nombre de textes à générer.
+        vocab_size (int): Taille du vocabulaire.
+        doc_len (int): Longueur moyenne (en mots) d'un texte.
+        seed (int): Graine du générateur aléatoire.
+        n_topics (int): Nombre de thèmes ; 0 pour des textes sans thème.
+
+    Returns:
+        list: Liste de `ndoc` textes.
+    """
+    rng = np.random.default_rng(seed)
+    words = base_words()[:vocab_size]
+    # Mots artificiels sans chiffres, que le découpage en mots retirerait
+    words += [
+        "w" + "".join(chr(97 + int(d)) for d in str(i)) for i in range(vocab_size - len(words))
+    ]
+    words = np.array(words)
+    lengths = rng.poisson(doc_len, size=ndoc) + 1
+    ranks = rng.zipf(1.2, size=int(lengths.sum())) - 1
+    ranks = ranks % vocab_size
+    if n_topics:
+        orders = np.array([rng.permutation(vocab_size) for _ in range(n_topics)])
+        topics = np.repeat(rng.integers(0, n_topics, size=ndoc), lengths)
+        themed = rng.random(len(ranks)) < 0.5
+        ranks[themed] = orders[topics[themed], ranks[themed]]
+    texts = []
+    start = 0
+    for length in lengths:
+        texts.append(" ".join(words[ranks[start : start + length]]))
+        start += length
+    return texts
+
+
+def synthetic_corpus(ndoc, vocab_size=50000, doc_len=120, seed=0, n_topics=0):
+    """
+    Construit un corpus synthétique de `ndoc` documents (moitié Reddit, moitié ArXiv).
+
+    Args:
+        ndoc (int): Nombre de documents.
+        vocab_size (int): Taille du vocabulaire.
+        doc_len (int): Longueur moyenne (en mots) d'un document.
+        seed (int): Graine du générateur aléatoire.
+        n_topics (int): Nombre de thèmes des textes (voir `synthetic_texts`).
+
+    Returns:
+        Corpus: Corpus (singleton réinitialisé) contenant les documents générés.
+    """
+    Corpus.reset_instance()
+    corpus = Corpus(f"Synthétique {ndoc}")
+    texts = synthetic_texts(ndoc, vocab_size, doc_len, seed, n_topics)
+    for i, text in enumerate(texts):
+        date = f"{2015 + i % 10}/{1 + i % 12:02d}/{1 + i % 28:02d}"
+        url = f"http://synthetic/{i}"
+        if i % 2:
+            doc = ArxivDocument(
+                f"Titre {i}", f"Auteur {i % 997}", [f"Auteur {i % 491}"], date, url, text
+            )
+        else:
+            doc = RedditDocument(f"Titre {i}", f"Auteur {i % 997}", date, url, text, i % 50)
+        corpus.add_document(doc)
+    return corpus
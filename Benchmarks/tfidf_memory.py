@@ -0,0 +1,60 @@
+"""
+Rapport mémoire de la construction TF-IDF de `SearchEngine`.
+
+Chaque taille de corpus est mesurée dans un processus séparé afin que le pic de
+mémoire résidente (RSS) ne soit pas pollué par les mesures précédentes. Le pic est
+comparé à la taille qu'aurait une matrice dense `ndoc x |vocab|` en float64.
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.tfidf_memory
+"""
+
+import resource
+import subprocess
+import sys
+import numpy as np
+
+SIZES = [2000, 5000, 10000, 20000]
+
+
+def peak_rss_mb():
+    """
+    Retourne le pic de mémoire résidente du processus courant, en Mo.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(ndoc):
+    """
+    Construit un moteur sur un corpus synthétique et affiche une ligne du rapport.
+
+    Args:
+        ndoc (int): Nombre de documents du corpus synthétique.
+    """
+    from Benchmarks.synthetic import synthetic_corpus
+    from Classes.SearchEngine import SearchEngine
+
+    corpus = synthetic_corpus(ndoc)
+    rss_before = peak_rss_mb()
+    engine = SearchEngine(corpus)
+    rss_after = peak_rss_mb()
+    n_docs, n_terms = engine.mat_TFxIDF.shape
+    dense_mb = n_docs * n_terms * np.dtype(np.float64).itemsize / 1024**2
+    print(
+        f"{n_docs:>8} {n_terms:>8} {engine.mat_TFxIDF.nnz:>10} "
+        f"{dense_mb:>12.1f} {rss_after - rss_before:>14.1f} {rss_after:>10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        measure(int(sys.argv[1]))
+    else:
+        print(
+            f"{'ndoc':>8} {'|vocab|':>8} {'nnz':>10} {'dense (Mo)':>12} "
+            f"{'build (Mo)':>14} {'pic (Mo)':>10}"
+        )
+        for ndoc in SIZES:
+            subprocess.run(
+                [sys.executable, "-m", "Benchmarks.tfidf_memory", str(ndoc)], check=True
+            )
@@ -0,0 +1,85 @@
+"""
+Latence de `SearchEngine.search` avec élagage dynamique (`prune=True`, variante
+MaxScore de WAND) face à l'évaluation exhaustive, pour la similarité cosinus et BM25.
+
+Chaque requête compte 6 termes, comme une requête en langage naturel : 2 mots rares
+(présents dans 20 documents à 1 % du corpus), qui fixent le seuil d'entrée dans les
+10 premiers, et 4 mots fréquents (au moins 10 % du corpus), dont les longs postings
+sont sautés dès que leurs bornes passent sous ce seuil. Seule l'évaluation est
+mesurée (`Scorer.score` suivi de la sélection des 10 meilleurs, ou
+`WandEvaluator.top_k`) ; les résultats sont identiques. La proportion de postings
+sautés et le nombre de documents entièrement évalués sont indiqués pour l'élagage.
+
+Avec BM25, les bornes des mots fréquents sont faibles (IDF) et la plupart de leurs
+postings sont sautés : l'élagage est d'autant plus rapide que le corpus est grand.
+Avec la similarité cosinus, la borne d'un terme (poids maximal rapporté à la norme,
+atteint dans un document court) reste élevée même pour un mot fréquent : rien
+n'est sauté et l'évaluateur se replie sur le calcul exhaustif, au prix de la
+lecture du premier terme.
+
+Utilisation (depuis la racine du projet) :
+    python -m Benchmarks.wand_pruning
+"""
+
+import numpy as np
+from Benchmarks.query_latency import timeit
+from Benchmarks.synthetic import synthetic_corpus
+from Classes.Scorer import BM25Scorer, CosineScorer
+from Classes.SearchEngine import SearchEngine, top_k
+from Classes.WandEvaluator import WandEvaluator
+
+SIZES = [20000, 100000]
+N_QUERIES = 100
+N_RARE = 2
+N_FREQUENT = 4
+TOP_N = 10
+
+
+def sample_queries(engine, n_queries, seed=0):
+    """
+    Tire des requêtes de `N_RARE` mots rares et `N_FREQUENT` mots fréquents.
+    """
+    rng = np.random.default_rng(seed)
+    doc_count = np.diff(engine.index.indptr)
+    rare = np.flatnonzero((doc_count >= 20) & (doc_count < engine.n_docs / 100))
+    frequent = np.flatnonzero(doc_count >= engine.n_docs / 10)
+    return [
+        sorted(
+            rng.choice(rare, N_RARE, replace=False).tolist()
+            + rng.choice(frequent, N_FREQUENT, replace=False).tolist()
+        )
+        for _ in range(n_queries)
+    ]
+
+
+def exhaustive(engine, term_ids):
+    """
+    Évaluation exhaustive : tous les postings, puis sélection des meilleurs.
+    """
+    doc_ids, scores = engine.scorer.score(engine, term_ids)
+    return doc_ids[top_k(scores, TOP_N)]
+
+
+if __name__ == "__main__":
+    print(
+        f"{'ndoc':>8} {'modèle':>8} {'exhaustif (µs)':>15} {'élagage (µs)':>13} "
+        f"{'postings sautés':>16} {'documents évalués':>18}"
+    )
+    for ndoc in SIZES:
+        corpus = synthetic_corpus(ndoc)
+        for name, scorer in [("cosinus", CosineScorer()), ("BM25", BM25Scorer())]:
+            engine = SearchEngine(corpus, scorer=scorer)
+            queries = sample_queries(engine, N_QUERIES)
+            evaluator = WandEvaluator(engine)
+            full_us = timeit(lambda q: exhaustive(engine, q), queries)
+            pruned_us = timeit(lambda q: evaluator.top_k(q, TOP_N), queries)
+            skipped, evaluated = [], []
+            for q in queries:
+                doc_ids, _, stats = evaluator.top_k(q, TOP_N)
+                assert doc_ids.tolist() == exhaustive(engine, q).tolist()
+                skipped.append(stats["skipped"] / max(stats["postings"], 1))
+                evaluated.append(stats["evaluated"])
+            print(
+                f"{ndoc:>8} {name:>8} {full_us:>15.1f} {pruned_us:>13.1f} "
+                f"{np.mean(skipped):>16.0%} {np.mean(evaluated):>18.0f}"
+            )
@@ -1,40 +1,71 @@
+from array import array
+from Classes.Document import intern_string
+
+
 class Author:
     """
     Classe représentant un auteur et sa production documentaire.
+
+    La production est un tableau compact d'identifiants de documents (8 octets par
+    document) ; les documents eux-mêmes sont retrouvés dans le dictionnaire
+    `documents` partagé avec le corpus.
     """
 
-    def __init__(self, name):
+    __slots__ = ("name", "ndoc", "production", "documents")
+
+    def __init__(self, name, documents=None):
         """
         Initialise un auteur avec un nom, un compteur de documents, et une liste de productions.
 
         Args:
             name (str): Nom de l'auteur.
+            documents (dict, optional): Dictionnaire des documents par identifiant
+                (en général `Corpus.id2doc`). Par défaut, un dictionnaire vide.
         """
-        self.name = name
+        self.name = intern_string(name)
         self.ndoc = 0
-        self.production = []
+        self.production = array("q")
+        self.documents = documents if documents is not None else {}
 
-    def add(self, production):
+    def add(self, doc_id):
         """
         Ajoute une production documentaire à l'auteur.
 
         Args:
-            production: Un document produit par l'auteur.
+            doc_id (int): Identifiant d'un document produit par l'auteur.
         """
         self.ndoc += 1
-        self.production.append(production)
+        self.production.append(doc_id)
+
+    def remove(self, doc_id):
+        """
+        Retire une production documentaire de l'auteur.
+
+        Args:
+            doc_id (int): Identifiant d'un document précédemment ajouté à l'auteur.
+        """
+        self.production.remove(doc_id)
+        self.ndoc -= 1
+
+    def productions(self):
+        """
+        Retourne les documents produits par l'auteur.
+
+        Returns:
+            list: Documents de l'auteur, dans l'ordre d'ajout.
+        """
+        return [self.documents[doc_id] for doc_id in self.production]
 
     def display_stats(self):
         """
         Affiche des statistiques sur les documents produits par l'auteur :
         - Nombre total de documents.
-        - Taille moyenne (en mots) des documents.
+        - Taille moyenne (en mots séparés par des blancs, voir `Document.split_count`)
+          des documents.
         """
-        valid_texts = [doc.text for doc in self.production if isinstance(doc.text, str)]
+        valid_docs = [doc for doc in self.productions() if isinstance(doc.text, str)]
         average_docs_size = (
-            sum(len(text.split()) for text in valid_texts) / len(valid_texts)
-            if valid_texts
-            else 0
+            sum(doc.split_count for doc in valid_docs) / len(valid_docs) if valid_docs else 0
         )
         print(f"Statistiques pour {self.name} :")
         print(f"  Nombre de documents produits : {self.ndoc}")
@@ -48,4 +79,4 @@ class Author:
         Returns:
             str: Représentation textuelle de l'auteur.
         """
-        return f"Auteur : {self.name}\t# productions : {self.ndoc}"
\ No newline at end of file
+        return f"Auteur : {self.name}\t# productions : {self.ndoc}"
@@ -0,0 +1,210 @@
+import unicodedata
+import numpy as np
+
+# Longueur des n-grammes de caractères indexés
+GRAM_SIZE = 3
+
+
+def normalize_name(name):
+    """
+    Normalise un nom d'auteur pour la recherche : minuscules, accents retirés et
+    espaces multiples réduits à un seul.
+
+    Args:
+        name (str): Nom à normaliser.
+
+    Returns:
+        str: Nom normalisé.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.lower())
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).split())
+
+
+def name_grams(name):
+    """
+    Retourne les n-grammes de caractères distincts d'un nom normalisé.
+    """
+    return {name[i : i + GRAM_SIZE] for i in range(len(name) - GRAM_SIZE + 1)}
+
+
+class AuthorIndex:
+    """
+    Classe représentant un index des auteurs d'un corpus, auteurs principaux et
+    co-auteurs ArXiv compris.
+
+    L'index est construit à partir de `Corpus.authors` : chaque nom normalisé renvoie
+    aux auteurs du corpus qui le portent, dont la production donne la liste des
+    documents. Les noms sont en outre indexés par trigrammes de caractères : une
+    recherche par sous-chaîne n'examine que les noms qui partagent tous les
+    trigrammes du motif, au lieu de parcourir tous les auteurs.
+
+    L'index s'abonne au corpus et se tient à jour à chaque ajout ou retrait de
+    document.
+    """
+
+    def __init__(self, corpus):
+        """
+        Indexe les auteurs du corpus et s'y abonne.
+
+        Args:
+            corpus (Corpus): Corpus dont les auteurs sont indexés.
+        """
+        self.corpus = corpus
+        self.names = {}
+        self.grams = {}
+        for author_name in corpus.authors:
+            self.add_name(author_name)
+        corpus.subscribe(self)
+
+    def add_name(self, author_name):
+        """
+        Indexe un nom d'auteur du corpus (sans effet s'il l'est déjà).
+
+        Args:
+            author_name (str): Nom tel qu'il figure dans `Corpus.authors`.
+        """
+        name = normalize_name(author_name)
+        if name not in self.names:
+            self.names[name] = set()
+            for gram in name_grams(name):
+                self.grams.setdefault(gram, set()).add(name)
+        self.names[name].add(author_name)
+
+    def remove_name(self, author_name):
+        """
+        Retire un nom d'auteur qui n'a plus de document dans le corpus.
+
+        Args:
+            author_name (str): Nom tel qu'il figurait dans `Corpus.authors`.
+        """
+        name = normalize_name(author_name)
+        authors = self.names.get(name)
+        if authors is None:
+            return
+        authors.discard(author_name)
+        if authors:
+            return
+        del self.names[name]
+        for gram in name_grams(name):
+            names = self.grams[gram]
+            names.discard(name)
+            if not names:
+                del self.grams[gram]
+
+    def document_added(self, doc_id, document):
+        """
+        Notifié par le corpus lorsqu'un document est ajouté : indexe ses auteurs.
+
+        Args:
+            doc_id (int): Identifiant du document dans le corpus.
+            document (Document): Document ajouté.
+        """
+        for author_name in self.corpus.document_authors(document):
+            self.add_name(author_name)
+
+    def document_removed(self, doc_id, document):
+        """
+        Notifié par le corpus lorsqu'un document est retiré : oublie les auteurs qui
+        n'ont plus de document.
+
+        Args:
+            doc_id (int): Identifiant du document dans le corpus.
+            document (Document): Document retiré.
+        """
+        for author_name in self.corpus.document_authors(document):
+            if author_name not in self.corpus.authors:
+                self.remove_name(author_name)
+
+    def matching_names(self, pattern):
+        """
+        Retourne les noms normalisés qui contiennent un motif.
+
+        Args:
+            pattern (str): Sous-chaîne recherchée (insensible à la casse et aux accents).
+
+        Returns:
+            list: Noms normalisés contenant le motif.
+        """
+        pattern = normalize_name(pattern)
+        grams = name_grams(pattern)
+        if not grams:
+            # Motif plus court qu'un trigramme : seuls les noms distincts sont parcourus
+            return [name for name in self.names if pattern in name]
+        postings = sorted((self.grams.get(gram, set()) for gram in grams), key=len)
+        candidates = set.intersection(*postings)
+        return [name for name in candidates if pattern in name]
+
+    def postings(self, names):
+        """
+        Retourne les documents des auteurs portant l'un des noms normalisés donnés.
+
+        Args:
+            names (iterable): Noms normalisés.
+
+        Returns:
+            np.ndarray: Identifiants distincts des documents, par ordre croissant.
+        """
+        productions = [
+            np.frombuffer(self.corpus.authors[author_name].production, dtype=np.int64)
+            for name in names
+            for author_name in self.names[name]
+        ]
+        if not productions:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(productions))
+
+    def lookup(self, pattern):
+        """
+        Retourne les documents dont un auteur ou un co-auteur contient un motif.
+
+        Args:
+            pattern (str): Sous-chaîne recherchée dans les noms d'auteurs.
+
+        Returns:
+            np.ndarray: Identifiants des documents, par ordre croissant.
+        """
+        return self.postings(self.matching_names(pattern))
+
+    def documents(self, name):
+        """
+        Retourne les documents d'un auteur désigné par son nom complet (à la casse et
+        aux accents près).
+
+        Args:
+            name (str): Nom de l'auteur.
+
+        Returns:
+            np.ndarray: Identifiants des documents, par ordre croissant.
+        """
+        name = normalize_name(name)
+        return self.postings([name] if name in self.names else [])
+
+    def suggest(self, name, n=5):
+        """
+        Propose les noms d'auteurs les plus proches d'un nom approximatif, selon la
+        proportion de trigrammes communs (coefficient de Dice). Seuls les noms qui
+        partagent au moins un trigramme avec la requête sont comparés.
+
+        Args:
+            name (str): Nom approximatif (faute de frappe, prénom abrégé...).
+            n (int): Nombre maximum de propositions.
+
+        Returns:
+            list: Couples `(nom, similarité)`, par similarité décroissante ; le nom
+                  est celui qui figure dans `Corpus.authors`.
+        """
+        grams = name_grams(normalize_name(name))
+        shared = {}
+        for gram in grams:
+            for candidate in self.grams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        scored = [
+            (candidate, 2 * count / (len(grams) + len(name_grams(candidate))))
+            for candidate, count in shared.items()
+        ]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return [
+            (author_name, similarity)
+            for candidate, similarity in scored[:n]
+            for author_name in sorted(self.names[candidate])
+        ][:n]
@@ -0,0 +1,282 @@
+import json
+import os
+import sys
+import numpy as np
+from Classes.DateIndex import date_to_days, days_to_date
+from Classes.Document import RedditDocument, ArxivDocument, LazyText
+
+CORPUS_FORMAT = "QueryPy-corpus"
+CORPUS_VERSION = 2
+# Versions lisibles : la version 1 n'a pas de colonne `raw_dates`
+READABLE_VERSIONS = (1, 2)
+
+# Code (sur un octet) du type de chaque document
+DOC_TYPES = {"Reddit": 0, "Arxiv": 1}
+
+# Colonnes de chaînes : un fichier d'octets concaténés et un tableau de positions
+STRING_COLUMNS = ["title", "url", "text", "authors", "raw_dates"]
+
+# Colonnes numériques : un tableau `.npy` chacune
+NUMERIC_COLUMNS = [
+    "types",
+    "dates",
+    "num_comments",
+    "author_ids",
+    "coauthor_ids",
+    "coauthor_offsets",
+]
+
+
+class BinaryCorpusWriter:
+    """
+    Classe écrivant un corpus au format binaire en colonnes, document par document.
+
+    Le répertoire produit contient :
+        - `meta.json` : format, version et nombre de documents ;
+        - un fichier `.npy` par colonne numérique (type sur un octet, date en jours,
+          nombre de commentaires, identifiant de l'auteur, co-auteurs) ;
+        - pour chaque colonne de chaînes (titre, URL, texte, noms d'auteurs, dates
+          brutes), un fichier `.bin` d'octets UTF-8 concaténés et un tableau de
+          positions `.npy`.
+
+    Une date au format YYYY/MM/DD est stockée en jours ; une date dans un autre format
+    (par exemple « 2022-01-05 ») est conservée telle quelle dans la colonne des dates
+    brutes, vide pour les autres documents, pour être relue à l'identique.
+
+    Les noms d'auteurs et de co-auteurs sont internés : chaque nom n'est stocké qu'une
+    fois et les documents y font référence par identifiant. Les chaînes sont écrites au
+    fil de l'eau, sans garder le corpus en mémoire.
+
+    L'écrivain s'utilise comme gestionnaire de contexte : l'écriture est terminée
+    (`close`) à la sortie du bloc, ou abandonnée (`abort`) si une exception survient,
+    sans laisser de fichier ouvert ni de corpus partiel.
+    """
+
+    def __init__(self, path):
+        """
+        Prépare l'écriture dans un répertoire (créé s'il n'existe pas).
+
+        Args:
+            path (str): Répertoire de destination.
+        """
+        self.path = path
+        self.created = not os.path.isdir(path)
+        os.makedirs(path, exist_ok=True)
+        self.files = {}
+        try:
+            for name in STRING_COLUMNS:
+                self.files[name] = open(os.path.join(path, f"{name}.bin"), "wb")
+        except BaseException:
+            self.abort()
+            raise
+        self.offsets = {name: [0] for name in STRING_COLUMNS}
+        self.author_codes = {}
+        self.columns = {
+            "types": [],
+            "dates": [],
+            "num_comments": [],
+            "author_ids": [],
+            "coauthor_ids": [],
+        }
+        self.coauthor_offsets = [0]
+
+    def __enter__(self):
+        """
+        Retourne l'écrivain, utilisé comme gestionnaire de contexte.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Termine l'écriture à la sortie du bloc, ou l'abandonne en cas d'exception.
+        """
+        if exc_type is not None:
+            self.abort()
+            return
+        try:
+            self.close()
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self):
+        """
+        Abandonne l'écriture : ferme les fichiers et supprime ceux déjà écrits (ainsi
+        que le répertoire s'il a été créé par l'écrivain).
+        """
+        for file in self.files.values():
+            file.close()
+        names = [f"{name}.bin" for name in STRING_COLUMNS]
+        names += [f"{name}_offsets.npy" for name in STRING_COLUMNS]
+        names += [f"{name}.npy" for name in NUMERIC_COLUMNS] + ["meta.json"]
+        for name in names:
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                pass
+        if self.created and not os.listdir(self.path):
+            os.rmdir(self.path)
+
+    def write_string(self, column, value):
+        """
+        Ajoute une chaîne à une colonne de chaînes.
+        """
+        encoded = value.encode("utf-8")
+        self.files[column].write(encoded)
+        self.offsets[column].append(self.offsets[column][-1] + len(encoded))
+
+    def author_id(self, name):
+        """
+        Retourne l'identifiant interné d'un nom d'auteur, en l'enregistrant si besoin.
+        """
+        if name not in self.author_codes:
+            self.author_codes[name] = len(self.author_codes)
+            self.write_string("authors", name)
+        return self.author_codes[name]
+
+    def add(self, doc):
+        """
+        Ajoute un document.
+
+        Args:
+            doc (Document): Document Reddit ou ArXiv à écrire.
+        """
+        doc_type = doc.get_type()
+        date_str = doc.date or ""
+        days = date_to_days(date_str)
+        self.columns["types"].append(DOC_TYPES[doc_type])
+        self.columns["dates"].append(days)
+        self.write_string("raw_dates", "" if days_to_date(days) == date_str else date_str)
+        self.columns["num_comments"].append(doc.num_comments if doc_type == "Reddit" else 0)
+        self.columns["author_ids"].append(self.author_id(doc.author))
+        co_authors = doc.co_authors if doc_type == "Arxiv" else []
+        self.columns["coauthor_ids"].extend(self.author_id(name) for name in co_authors)
+        self.coauthor_offsets.append(len(self.columns["coauthor_ids"]))
+        self.write_string("title", doc.title)
+        self.write_string("url", doc.url)
+        self.write_string("text", doc.text)
+
+    def close(self):
+        """
+        Termine l'écriture : enregistre les colonnes numériques et les métadonnées.
+        """
+        for file in self.files.values():
+            file.close()
+        arrays = {
+            "types": np.array(self.columns["types"], dtype=np.uint8),
+            "dates": np.array(self.columns["dates"], dtype=np.int32),
+            "num_comments": np.array(self.columns["num_comments"], dtype=np.int32),
+            "author_ids": np.array(self.columns["author_ids"], dtype=np.int32),
+            "coauthor_ids": np.array(self.columns["coauthor_ids"], dtype=np.int32),
+            "coauthor_offsets": np.array(self.coauthor_offsets, dtype=np.int64),
+        }
+        for name in STRING_COLUMNS:
+            arrays[f"{name}_offsets"] = np.array(self.offsets[name], dtype=np.int64)
+        for name, array in arrays.items():
+            np.save(os.path.join(self.path, f"{name}.npy"), array)
+
+        meta = {
+            "format": CORPUS_FORMAT,
+            "version": CORPUS_VERSION,
+            "ndoc": len(self.columns["types"]),
+            "naut": len(self.author_codes),
+        }
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=4)
+
+
+def read_binary_documents(path, mmap=True):
+    """
+    Lit les documents d'un corpus binaire écrit par `BinaryCorpusWriter`.
+
+    Les colonnes sont projetées en mémoire (lecture seule) : les textes ne sont pas
+    copiés, chaque document reçoit une référence `LazyText` décodée à la demande.
+    Les noms d'auteurs sont décodés une seule fois et partagés entre documents.
+
+    Args:
+        path (str): Répertoire du corpus binaire.
+        mmap (bool, optional): Projeter les fichiers en mémoire plutôt que les lire.
+
+    Yields:
+        Document: Documents du corpus, dans l'ordre d'écriture.
+
+    Raises:
+        ValueError: Si le répertoire ne contient pas un corpus d'une version prise en charge.
+    """
+    with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format") != CORPUS_FORMAT or meta.get("version") not in READABLE_VERSIONS:
+        raise ValueError(
+            f"Format de corpus non pris en charge : {meta.get('format')} "
+            f"version {meta.get('version')}"
+        )
+
+    def load_array(name):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+
+    def load_buffer(name):
+        filename = os.path.join(path, f"{name}.bin")
+        if os.path.getsize(filename) == 0:
+            return np.empty(0, dtype=np.uint8)
+        if mmap:
+            return np.memmap(filename, dtype=np.uint8, mode="r")
+        return np.fromfile(filename, dtype=np.uint8)
+
+    columns = STRING_COLUMNS if meta["version"] >= 2 else STRING_COLUMNS[:-1]
+    buffers = {name: load_buffer(name) for name in columns}
+    # Les colonnes numériques sont converties d'un bloc : l'accès élément par élément
+    # à un tableau projeté en mémoire est bien plus lent que celui d'une liste
+    offsets = {name: load_array(f"{name}_offsets").tolist() for name in columns}
+    small_strings = {name: buffers[name].tobytes() for name in columns if name != "text"}
+    if "raw_dates" not in columns:
+        small_strings["raw_dates"], offsets["raw_dates"] = b"", [0] * (meta["ndoc"] + 1)
+
+    def string(column, i):
+        return small_strings[column][offsets[column][i] : offsets[column][i + 1]].decode("utf-8")
+
+    authors = [string("authors", i) for i in range(meta["naut"])]
+    types = load_array("types").tolist()
+    num_comments = load_array("num_comments").tolist()
+    author_ids = load_array("author_ids").tolist()
+    coauthor_ids = load_array("coauthor_ids").tolist()
+    coauthor_offsets = load_array("coauthor_offsets").tolist()
+    doc_dates = load_array("dates").tolist()
+    dates = {days: days_to_date(days) for days in set(doc_dates)}
+    text_offsets = offsets["text"]
+
+    for i in range(meta["ndoc"]):
+        text = LazyText(buffers["text"], text_offsets[i], text_offsets[i + 1])
+        title, url = string("title", i), string("url", i)
+        author = authors[author_ids[i]]
+        date_str = string("raw_dates", i) or dates[doc_dates[i]]
+        if types[i] == DOC_TYPES["Reddit"]:
+            yield RedditDocument(title, author, date_str, url, text, num_comments[i])
+        else:
+            start, end = coauthor_offsets[i], coauthor_offsets[i + 1]
+            co_authors = [authors[j] for j in coauthor_ids[start:end]]
+            yield ArxivDocument(title, author, co_authors, date_str, url, text)
+
+
+def convert_json(json_filename, path):
+    """
+    Convertit un fichier JSON de corpus (format de `Corpus.save_to_json`) au format
+    binaire, en flux.
+
+    Args:
+        json_filename (str): Fichier JSON source.
+        path (str): Répertoire de destination du corpus binaire.
+    """
+    from Classes.Corpus import Corpus
+
+    with BinaryCorpusWriter(path) as writer:
+        for batch in Corpus.read_json_batches(json_filename):
+            for doc in batch:
+                writer.add(doc)
+
+
+if __name__ == "__main__":
+    # Utilisation : python -m Classes.BinaryCorpus Data/fichier.json [...]
+    for json_filename in sys.argv[1:]:
+        path = os.path.splitext(json_filename)[0] + ".qpc"
+        convert_json(json_filename, path)
+        print(f"{json_filename} converti dans {path}.")
@@ -0,0 +1,381 @@
+import re
+from Classes.PositionalIndex import gallop_intersect, intersect_all
+from tokenizer import tokenize
+
+# Éléments d'une requête : expression entre guillemets, parenthèse ou mot
+QUERY_TOKEN = re.compile(r'"[^"]*"|\(|\)|[^\s()"]+')
+NEAR_OPERATOR = re.compile(r"NEAR/(\d+)")
+OPERATORS = {"AND", "OR", "NOT"}
+
+
+class QueryNode:
+    """
+    Classe de base des nœuds d'une requête booléenne.
+
+    Chaque nœud calcule la liste triée des documents qui le satisfont à partir de
+    l'index positionnel du corpus (`PositionalIndex`). Un ensemble de documents
+    candidats peut lui être transmis : les postings sont alors intersectés avec lui
+    dès le départ, si bien qu'une requête restrictive ne lit qu'une petite partie
+    des postings de ses termes les plus fréquents.
+    """
+
+    def documents(self, index, candidates=None):
+        """
+        Retourne les documents qui satisfont le nœud.
+
+        Args:
+            index (PositionalIndex): Index positionnel du corpus.
+            candidates (list, optional): Identifiants triés des seuls documents à
+                considérer. Par défaut, tous les documents du corpus.
+
+        Returns:
+            list: Identifiants des documents, par ordre croissant.
+
+        Raises:
+            NotImplementedError: Si la sous-classe ne définit pas le nœud.
+        """
+        raise NotImplementedError
+
+    def spans(self, index, doc_id):
+        """
+        Retourne les intervalles de positions de mots où le nœud est satisfait dans un
+        document (pour l'opérateur de proximité).
+
+        Args:
+            index (PositionalIndex): Index positionnel du corpus.
+            doc_id (int): Identifiant d'un document qui satisfait le nœud.
+
+        Returns:
+            list: Couples `(première position, dernière position)`.
+
+        Raises:
+            ValueError: Si le nœud n'a pas de position (opérateurs booléens).
+        """
+        raise ValueError(f"NEAR ne s'applique qu'à des mots ou des expressions : {self}")
+
+    def terms(self):
+        """
+        Retourne les termes qui contribuent au score des documents (ceux qui ne sont
+        pas sous un NOT).
+
+        Returns:
+            list: Termes normalisés.
+        """
+        return []
+
+
+class TermQuery(QueryNode):
+    """
+    Un mot.
+    """
+
+    def __init__(self, term):
+        self.term = term
+
+    def __repr__(self):
+        return f"TermQuery({self.term!r})"
+
+    def documents(self, index, candidates=None):
+        documents = index.documents(self.term)
+        if candidates is None:
+            return list(documents)
+        return gallop_intersect(*sorted([candidates, documents], key=len))
+
+    def spans(self, index, doc_id):
+        return [(position, position) for position, _, _ in index.postings[self.term][doc_id]]
+
+    def terms(self):
+        return [self.term]
+
+
+class PhraseQuery(QueryNode):
+    """
+    Une expression : des mots consécutifs (les mots vides sont ignorés).
+    """
+
+    def __init__(self, terms):
+        self.phrase = terms
+
+    def __repr__(self):
+        return f"PhraseQuery({self.phrase!r})"
+
+    def documents(self, index, candidates=None):
+        lists = [index.documents(term) for term in self.phrase]
+        if candidates is not None:
+            lists.append(candidates)
+        return [
+            doc_id
+            for doc_id in intersect_all(lists)
+            if index.phrase_matches(self.phrase, doc_id)
+        ]
+
+    def spans(self, index, doc_id):
+        last = len(self.phrase) - 1
+        return [
+            (position, position + last)
+            for position, _, _ in index.phrase_matches(self.phrase, doc_id)
+        ]
+
+    def terms(self):
+        return list(self.phrase)
+
+
+class NearQuery(QueryNode):
+    """
+    Deux mots ou expressions séparés d'au plus `distance` positions (`a NEAR/k b`),
+    dans un ordre quelconque.
+    """
+
+    def __init__(self, left, right, distance):
+        self.left = left
+        self.right = right
+        self.distance = distance
+
+    def __repr__(self):
+        return f"NearQuery({self.left!r}, {self.right!r}, {self.distance})"
+
+    def documents(self, index, candidates=None):
+        both = self.right.documents(index, self.left.documents(index, candidates))
+        return [doc_id for doc_id in both if self.spans(index, doc_id)]
+
+    def spans(self, index, doc_id):
+        return [
+            (min(left[0], right[0]), max(left[1], right[1]))
+            for left in self.left.spans(index, doc_id)
+            for right in self.right.spans(index, doc_id)
+            if max(right[0] - left[1], left[0] - right[1]) <= self.distance
+        ]
+
+    def terms(self):
+        return self.left.terms() + self.right.terms()
+
+
+class AndQuery(QueryNode):
+    """
+    Conjonction : les documents qui satisfont toutes les sous-requêtes. Les
+    sous-requêtes de la forme `NOT x` retirent les documents qui satisfont `x`.
+    """
+
+    def __init__(self, children):
+        self.children = children
+
+    def __repr__(self):
+        return f"AndQuery({self.children!r})"
+
+    def documents(self, index, candidates=None):
+        positives = [child for child in self.children if not isinstance(child, NotQuery)]
+        negatives = [child.child for child in self.children if isinstance(child, NotQuery)]
+
+        # Les mots seuls sont intersectés ensemble, du plus rare au plus fréquent ;
+        # les expressions et proximités ne vérifient ensuite que les documents restants
+        words = [child for child in positives if isinstance(child, TermQuery)]
+        lists = [index.documents(child.term) for child in words]
+        if candidates is not None:
+            lists.append(candidates)
+        documents = intersect_all(lists) if lists else list(index.corpus.id2doc)
+        for child in positives:
+            if not documents:
+                break
+            if not isinstance(child, TermQuery):
+                documents = child.documents(index, documents)
+
+        for child in negatives:
+            if not documents:
+                break
+            excluded = set(child.documents(index, documents))
+            documents = [doc_id for doc_id in documents if doc_id not in excluded]
+        return documents
+
+    def terms(self):
+        return [term for child in self.children for term in child.terms()]
+
+
+class OrQuery(QueryNode):
+    """
+    Disjonction : les documents qui satisfont au moins une sous-requête.
+    """
+
+    def __init__(self, children):
+        self.children = children
+
+    def __repr__(self):
+        return f"OrQuery({self.children!r})"
+
+    def documents(self, index, candidates=None):
+        documents = set()
+        for child in self.children:
+            documents.update(child.documents(index, candidates))
+        return sorted(documents)
+
+    def terms(self):
+        return [term for child in self.children for term in child.terms()]
+
+
+class NotQuery(QueryNode):
+    """
+    Négation : les documents qui ne satisfont pas la sous-requête.
+    """
+
+    def __init__(self, child):
+        self.child = child
+
+    def __repr__(self):
+        return f"NotQuery({self.child!r})"
+
+    def documents(self, index, candidates=None):
+        if candidates is None:
+            candidates = list(index.corpus.id2doc)
+        excluded = set(self.child.documents(index, candidates))
+        return [doc_id for doc_id in candidates if doc_id not in excluded]
+
+
+class QueryParser:
+    """
+    Analyseur du langage de requêtes :
+
+        - `virus vaccine` ou `virus AND vaccine` : les deux mots ;
+        - `virus OR vaccine` : l'un des deux mots ;
+        - `NOT virus` : les documents sans le mot ;
+        - `"black holes"` : l'expression exacte (mots consécutifs) ;
+        - `vaccine NEAR/5 trial` : deux mots (ou expressions) séparés d'au plus
+          5 positions ;
+        - parenthèses pour grouper : `(mask OR masks) AND NOT "face shield"`.
+
+    Les opérateurs s'écrivent en majuscules ; NOT lie plus fort que AND, qui lie
+    plus fort que OR. Les mots sont normalisés comme les documents (`tokenize`) :
+    un mot vide ne contraint pas la requête.
+    """
+
+    def __init__(self, text):
+        """
+        Args:
+            text (str): Requête à analyser.
+        """
+        self.tokens = QUERY_TOKEN.findall(text)
+        self.position = 0
+
+    def peek(self):
+        """
+        Retourne l'élément courant sans le consommer (None en fin de requête).
+        """
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self):
+        """
+        Consomme et retourne l'élément courant.
+        """
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        """
+        Analyse la requête complète.
+
+        Returns:
+            QueryNode | None: Arbre de la requête, ou None si elle ne contient aucun mot.
+
+        Raises:
+            ValueError: Si la requête est mal formée.
+        """
+        if not self.tokens:
+            return None
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"Requête invalide : élément inattendu {self.peek()!r}")
+        return node
+
+    def parse_or(self):
+        nodes = [self.parse_and()]
+        while self.peek() == "OR":
+            self.next()
+            nodes.append(self.parse_and())
+        nodes = [node for node in nodes if node is not None]
+        if len(nodes) <= 1:
+            return nodes[0] if nodes else None
+        return OrQuery(nodes)
+
+    def parse_and(self):
+        nodes = [self.parse_unary()]
+        while self.peek() not in (None, ")", "OR"):
+            if self.peek() == "AND":
+                self.next()
+            nodes.append(self.parse_unary())
+        nodes = [node for node in nodes if node is not None]
+        if len(nodes) <= 1:
+            return nodes[0] if nodes else None
+        return AndQuery(nodes)
+
+    def parse_unary(self):
+        if self.peek() == "NOT":
+            self.next()
+            child = self.parse_unary()
+            return NotQuery(child) if child is not None else None
+        return self.parse_near()
+
+    def parse_near(self):
+        node = self.parse_atom()
+        while self.peek() is not None and NEAR_OPERATOR.fullmatch(self.peek()):
+            distance = int(NEAR_OPERATOR.fullmatch(self.next()).group(1))
+            right = self.parse_atom()
+            for operand in (node, right):
+                if operand is not None and not isinstance(
+                    operand, (TermQuery, PhraseQuery, NearQuery)
+                ):
+                    raise ValueError(
+                        "Requête invalide : NEAR ne s'applique qu'à des mots ou des expressions"
+                    )
+            if node is None or right is None:
+                node = node if right is None else right
+            else:
+                node = NearQuery(node, right, distance)
+        return node
+
+    def parse_atom(self):
+        token = self.next()
+        if token is None:
+            raise ValueError("Requête invalide : fin de requête inattendue")
+        if token == "(":
+            node = self.parse_or()
+            if self.next() != ")":
+                raise ValueError("Requête invalide : parenthèse non fermée")
+            return node
+        if token == ")" or token in OPERATORS or NEAR_OPERATOR.fullmatch(token):
+            raise ValueError(f"Requête invalide : élément inattendu {token!r}")
+        terms = tokenize(token.strip('"'))
+        if not terms:
+            return None
+        return TermQuery(terms[0]) if len(terms) == 1 else PhraseQuery(terms)
+
+
+def is_boolean_query(text):
+    """
+    Indique si un texte utilise la syntaxe des requêtes booléennes (guillemets,
+    parenthèses ou opérateurs), plutôt qu'une simple liste de mots-clés.
+
+    Args:
+        text (str): Texte saisi.
+
+    Returns:
+        bool: True si le texte doit être analysé par `parse_query`.
+    """
+    return '"' in text or any(
+        token in ("(", ")") or token in OPERATORS or NEAR_OPERATOR.fullmatch(token)
+        for token in QUERY_TOKEN.findall(text)
+    )
+
+
+def parse_query(text):
+    """
+    Analyse une requête du langage décrit par `QueryParser`.
+
+    Args:
+        text (str): Requête à analyser.
+
+    Returns:
+        QueryNode | None: Arbre de la requête, ou None si elle ne contient aucun mot.
+
+    Raises:
+        ValueError: Si la requête est mal formée.
+    """
+    return QueryParser(text).parse()
@@ -1,20 +1,110 @@
-from Classes.Document import RedditDocument, ArxivDocument
+from Classes.Document import ArxivDocument, DocumentFactory
 from Classes.Author import Author
-from datetime import datetime
+from Classes.BinaryCorpus import BinaryCorpusWriter, read_binary_documents
+from Classes.CorpusFetcher import CorpusFetcher
+from Classes.HttpCache import HttpCache
+from Classes.PositionalIndex import PositionalIndex
+from Classes.AuthorIndex import AuthorIndex
+from Classes.CorpusStats import CorpusStats
+from Classes.DateIndex import DateIndex
+import numpy as np
 import pandas as pd
 import json
 import re
 import os
+import stat
+import tempfile
+import textwrap
 from dotenv import load_dotenv
-import praw
-import urllib.request
-import xmltodict
-from utils import (
-    count_document_frequency,
-    build_vocabulary,
-    count_occurrences,
-    remove_stopwords,
-)
+
+
+def iter_json_records(json_filename, chunk_size=1 << 16):
+    """
+    Parcourt de manière incrémentale un fichier JSON de la forme
+    `{"Reddit": [{...}, ...], "Arxiv": [{...}, ...]}`.
+
+    Le fichier est lu par blocs de `chunk_size` caractères et chaque enregistrement est
+    décodé dès qu'il est complet : la mémoire utilisée dépend de la taille d'un
+    enregistrement, pas de celle du fichier.
+
+    Args:
+        json_filename (str): Nom du fichier JSON.
+        chunk_size (int, optional): Nombre de caractères lus à chaque accès au fichier.
+
+    Yields:
+        tuple: `(clé, enregistrement)`, par exemple `("Reddit", {...})`.
+
+    Raises:
+        ValueError: Si le fichier n'a pas la structure attendue.
+    """
+    decoder = json.JSONDecoder()
+    with open(json_filename, "r", encoding="utf-8") as f:
+        buffer, pos, eof = "", 0, False
+
+        def fill():
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return not eof
+
+        def next_char():
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    raise ValueError("Fin de fichier JSON inattendue.")
+
+        def expect(chars):
+            nonlocal pos
+            char = next_char()
+            if char not in chars:
+                raise ValueError(f"Caractère JSON inattendu : {char!r}")
+            pos += 1
+            return char
+
+        def decode_value():
+            nonlocal pos
+            next_char()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    if end < len(buffer) or eof:
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                # Valeur incomplète (ou qui pourrait se prolonger) : lire la suite
+                fill()
+
+        expect("{")
+        if next_char() == "}":
+            return
+        while True:
+            key = decode_value()
+            expect(":")
+            if next_char() == "[":
+                pos += 1
+                if next_char() == "]":
+                    pos += 1
+                else:
+                    while True:
+                        yield key, decode_value()
+                        if expect(",]") == "]":
+                            break
+            else:
+                decode_value()
+            if expect(",}") == "}":
+                return
+
+
+# Identifiant d'un article dans une URL ArXiv (abs ou pdf), sans numéro de version
+ARXIV_URL = re.compile(r"arxiv\.org/(?:abs|pdf)/(.+?)(?:v\d+)?(?:\.pdf)?/?$", re.IGNORECASE)
 
 
 class SingletonMeta(type):
@@ -42,20 +132,41 @@ class Corpus(metaclass=SingletonMeta):
     Implémente un singleton pour éviter la duplication d'instances.
     """
 
-    def __init__(self, name):
+    # Comportements possibles face à un document déjà présent dans le corpus
+    DUPLICATE_POLICIES = ("skip", "merge", "keep")
+
+    def __init__(self, name, on_duplicate="skip", near_duplicates=None):
         """
         Initialise un corpus avec un nom, des auteurs, et des documents.
 
         Args:
             name (str): Nom du corpus.
+            on_duplicate (str, optional): Traitement d'un document déjà présent (même
+                URL ou même identifiant ArXiv) : "skip" l'ignore, "merge" remplace
+                l'ancienne version par la nouvelle, "keep" l'ajoute quand même.
+            near_duplicates (MinHashLSH, optional): Détecteur de quasi-doublons sur le
+                texte ; un quasi-doublon est traité comme un doublon. Par défaut, aucun.
+
+        Raises:
+            ValueError: Si `on_duplicate` n'est pas un comportement reconnu.
         """
+        if on_duplicate not in self.DUPLICATE_POLICIES:
+            raise ValueError(f"Traitement des doublons inconnu : {on_duplicate}")
         if not hasattr(self, "initialized"):
             self.name = name
             self.authors = {}
             self.id2doc = {}
             self.ndoc = 0
             self.naut = 0
-            self.full_text = None
+            self.next_id = 0
+            self.listeners = []
+            self.on_duplicate = on_duplicate
+            self.near_duplicates = near_duplicates
+            self.doc_keys = {}
+            self.positional_index = None
+            self.statistics = None
+            self.author_index = None
+            self.dates = DateIndex()
             self.initialized = True
 
     @classmethod
@@ -67,176 +178,431 @@ class Corpus(metaclass=SingletonMeta):
         if cls in cls._instances:
             del cls._instances[cls]
 
+    def subscribe(self, listener):
+        """
+        Abonne un observateur aux ajouts et retraits de documents du corpus.
+
+        L'observateur doit fournir les méthodes `document_added(doc_id, document)`
+        et `document_removed(doc_id, document)`.
+
+        Args:
+            listener: Observateur à notifier.
+        """
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """
+        Désabonne un observateur du corpus.
+
+        Args:
+            listener: Observateur à retirer.
+        """
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    @staticmethod
+    def document_key(document):
+        """
+        Retourne la clé d'identité d'un document : son identifiant ArXiv (sans numéro
+        de version) ou, à défaut, son URL normalisée.
+
+        Args:
+            document (Document): Document à identifier.
+
+        Returns:
+            str | None: Clé du document, ou None s'il n'a pas d'URL.
+        """
+        url = (document.url or "").strip()
+        if not url:
+            return None
+        match = ARXIV_URL.search(url)
+        if match:
+            return "arxiv:" + match.group(1)
+        # Schéma, « www. », fragment et barre finale ne changent pas la ressource
+        url = re.sub(r"^[a-z]+://(www\.)?", "", url, flags=re.IGNORECASE).split("#")[0]
+        host, _, path = url.partition("/")
+        return "url:" + host.lower() + "/" + path.rstrip("/")
+
+    def find_duplicate(self, document, signature=None):
+        """
+        Cherche un document du corpus identique (même clé) ou, si un détecteur de
+        quasi-doublons est configuré, de texte quasi identique.
+
+        Args:
+            document (Document): Document à chercher.
+            signature (np.ndarray, optional): Signature MinHash du texte, si elle est
+                déjà calculée.
+
+        Returns:
+            int | None: Identifiant du document existant, ou None.
+        """
+        key = self.document_key(document)
+        if key in self.doc_keys:
+            return self.doc_keys[key]
+        if self.near_duplicates is not None:
+            if signature is None:
+                signature = self.near_duplicates.signature(document.text)
+            matches = self.near_duplicates.query(signature)
+            if matches:
+                return matches[0][0]
+        return None
+
     def add_document(self, document):
         """
         Ajoute un document au corpus et met à jour les informations des auteurs.
 
+        Les doublons sont détectés en temps constant par un index des clés des
+        documents (voir `document_key`) et traités selon `on_duplicate`.
+
         Args:
             document (Document): Document à ajouter.
+
+        Returns:
+            int: Identifiant attribué au document, ou celui du document existant si
+                 le doublon est ignoré.
         """
-        self.id2doc[self.ndoc] = document
+        signature = None
+        if self.near_duplicates is not None:
+            signature = self.near_duplicates.signature(document.text)
+        if self.on_duplicate != "keep":
+            duplicate_id = self.find_duplicate(document, signature)
+            if duplicate_id is not None:
+                if self.on_duplicate == "skip":
+                    return duplicate_id
+                self.remove_document(duplicate_id)
+
+        doc_id = self.next_id
+        self.id2doc[doc_id] = document
+        self.next_id += 1
         self.ndoc += 1
+        self.dates.add(doc_id, document.date)
+        key = self.document_key(document)
+        if key is not None:
+            self.doc_keys[key] = doc_id
+        if self.near_duplicates is not None:
+            self.near_duplicates.insert(doc_id, signature)
+
+        for author_name in self.document_authors(document):
+            if author_name not in self.authors:
+                self.authors[author_name] = Author(author_name, self.id2doc)
+                self.naut += 1
+            self.authors[author_name].add(doc_id)
+
+        for listener in self.listeners:
+            listener.document_added(doc_id, document)
+        return doc_id
+
+    def remove_document(self, doc_id):
+        """
+        Retire un document du corpus et met à jour les informations des auteurs.
+        Les identifiants des autres documents sont conservés.
+
+        Args:
+            doc_id (int): Identifiant du document à retirer.
+
+        Raises:
+            KeyError: Si aucun document ne porte cet identifiant.
+        """
+        document = self.id2doc.pop(doc_id)
+        self.ndoc -= 1
+        self.dates.remove(doc_id)
+        key = self.document_key(document)
+        if self.doc_keys.get(key) == doc_id:
+            del self.doc_keys[key]
+        if self.near_duplicates is not None:
+            self.near_duplicates.remove(doc_id)
+
+        for author_name in self.document_authors(document):
+            author = self.authors[author_name]
+            author.remove(doc_id)
+            if author.ndoc == 0:
+                del self.authors[author_name]
+                self.naut -= 1
+
+        for listener in self.listeners:
+            listener.document_removed(doc_id, document)
+
+    @staticmethod
+    def document_authors(document):
+        """
+        Retourne les auteurs d'un document : l'auteur principal puis les co-auteurs.
 
+        Args:
+            document (Document): Document à analyser.
+
+        Returns:
+            list: Noms des auteurs du document.
+        """
         authors = [document.author]
         if isinstance(document, ArxivDocument):
             authors += document.co_authors
-
-        for author_name in authors:
-            if author_name not in self.authors:
-                self.authors[author_name] = Author(author_name)
-                self.naut += 1
-            self.authors[author_name].add(document)
-
-    def generate_corpus(self, user_query):
+        return authors
+
+    def generate_corpus(
+        self,
+        user_query,
+        reddit_limit=50,
+        arxiv_limit=50,
+        fetcher=None,
+        cache_dir=None,
+        cache=None,
+    ):
         """
         Génère un corpus à partir de données provenant de Reddit et ArXiv.
 
+        Les deux sources sont interrogées en parallèle et paginées ; les documents de
+        chaque page sont ajoutés dès sa réception (voir `CorpusFetcher`).
+
         Args:
             user_query (str): Sujet ou requête utilisateur pour filtrer les données.
+            reddit_limit (int, optional): Nombre maximal de posts Reddit. Par défaut, 50.
+            arxiv_limit (int, optional): Nombre maximal d'articles ArXiv. Par défaut, 50.
+            fetcher (CorpusFetcher, optional): Collecteur à utiliser. Par défaut, un
+                collecteur interrogeant ArXiv et Reddit, par son API authentifiée si
+                `REDDIT_CLIENT_ID` et `REDDIT_CLIENT_SECRET` sont définis (fichier
+                `.env`), par ses listings publics sinon.
+            cache_dir (str, optional): Répertoire d'un cache disque des réponses (voir
+                `HttpCache`), ouvert avec sa durée de fraîcheur et sa taille maximale par
+                défaut et utilisé par le collecteur par défaut. Par défaut, aucun.
+            cache (HttpCache, optional): Cache disque déjà configuré (par exemple
+                `HttpCache(".cache", ttl=86400, max_bytes=2**30)`), utilisé par le
+                collecteur par défaut à la place de `cache_dir`. Par défaut, aucun.
         """
-        load_dotenv()
-        client_id = os.getenv("REDDIT_CLIENT_ID")
-        client_secret = os.getenv("REDDIT_CLIENT_SECRET")
-        user_agent = os.getenv("REDDIT_USER_AGENT")
+        if fetcher is None:
+            load_dotenv()
+            if cache is None and cache_dir:
+                cache = HttpCache(cache_dir)
+            fetcher = CorpusFetcher(
+                user_agent=os.getenv("REDDIT_USER_AGENT") or "QueryPy",
+                cache=cache,
+                reddit_client_id=os.getenv("REDDIT_CLIENT_ID"),
+                reddit_client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+            )
 
-        reddit = praw.Reddit(
-            client_id=client_id, client_secret=client_secret, user_agent=user_agent
+        print("Extraction des données depuis Reddit et ArXiv...")
+        added = fetcher.fetch_corpus(self, user_query, reddit_limit, arxiv_limit)
+        print(
+            f"Corpus généré avec succès : {added['Reddit']} documents Reddit et "
+            f"{added['Arxiv']} documents ArXiv ajoutés."
         )
-        subreddit_name = user_query
-        subr = reddit.subreddit(subreddit_name)
-
-        print("Extraction des données depuis Reddit...")
-        for post in subr.hot(limit=50):
-            title = post.title
-            author = post.author.name if post.author else "Inconnu"
-            date = datetime.fromtimestamp(post.created).strftime("%Y/%m/%d")
-            url = "https://www.reddit.com" + post.permalink
-            text = post.selftext.replace("\n", " ")
-            num_comments = post.num_comments
-            doc = RedditDocument(title, author, date, url, text, num_comments)
-            self.add_document(doc)
-
-        print("Extraction des données depuis ArXiv...")
-        query = user_query
-        url = f"http://export.arxiv.org/api/query?search_query=all:{query}&start=0&max_results=50"
-        url_read = urllib.request.urlopen(url).read()
-        data = url_read.decode()
-        dico = xmltodict.parse(data)
-        entries = dico["feed"]["entry"]
-
-        for e in entries:
-            title = e["title"]
-            authors = e.get("author", [])
-            if isinstance(authors, list):
-                authors = [a.get("name", "Inconnu") for a in authors]
-            elif isinstance(authors, dict):
-                authors = [authors.get("name", "Inconnu")]
-            main_author = authors[0] if authors else "Inconnu"
-            co_authors = authors[1:] if len(authors) > 1 else []
-            date = datetime.strptime(e["published"], "%Y-%m-%dT%H:%M:%SZ").strftime(
-                "%Y/%m/%d"
-            )
-            url = e["id"]
-            text = e["summary"].replace("\n", " ")
-            doc = ArxivDocument(title, main_author, co_authors, date, url, text)
-            self.add_document(doc)
 
-        print(f"Corpus généré avec succès : {self.ndoc} documents ajoutés.")
+    @staticmethod
+    def document_record(doc_id, doc):
+        """
+        Construit l'enregistrement JSON d'un document.
+
+        Args:
+            doc_id (int): Identifiant du document dans le corpus.
+            doc (Document): Document à sérialiser.
 
-    def save_to_json(self, json_filename):
+        Returns:
+            dict: Enregistrement du document, selon son type.
+        """
+        if doc.get_type() == "Reddit":
+            return {
+                "id": doc_id,
+                "title": doc.title,
+                "author": doc.author,
+                "date": doc.date,
+                "url": doc.url,
+                "text": doc.text,
+                "num_comments": doc.num_comments,
+            }
+        return {
+            "id": doc_id,
+            "title": doc.title,
+            "main_author": doc.author,
+            "co_authors": doc.co_authors,
+            "date": doc.date,
+            "url": doc.url,
+            "text": doc.text,
+        }
+
+    def save_to_json(self, json_filename, atomic=False):
         """
         Sauvegarde le corpus dans un fichier JSON.
 
+        Les documents sont écrits au fil de l'eau, chacun une seule fois, sans
+        construire le contenu complet du fichier en mémoire. Le fichier produit est
+        identique à celui de `json.dump(..., indent=4)`.
+
         Args:
             json_filename (str): Nom du fichier JSON.
+            atomic (bool, optional): Écrire dans un fichier temporaire puis le renommer,
+                afin que le fichier de destination ne soit jamais partiellement écrit.
         """
+        target = os.fspath(json_filename)
+        filename = target
         try:
-            data = {"Reddit": [], "Arxiv": []}
-
-            for doc_id, doc in self.id2doc.items():
-                if doc.get_type() == "Reddit":
-                    data["Reddit"].append(
-                        {
-                            "id": doc_id,
-                            "title": doc.title,
-                            "author": doc.author,
-                            "date": doc.date,
-                            "url": doc.url,
-                            "text": doc.text,
-                            "num_comments": doc.num_comments,
-                        }
-                    )
-                elif doc.get_type() == "Arxiv":
-                    data["Arxiv"].append(
-                        {
-                            "id": doc_id,
-                            "title": doc.title,
-                            "main_author": doc.author,
-                            "co_authors": doc.co_authors,
-                            "date": doc.date,
-                            "url": doc.url,
-                            "text": doc.text,
-                        }
-                    )
-
-                with open(json_filename, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=4, ensure_ascii=False)
+            if atomic:
+                fd, filename = tempfile.mkstemp(
+                    dir=os.path.dirname(os.path.abspath(target)), suffix=".tmp"
+                )
+                os.close(fd)
+
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write("{")
+                for i, doc_type in enumerate(["Reddit", "Arxiv"]):
+                    f.write(",\n" if i else "\n")
+                    f.write(f'    "{doc_type}": [')
+                    first = True
+                    for doc_id, doc in self.id2doc.items():
+                        if doc.get_type() != doc_type:
+                            continue
+                        record = json.dumps(
+                            self.document_record(doc_id, doc), indent=4, ensure_ascii=False
+                        )
+                        f.write("\n" if first else ",\n")
+                        f.write(textwrap.indent(record, " " * 8))
+                        first = False
+                    f.write("]" if first else "\n    ]")
+                f.write("\n}")
+
+            if atomic:
+                # `mkstemp` crée le fichier temporaire en mode 0600 : le fichier final
+                # garde le mode du fichier remplacé, ou celui d'un fichier créé
+                # normalement (0666 moins le masque de l'utilisateur)
+                os.chmod(filename, self.file_mode(target))
+                os.replace(filename, target)
             print(f"Corpus sauvegardé avec succès dans {json_filename}.")
         except Exception as e:
+            if atomic and os.path.exists(filename):
+                os.remove(filename)
             print(f"Erreur lors de la sauvegarde dans {json_filename} : {e}")
 
-    def load_from_json(self, json_filename):
+    @staticmethod
+    def file_mode(filename):
         """
-        Charge un corpus à partir d'un fichier JSON.
+        Retourne les permissions à donner à un fichier écrit à la place de `filename`.
 
         Args:
-            json_filename (str): Nom du fichier JSON.
+            filename (str): Fichier de destination.
+
+        Returns:
+            int: Permissions du fichier existant, ou 0666 moins le masque de
+                 l'utilisateur s'il n'existe pas.
         """
         try:
-            with open(json_filename, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            if "Reddit" in data:
-                for row in data["Reddit"]:
-                    doc = RedditDocument(
-                        title=row["title"],
-                        author=row["author"],
-                        date=row["date"],
-                        url=row["url"],
-                        text=row["text"],
-                        num_comments=row["num_comments"],
-                    )
-                    self.add_document(doc)
-
-            if "Arxiv" in data:
-                for row in data["Arxiv"]:
-                    doc = ArxivDocument(
-                        title=row["title"],
-                        author=row["main_author"],
-                        co_authors=row["co_authors"],
-                        date=row["date"],
-                        url=row["url"],
-                        text=row["text"],
-                    )
-                    self.add_document(doc)
+            return stat.S_IMODE(os.stat(filename).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+    @staticmethod
+    def read_json_batches(json_filename, batch_size=1000):
+        """
+        Lit les documents d'un fichier JSON par lots de taille bornée, sans les
+        ajouter au corpus.
 
+        Args:
+            json_filename (str): Nom du fichier JSON.
+            batch_size (int, optional): Nombre maximal de documents par lot.
+
+        Yields:
+            list: Lots de documents (`RedditDocument` ou `ArxivDocument`).
+        """
+        batch = []
+        for doc_type, row in iter_json_records(json_filename):
+            if doc_type not in ("Reddit", "Arxiv"):
+                continue
+            batch.append(DocumentFactory.create_document(doc_type, **row))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def stream_from_json(self, json_filename, batch_size=1000):
+        """
+        Charge un fichier JSON lot par lot et rend la main après chaque lot ajouté,
+        ce qui permet par exemple d'indexer les documents pendant le chargement.
+
+        Args:
+            json_filename (str): Nom du fichier JSON.
+            batch_size (int, optional): Nombre maximal de documents par lot.
+
+        Yields:
+            list: Identifiants des documents du lot qui vient d'être ajouté (les
+                  doublons ignorés n'y figurent pas).
+        """
+        for batch in self.read_json_batches(json_filename, batch_size):
+            added = []
+            for doc in batch:
+                next_id = self.next_id
+                doc_id = self.add_document(doc)
+                if doc_id >= next_id:
+                    added.append(doc_id)
+            yield added
+
+    def load_from_json(self, json_filename, batch_size=1000):
+        """
+        Charge un corpus à partir d'un fichier JSON, en flux : la mémoire utilisée
+        pendant la lecture ne dépend pas de la taille du fichier.
+
+        Args:
+            json_filename (str): Nom du fichier JSON.
+            batch_size (int, optional): Nombre maximal de documents lus par lot.
+        """
+        try:
+            for _ in self.stream_from_json(json_filename, batch_size):
+                pass
             print(f"Corpus chargé avec succès depuis {json_filename}.")
         except Exception as e:
             print(f"Erreur lors du chargement depuis {json_filename} : {e}")
 
-    def display_sorted_by_date(self, n=None):
+    def save_to_binary(self, path):
         """
-        Affiche les documents du corpus triés par date.
+        Sauvegarde le corpus au format binaire en colonnes (voir `BinaryCorpusWriter`).
+
+        Args:
+            path (str): Répertoire de destination.
+        """
+        try:
+            with BinaryCorpusWriter(path) as writer:
+                for doc in self.id2doc.values():
+                    writer.add(doc)
+            print(f"Corpus sauvegardé avec succès dans {path}.")
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde dans {path} : {e}")
+
+    def load_from_binary(self, path, mmap=True):
+        """
+        Charge un corpus sauvegardé au format binaire. Les textes restent dans les
+        fichiers projetés en mémoire et ne sont décodés qu'à la première lecture.
+
+        Args:
+            path (str): Répertoire du corpus binaire.
+            mmap (bool, optional): Projeter les fichiers en mémoire plutôt que les lire.
+        """
+        try:
+            for doc in read_binary_documents(path, mmap):
+                self.add_document(doc)
+            print(f"Corpus chargé avec succès depuis {path}.")
+        except Exception as e:
+            print(f"Erreur lors du chargement depuis {path} : {e}")
+
+    def display_sorted_by_date(self, n=None, year=None, month=None):
+        """
+        Affiche les documents du corpus triés par date, du plus récent au plus ancien.
+        L'ordre est lu dans l'index des dates (`self.dates`) : afficher les `n` plus
+        récents ne coûte que O(n). Les documents sans date valide sont affichés en
+        dernier.
 
         Args:
             n (int, optional): Nombre de documents à afficher. Affiche tous les documents si None.
+            year (int, optional): N'afficher que les documents de cette année.
+            month (int, optional): Avec `year`, n'afficher que les documents de ce mois.
         """
-        sorted_docs = sorted(
-            self.id2doc.values(),
-            key=lambda doc: datetime.strptime(doc.date, "%Y/%m/%d"),
-            reverse=True,
-        )
-        for doc in sorted_docs[:n]:
+        if year is not None:
+            doc_ids = self.dates.year(year, month)[::-1][:n]
+        else:
+            doc_ids = self.dates.newest(n)
+            if n is None or len(doc_ids) < n:
+                doc_ids = np.concatenate([doc_ids, self.dates.undated()])[:n]
+        for doc_id in doc_ids.tolist():
+            doc = self.id2doc[doc_id]
             print(f"{doc.date} - {doc.title} (Auteur(s) : {doc.author})")
 
     def display_sorted_by_title(self, n=None):
@@ -250,101 +616,127 @@ class Corpus(metaclass=SingletonMeta):
         for doc in sorted_docs[:n]:
             print(f"{doc.title} - {doc.date} (Auteur(s) : {doc.author})")
 
-    def search(self, keyword):
+    def get_positional_index(self):
+        """
+        Retourne l'index positionnel du corpus, construit au premier appel puis tenu
+        à jour à chaque ajout ou retrait de document.
+
+        Returns:
+            PositionalIndex: Index positionnel du corpus.
         """
-        Recherche des occurrences d'un mot-clé dans le corpus.
+        if self.positional_index is None:
+            self.positional_index = PositionalIndex(self)
+        return self.positional_index
+
+    def get_author_index(self):
+        """
+        Retourne l'index des auteurs du corpus (co-auteurs compris), construit au
+        premier appel puis tenu à jour à chaque ajout ou retrait de document.
+
+        Returns:
+            AuthorIndex: Index des auteurs du corpus.
+        """
+        if self.author_index is None:
+            self.author_index = AuthorIndex(self)
+        return self.author_index
+
+    def search(self, keyword, context_size=30):
+        """
+        Recherche des occurrences d'un mot-clé (ou d'une suite de mots) dans le corpus,
+        à l'aide de l'index positionnel.
+
+        Seuls des mots entiers sont retrouvés, découpés comme les documents
+        (`tokenize`) : une sous-chaîne (« vacc » pour « vaccine »), un mot vide
+        (« the ») ou un nombre (« 2021 ») ne donnent aucune occurrence.
 
         Args:
             keyword (str): Mot-clé à rechercher.
-        """
-        if not self.full_text:
-            self.full_text = "\n".join(doc.text for doc in self.id2doc.values())
+            context_size (int): Taille du contexte affiché autour du mot-clé.
 
-        pattern = rf"(.{{0,30}}{re.escape(keyword)}.{{0,30}})"
-        matches = re.findall(pattern, self.full_text, re.IGNORECASE)
+        Returns:
+            list: Couples `(doc_id, extrait)` des occurrences trouvées.
+        """
+        matches = []
+        for doc_id, start, end in self.get_positional_index().find(keyword):
+            text = self.id2doc[doc_id].text
+            matches.append(
+                (doc_id, text[max(0, start - context_size) : end + context_size])
+            )
 
         if matches:
             print(f"{len(matches)} occurence(s) trouvée(s) pour '{keyword}':\n")
-            for match in matches:
-                print(f"...{match}...")
+            for doc_id, match in matches:
+                print(f"[{doc_id}] ...{match}...")
         else:
             print(f"Aucune occurrence trouvée pour '{keyword}'.")
+        return matches
 
     def concorde(self, keyword, context_size=15):
         """
-        Génère un concordancier pour un mot-clé.
+        Génère un concordancier pour un mot-clé, à partir des postings de l'index
+        positionnel. Comme pour `search`, seuls des mots entiers, hors mots vides et
+        nombres, sont retrouvés.
 
         Args:
             keyword (str): Mot-clé à analyser.
             context_size (int): Taille du contexte autour du mot-clé.
-        """
-        concordances = []
 
-        if not self.full_text:
-            self.full_text = "\n".join(doc.text for doc in self.id2doc.values())
-
-        pattern = re.compile(
-            rf"(.{{0,{context_size}}})({re.escape(keyword)})(.{{0,{context_size}}})"
+        Returns:
+            pd.DataFrame: Une ligne par occurrence, avec l'identifiant du document.
+        """
+        concordances = self.get_positional_index().concordance(keyword, context_size)
+        df_concordancier = pd.DataFrame(
+            concordances,
+            columns=["Document ID", "Contexte gauche", "Motif trouvé", "Contexte droit"],
         )
-
-        for match in pattern.finditer(self.full_text):
-            left_context = match.group(1).strip()
-            found_keyword = match.group(2)
-            right_context = match.group(3).strip()
-
-            concordances.append(
-                {
-                    "Contexte gauche": "..." + left_context,
-                    "Motif trouvé": found_keyword,
-                    "Contexte droit": right_context + "...",
-                }
-            )
-
-        df_concordancier = pd.DataFrame(concordances)
         print("\nConcordancier :")
         print(df_concordancier)
+        return df_concordancier
+
+    def get_statistics(self):
+        """
+        Retourne les statistiques textuelles du corpus, calculées au premier appel puis
+        tenues à jour à chaque ajout ou retrait de document.
+
+        Returns:
+            CorpusStats: Statistiques du corpus.
+        """
+        if self.statistics is None:
+            self.statistics = CorpusStats(self)
+        return self.statistics
 
     def stats(self, n=10):
         """
         Affiche des statistiques textuelles sur le corpus.
 
+        Les compteurs sont maintenus au fil des ajouts (voir `CorpusStats`) : des appels
+        répétés sur un corpus inchangé réutilisent les résultats en cache.
+
         Args:
             n (int): Nombre de mots les plus fréquents à afficher.
-        """
-        if not self.full_text:
-            self.full_text = "\n".join(doc.text for doc in self.id2doc.values())
 
-        filtered_text = remove_stopwords(self.full_text)
-        vocabulary = build_vocabulary(filtered_text)
-        occurrences = count_occurrences(filtered_text)
+        Returns:
+            dict: Taille du vocabulaire (`vocabulary_size`), mots les plus fréquents
+                  (`most_common`, couples `(mot, fréquence)`) et tableau des
+                  fréquences (`table`).
+        """
+        statistics = self.get_statistics()
+        result = {
+            "vocabulary_size": statistics.vocabulary_size,
+            "most_common": statistics.most_common(n),
+            "table": statistics.table(),
+        }
         print(
-            f"Nombre de mots différents dans le corpus (sans stop words) : {len(vocabulary)}"
+            "Nombre de mots différents dans le corpus (sans stop words) : "
+            f"{result['vocabulary_size']}"
         )
-
-        frequent_words = sorted(occurrences.items(), key=lambda x: x[1], reverse=True)[
-            :n
-        ]
         print(f"Les {n} mots les plus fréquents (sans stop words) :")
-        for word, freq in frequent_words:
+        for word, freq in result["most_common"]:
             print(f"  - {word} : {freq} occurrences")
 
-        documents = [remove_stopwords(doc.text) for doc in self.id2doc.values()]
-        document_frequency = count_document_frequency(documents)
-
-        tab = pd.DataFrame(
-            {
-                "Mot": list(occurrences.keys()),
-                "Fréquence": list(occurrences.values()),
-                "Fréquence de documents": [
-                    document_frequency.get(word, 0) for word in occurrences.keys()
-                ],
-            }
-        )
-
-        tab = tab.sort_values(by="Fréquence", ascending=False)
-
         print("\nTableau des fréquences :")
-        print(tab)
+        print(result["table"])
+        return result
 
     def __repr__(self):
         """
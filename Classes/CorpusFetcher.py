@@ -0,0 +1,438 @@
+import base64
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+import xmltodict
+from Classes.Document import RedditDocument, ArxivDocument
+
+# Délai minimal (en secondes) entre deux requêtes vers les hôtes connus : ArXiv demande
+# une requête toutes les 3 secondes, Reddit tolère environ 10 requêtes par minute sans
+# authentification et 100 par minute avec un client OAuth
+HOST_INTERVALS = {"export.arxiv.org": 3.0, "www.reddit.com": 6.0, "oauth.reddit.com": 0.6}
+
+
+class CorpusFetcher:
+    """
+    Classe chargée de récupérer des documents depuis Reddit et ArXiv.
+
+    Les deux sources sont interrogées en parallèle par un pool de threads de taille
+    bornée. ArXiv est parcouru page par page (paramètre `start`), Reddit en suivant le
+    curseur `after` de ses listings JSON. Chaque hôte est interrogé au plus une fois
+    par intervalle (`host_intervals`, `min_interval` pour les autres hôtes), et les
+    erreurs transitoires (réseau, 429, 5xx) sont retentées avec un délai exponentiel.
+    Un `HttpCache` optionnel évite de retélécharger et de réanalyser les réponses
+    inchangées.
+
+    Avec des identifiants d'application Reddit, les listings sont lus par l'API
+    authentifiée (`oauth.reddit.com`, jeton OAuth « application only ») ; sans
+    identifiants, par les listings JSON publics, dont la limite de débit est bien
+    plus stricte.
+    """
+
+    def __init__(
+        self,
+        arxiv_url="http://export.arxiv.org/api/query",
+        reddit_url=None,
+        user_agent="QueryPy",
+        max_workers=4,
+        min_interval=1.0,
+        max_retries=3,
+        backoff=1.0,
+        timeout=30,
+        cache=None,
+        host_intervals=None,
+        reddit_client_id=None,
+        reddit_client_secret=None,
+        reddit_token_url="https://www.reddit.com/api/v1/access_token",
+    ):
+        """
+        Initialise le collecteur.
+
+        Args:
+            arxiv_url (str): URL de l'API ArXiv.
+            reddit_url (str, optional): URL de base des listings Reddit. Par défaut,
+                `https://oauth.reddit.com` avec des identifiants, `https://www.reddit.com`
+                sans.
+            user_agent (str): En-tête User-Agent envoyé avec chaque requête.
+            max_workers (int): Nombre maximal de requêtes simultanées.
+            min_interval (float): Délai minimal (en secondes) entre deux requêtes vers un
+                même hôte absent de `host_intervals`.
+            max_retries (int): Nombre de nouvelles tentatives après un échec transitoire.
+            backoff (float): Délai (en secondes) avant la première nouvelle tentative, doublé ensuite.
+            timeout (float): Délai maximal d'attente d'une réponse, en secondes.
+            cache (HttpCache, optional): Cache disque des réponses. Par défaut, aucun.
+            host_intervals (dict, optional): Délai minimal (en secondes) entre deux
+                requêtes, par hôte. Par défaut, `HOST_INTERVALS`.
+            reddit_client_id (str, optional): Identifiant d'une application Reddit.
+            reddit_client_secret (str, optional): Secret de l'application Reddit.
+            reddit_token_url (str): URL de délivrance des jetons OAuth de Reddit.
+        """
+        self.authenticated = bool(reddit_client_id and reddit_client_secret)
+        if reddit_url is None:
+            reddit_url = (
+                "https://oauth.reddit.com" if self.authenticated else "https://www.reddit.com"
+            )
+        self.arxiv_url = arxiv_url
+        self.reddit_url = reddit_url.rstrip("/")
+        self.user_agent = user_agent
+        self.max_workers = max_workers
+        self.min_interval = min_interval
+        self.host_intervals = HOST_INTERVALS if host_intervals is None else host_intervals
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.stats = {"downloads": 0, "cache_hits": 0, "revalidated": 0, "parse_skipped": 0}
+        self.lock = threading.Lock()
+        self.next_request = {}
+        self.reddit_credentials = (reddit_client_id, reddit_client_secret)
+        self.reddit_token_url = reddit_token_url
+        # Jeton OAuth courant et date (horloge monotone) à laquelle le renouveler
+        self.token_lock = threading.Lock()
+        self.token, self.token_expiry = None, 0.0
+
+    def wait_turn(self, url):
+        """
+        Attend que l'hôte de l'URL puisse être interrogé, puis réserve le créneau suivant.
+
+        Args:
+            url (str): URL sur le point d'être demandée.
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_request.get(host, now))
+            self.next_request[host] = slot + self.host_intervals.get(host, self.min_interval)
+        if slot > now:
+            time.sleep(slot - now)
+
+    def count(self, name):
+        """
+        Incrémente un compteur de `stats` (appelée depuis plusieurs threads).
+        """
+        with self.lock:
+            self.stats[name] += 1
+
+    def request(self, url, headers=None):
+        """
+        Envoie une requête GET en respectant la limite de débit et en retentant les
+        échecs transitoires.
+
+        Args:
+            url (str): URL à télécharger.
+            headers (dict, optional): En-têtes supplémentaires (requête conditionnelle).
+
+        Returns:
+            tuple:
+                - status (int): Code HTTP de la réponse (200, ou 304 si le contenu n'a
+                  pas changé depuis la requête conditionnelle).
+                - body (bytes): Corps de la réponse.
+                - headers: En-têtes de la réponse.
+
+        Raises:
+            urllib.error.URLError: Si la requête échoue définitivement.
+        """
+        request = urllib.request.Request(
+            url, headers={"User-Agent": self.user_agent, **(headers or {})}
+        )
+        for attempt in range(self.max_retries + 1):
+            self.wait_turn(url)
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return response.status, response.read(), response.headers
+            except urllib.error.HTTPError as e:
+                if e.code == 304:
+                    return e.code, b"", e.headers
+                if (e.code != 429 and e.code < 500) or attempt == self.max_retries:
+                    raise
+                retry_after = e.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2**attempt
+            except (urllib.error.URLError, TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2**attempt
+            time.sleep(delay)
+
+    def reddit_headers(self):
+        """
+        Retourne les en-têtes d'authentification des requêtes Reddit, en demandant un
+        nouveau jeton OAuth si le jeton courant expire.
+
+        Returns:
+            dict: En-tête `Authorization`, ou dictionnaire vide sans identifiants.
+
+        Raises:
+            urllib.error.URLError: Si la demande de jeton échoue.
+        """
+        if not self.authenticated:
+            return {}
+        with self.token_lock:
+            if self.token is None or time.monotonic() >= self.token_expiry:
+                credentials = base64.b64encode(":".join(self.reddit_credentials).encode())
+                request = urllib.request.Request(
+                    self.reddit_token_url,
+                    data=urllib.parse.urlencode({"grant_type": "client_credentials"}).encode(),
+                    headers={
+                        "User-Agent": self.user_agent,
+                        "Authorization": f"Basic {credentials.decode()}",
+                    },
+                )
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    token = json.loads(response.read())
+                self.token = token["access_token"]
+                # Renouvelé une minute avant son expiration
+                self.token_expiry = time.monotonic() + token.get("expires_in", 3600) - 60
+            return {"Authorization": f"bearer {self.token}"}
+
+    def fetch(self, url, headers=None):
+        """
+        Télécharge une URL, en passant par le cache s'il y en a un.
+
+        Une réponse fraîche en cache est servie sans requête ; une réponse périmée est
+        revalidée par une requête conditionnelle (`If-None-Match`, `If-Modified-Since`).
+
+        Args:
+            url (str): URL à télécharger.
+            headers (dict, optional): En-têtes supplémentaires (authentification).
+
+        Returns:
+            tuple:
+                - body (bytes): Corps de la réponse.
+                - content_hash (str | None): Empreinte du corps, None sans cache.
+
+        Raises:
+            urllib.error.URLError: Si la requête échoue définitivement.
+        """
+        headers = headers or {}
+        if self.cache is None:
+            return self.request(url, headers)[1], None
+
+        entry = self.cache.lookup(url)
+        status = None
+        if entry is not None:
+            if not entry["fresh"]:
+                status, body, response_headers = self.request(
+                    url, {**headers, **self.cache.conditional_headers(entry)}
+                )
+            if status in (None, 304):
+                try:
+                    cached = self.cache.read(entry)
+                except OSError:
+                    # Corps évincé entre-temps par un autre thread : nouveau téléchargement
+                    status = None
+                else:
+                    if status == 304:
+                        self.count("revalidated")
+                        self.cache.touch(url, entry)
+                    else:
+                        self.count("cache_hits")
+                    return cached, entry["hash"]
+        if status is None:
+            status, body, response_headers = self.request(url, headers)
+
+        self.count("downloads")
+        content_hash = self.cache.store(
+            url, body, response_headers.get("ETag"), response_headers.get("Last-Modified")
+        )
+        return body, content_hash
+
+    def fetch_parsed(self, url, parser, headers=None):
+        """
+        Télécharge une URL et analyse sa réponse. Avec un cache, le résultat de l'analyse
+        est conservé par empreinte de contenu : un corps inchangé n'est pas réanalysé.
+
+        Args:
+            url (str): URL à télécharger.
+            parser (callable): Méthode statique d'analyse (`parse_arxiv`, `parse_reddit`).
+            headers (dict, optional): En-têtes supplémentaires (authentification).
+
+        Returns:
+            Résultat de `parser`.
+        """
+        body, content_hash = self.fetch(url, headers)
+        if content_hash is None:
+            return parser(body)
+        found, result = self.cache.load_parsed(content_hash, parser.__name__)
+        if found:
+            self.count("parse_skipped")
+            return result
+        result = parser(body)
+        self.cache.store_parsed(content_hash, parser.__name__, result)
+        return result
+
+    def arxiv_page_url(self, query, start, page_size):
+        """
+        Construit l'URL d'une page de résultats ArXiv.
+        """
+        params = urllib.parse.urlencode(
+            {"search_query": f"all:{query}", "start": start, "max_results": page_size}
+        )
+        return f"{self.arxiv_url}?{params}"
+
+    @staticmethod
+    def parse_arxiv(data):
+        """
+        Analyse une page de flux Atom ArXiv.
+
+        Args:
+            data (bytes): Réponse de l'API ArXiv.
+
+        Returns:
+            tuple:
+                - documents (list): Documents ArXiv de la page.
+                - total (int | None): Nombre total de résultats annoncé par le flux.
+        """
+        feed = xmltodict.parse(data.decode())["feed"]
+        total = feed.get("opensearch:totalResults")
+        if isinstance(total, dict):
+            total = total.get("#text")
+        total = int(total) if total is not None else None
+        entries = feed.get("entry", [])
+        if isinstance(entries, dict):
+            entries = [entries]
+
+        documents = []
+        for e in entries:
+            title = e["title"]
+            authors = e.get("author", [])
+            if isinstance(authors, list):
+                authors = [a.get("name", "Inconnu") for a in authors]
+            elif isinstance(authors, dict):
+                authors = [authors.get("name", "Inconnu")]
+            main_author = authors[0] if authors else "Inconnu"
+            co_authors = authors[1:] if len(authors) > 1 else []
+            date = datetime.strptime(e["published"], "%Y-%m-%dT%H:%M:%SZ").strftime(
+                "%Y/%m/%d"
+            )
+            url = e["id"]
+            text = e["summary"].replace("\n", " ")
+            documents.append(ArxivDocument(title, main_author, co_authors, date, url, text))
+        return documents, total
+
+    def reddit_page_url(self, subreddit, after, page_size):
+        """
+        Construit l'URL d'une page du listing « hot » d'un subreddit.
+        """
+        params = {"limit": page_size, "raw_json": 1}
+        if after:
+            params["after"] = after
+        return f"{self.reddit_url}/r/{subreddit}/hot.json?{urllib.parse.urlencode(params)}"
+
+    @staticmethod
+    def parse_reddit(data):
+        """
+        Analyse une page de listing Reddit.
+
+        Args:
+            data (bytes): Réponse JSON du listing.
+
+        Returns:
+            tuple:
+                - documents (list): Documents Reddit de la page.
+                - after (str | None): Curseur de la page suivante, None s'il n'y en a plus.
+        """
+        listing = json.loads(data)["data"]
+        documents = []
+        for child in listing.get("children", []):
+            post = child["data"]
+            author = post.get("author") or "Inconnu"
+            date = datetime.fromtimestamp(post["created_utc"]).strftime("%Y/%m/%d")
+            url = "https://www.reddit.com" + post["permalink"]
+            text = post.get("selftext", "").replace("\n", " ")
+            documents.append(
+                RedditDocument(post["title"], author, date, url, text, post["num_comments"])
+            )
+        return documents, listing.get("after")
+
+    def fetch_reddit_page(self, subreddit, after, page_size):
+        """
+        Télécharge et analyse une page Reddit.
+        """
+        url = self.reddit_page_url(subreddit, after, page_size)
+        return self.fetch_parsed(url, self.parse_reddit, self.reddit_headers())
+
+    def fetch_arxiv_page(self, query, start, page_size):
+        """
+        Télécharge et analyse une page ArXiv.
+        """
+        url = self.arxiv_page_url(query, start, page_size)
+        return self.fetch_parsed(url, self.parse_arxiv)
+
+    def fetch_corpus(self, corpus, query, reddit_limit=50, arxiv_limit=50, page_size=25):
+        """
+        Alimente un corpus depuis Reddit et ArXiv en parallèle. Chaque page est
+        analysée et ses documents ajoutés au corpus dès qu'elle arrive.
+
+        Les ajouts au corpus se font tous dans le thread appelant ; seules les
+        requêtes et l'analyse des réponses sont parallélisées. Les pages ArXiv sont
+        lancées au fur et à mesure, jamais plus de `max_workers - 1` à la fois : leurs
+        requêtes attendent leur créneau (3 secondes entre deux requêtes), et un
+        thread reste ainsi toujours libre pour la page Reddit suivante.
+
+        Args:
+            corpus (Corpus): Corpus à alimenter.
+            query (str): Subreddit et requête ArXiv.
+            reddit_limit (int): Nombre maximal de posts Reddit.
+            arxiv_limit (int): Nombre maximal d'articles ArXiv.
+            page_size (int): Nombre de résultats demandés par page.
+
+        Returns:
+            dict: Nombre de documents ajoutés par source.
+        """
+        added = {"Reddit": 0, "Arxiv": 0}
+        received = {"Reddit": 0, "Arxiv": 0}
+        max_arxiv_pages = max(self.max_workers - 1, 1)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            # Débuts des pages ArXiv restant à lancer, connus avec la première page
+            arxiv_starts = []
+
+            def submit_arxiv():
+                in_flight = sum(source == "Arxiv" for source in pending.values())
+                while arxiv_starts and in_flight < max_arxiv_pages:
+                    start, size = arxiv_starts.pop(0)
+                    pending[executor.submit(self.fetch_arxiv_page, query, start, size)] = "Arxiv"
+                    in_flight += 1
+
+            if reddit_limit > 0:
+                size = min(page_size, reddit_limit)
+                pending[executor.submit(self.fetch_reddit_page, query, None, size)] = "Reddit"
+            if arxiv_limit > 0:
+                size = min(page_size, arxiv_limit)
+                pending[executor.submit(self.fetch_arxiv_page, query, 0, size)] = "Arxiv"
+
+            arxiv_scheduled = False
+            while pending:
+                future = next(as_completed(pending))
+                source = pending.pop(future)
+                documents, cursor = future.result()
+                limit = reddit_limit if source == "Reddit" else arxiv_limit
+                for doc in documents[: limit - received[source]]:
+                    received[source] += 1
+                    # Les doublons ignorés par le corpus ne sont pas comptés comme ajoutés
+                    next_id = corpus.next_id
+                    if corpus.add_document(doc) >= next_id:
+                        added[source] += 1
+
+                if source == "Reddit":
+                    # Le curseur `after` impose de parcourir Reddit page par page
+                    if cursor and documents and received["Reddit"] < reddit_limit:
+                        size = min(page_size, reddit_limit - received["Reddit"])
+                        future = executor.submit(self.fetch_reddit_page, query, cursor, size)
+                        pending[future] = "Reddit"
+                    continue
+                if not arxiv_scheduled:
+                    # La première page ArXiv donne le total, donc les pages suivantes
+                    arxiv_scheduled = True
+                    total = arxiv_limit if cursor is None else min(cursor, arxiv_limit)
+                    arxiv_starts = [
+                        (start, min(page_size, total - start))
+                        for start in range(page_size, total, page_size)
+                    ]
+                submit_arxiv()
+        return added
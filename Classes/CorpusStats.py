@@ -0,0 +1,118 @@
+import heapq
+from collections import Counter
+import pandas as pd
+
+
+class CorpusStats:
+    """
+    Classe tenant à jour les statistiques textuelles d'un corpus : fréquence de chaque
+    mot (hors stop words) et nombre de documents qui le contiennent.
+
+    Les compteurs s'abonnent au corpus et sont mis à jour à chaque ajout ou retrait de
+    document, à partir des comptes de mots mis en cache par le document
+    (`Document.term_counts`). Les comptes pris en compte à l'ajout sont conservés par
+    document : un retrait décompte exactement ce qui a été compté, même si le texte
+    du document a été modifié entre-temps. Les classements et le tableau des
+    fréquences sont mis en cache jusqu'à la modification suivante.
+    """
+
+    def __init__(self, corpus):
+        """
+        Compte les mots des documents du corpus et s'y abonne.
+
+        Args:
+            corpus (Corpus): Corpus à analyser.
+        """
+        self.term_frequency = Counter()
+        self.document_frequency = Counter()
+        # Comptes de mots comptés pour chaque document (dictionnaires partagés avec
+        # les documents, qui en créent un nouveau lorsque leur texte change)
+        self.doc_counts = {}
+        self.top_cache = []
+        self.table_cache = None
+        for doc_id, document in corpus.id2doc.items():
+            self.document_added(doc_id, document)
+        corpus.subscribe(self)
+
+    def invalidate(self):
+        """
+        Vide les résultats mis en cache.
+        """
+        self.top_cache = []
+        self.table_cache = None
+
+    def document_added(self, doc_id, document):
+        """
+        Notifié par le corpus lorsqu'un document est ajouté : compte ses mots.
+
+        Args:
+            doc_id (int): Identifiant du document dans le corpus.
+            document (Document): Document ajouté.
+        """
+        counts = self.doc_counts[doc_id] = document.term_counts
+        self.term_frequency.update(counts)
+        self.document_frequency.update(counts.keys())
+        self.invalidate()
+
+    def document_removed(self, doc_id, document):
+        """
+        Notifié par le corpus lorsqu'un document est retiré : décompte les mots
+        comptés à son ajout.
+
+        Args:
+            doc_id (int): Identifiant du document dans le corpus.
+            document (Document): Document retiré.
+        """
+        counts = self.doc_counts.pop(doc_id)
+        for word, count in counts.items():
+            self.term_frequency[word] -= count
+            self.document_frequency[word] -= 1
+            if self.document_frequency[word] == 0:
+                del self.term_frequency[word]
+                del self.document_frequency[word]
+        self.invalidate()
+
+    @property
+    def vocabulary_size(self):
+        """
+        Nombre de mots différents dans le corpus (sans stop words).
+        """
+        return len(self.term_frequency)
+
+    def most_common(self, n=10):
+        """
+        Retourne les mots les plus fréquents. Le classement calculé est conservé : un
+        nouvel appel avec un `n` inférieur ou égal, sans modification du corpus entre
+        temps, ne coûte que O(n).
+
+        Args:
+            n (int): Nombre de mots à retourner.
+
+        Returns:
+            list: Couples `(mot, fréquence)`, par fréquence décroissante (à fréquence
+                  égale, dans l'ordre de première apparition).
+        """
+        if n > len(self.top_cache) and len(self.top_cache) < len(self.term_frequency):
+            self.top_cache = heapq.nlargest(
+                n, self.term_frequency.items(), key=lambda item: item[1]
+            )
+        return self.top_cache[:n]
+
+    def table(self):
+        """
+        Retourne le tableau des fréquences de tous les mots, mis en cache.
+
+        Returns:
+            pd.DataFrame: Colonnes "Mot", "Fréquence" et "Fréquence de documents",
+                          par fréquence décroissante.
+        """
+        if self.table_cache is None:
+            words = list(self.term_frequency)
+            self.table_cache = pd.DataFrame(
+                {
+                    "Mot": words,
+                    "Fréquence": [self.term_frequency[word] for word in words],
+                    "Fréquence de documents": [self.document_frequency[word] for word in words],
+                }
+            ).sort_values(by="Fréquence", ascending=False, kind="stable")
+        return self.table_cache
@@ -0,0 +1,195 @@
+from datetime import date
+import numpy as np
+from Classes.GrowableCSR import grow
+
+# Ordinal d'un document sans date (ou de date invalide), puis d'un document retiré
+UNDATED = -1
+REMOVED = -2
+
+
+def date_to_days(date_str):
+    """
+    Convertit une date au format YYYY/MM/DD en nombre de jours (ordinal grégorien).
+
+    Args:
+        date_str (str): Date à convertir.
+
+    Returns:
+        int: Nombre de jours, ou -1 si la date est absente ou invalide.
+    """
+    try:
+        year, month, day = date_str.split("/")
+        return date(int(year), int(month), int(day)).toordinal()
+    except (AttributeError, TypeError, ValueError):
+        return UNDATED
+
+
+def days_to_date(days):
+    """
+    Convertit un nombre de jours (ordinal grégorien) en date au format YYYY/MM/DD.
+
+    Args:
+        days (int): Nombre de jours, -1 pour une date absente.
+
+    Returns:
+        str: Date formatée, ou chaîne vide si la date est absente.
+    """
+    return date.fromordinal(int(days)).strftime("%Y/%m/%d") if days > 0 else ""
+
+
+class DateIndex:
+    """
+    Classe représentant l'index des dates des documents d'un corpus.
+
+    Chaque date est analysée une seule fois, à l'ajout du document, et rangée sous
+    forme d'ordinal dans `ordinals[doc_id]` (`UNDATED` si le document n'a pas de date
+    valide, `REMOVED` s'il a été retiré). Un ordre des documents par date est maintenu
+    à la demande : après un ajout ou un retrait, il est recalculé une fois, à la
+    requête suivante. Les requêtes par intervalle (dates, année, mois) coûtent alors
+    O(log n) plus le nombre de résultats, et les `k` documents les plus récents O(k).
+    """
+
+    def __init__(self):
+        """
+        Initialise un index vide.
+        """
+        self.ordinals = np.full(0, REMOVED, dtype=np.int32)
+        self.parsed = {}
+        self.order = np.empty(0, dtype=np.int64)
+        self.sorted_ordinals = np.empty(0, dtype=np.int32)
+        self.dirty = False
+
+    def parse(self, date_str):
+        """
+        Retourne l'ordinal d'une date, en mémorisant les dates déjà rencontrées.
+        """
+        if date_str not in self.parsed:
+            self.parsed[date_str] = date_to_days(date_str)
+        return self.parsed[date_str]
+
+    def add(self, doc_id, date_str):
+        """
+        Enregistre la date d'un document.
+
+        Args:
+            doc_id (int): Identifiant du document.
+            date_str (str): Date du document (format YYYY/MM/DD).
+        """
+        if doc_id >= len(self.ordinals):
+            size = len(self.ordinals)
+            self.ordinals = grow(self.ordinals, doc_id + 1)
+            self.ordinals[size:] = REMOVED
+        self.ordinals[doc_id] = self.parse(date_str)
+        self.dirty = True
+
+    def remove(self, doc_id):
+        """
+        Retire un document de l'index.
+
+        Args:
+            doc_id (int): Identifiant du document.
+        """
+        self.ordinals[doc_id] = REMOVED
+        self.dirty = True
+
+    def sort(self):
+        """
+        Recalcule l'ordre des documents datés si l'index a changé : par date
+        croissante et, à date égale, par identifiant décroissant (l'ordre inverse
+        donne ainsi les plus récents d'abord, par identifiant croissant).
+        """
+        if not self.dirty:
+            return
+        doc_ids = np.flatnonzero(self.ordinals >= 0)
+        ordinals = self.ordinals[doc_ids]
+        self.order = doc_ids[np.lexsort((-doc_ids, ordinals))]
+        self.sorted_ordinals = self.ordinals[self.order]
+        self.dirty = False
+
+    def range(self, first, last):
+        """
+        Retourne les documents dont l'ordinal est compris entre deux bornes incluses.
+
+        Args:
+            first (int): Premier jour de l'intervalle (ordinal).
+            last (int): Dernier jour de l'intervalle (ordinal).
+
+        Returns:
+            np.ndarray: Identifiants des documents, par date croissante.
+        """
+        self.sort()
+        start = np.searchsorted(self.sorted_ordinals, first, side="left")
+        end = np.searchsorted(self.sorted_ordinals, last, side="right")
+        return self.order[start:end]
+
+    def between(self, start, end):
+        """
+        Retourne les documents publiés entre deux dates incluses.
+
+        Args:
+            start (str): Première date (format YYYY/MM/DD).
+            end (str): Dernière date (format YYYY/MM/DD).
+
+        Returns:
+            np.ndarray: Identifiants des documents, par date croissante.
+        """
+        return self.range(date_to_days(start), date_to_days(end))
+
+    @staticmethod
+    def year_bounds(year, month=None):
+        """
+        Retourne le premier et le dernier jour (ordinaux) d'une année ou d'un mois.
+
+        Args:
+            year (int): Année.
+            month (int, optional): Mois (de 1 à 12) ; toute l'année si None.
+
+        Returns:
+            tuple: `(premier jour, dernier jour)`, ou un intervalle vide (premier jour
+                   postérieur au dernier) si l'année ou le mois ne sont pas des dates
+                   représentables (année hors de 1..9999, par exemple 20222).
+        """
+        if not date.min.year <= year <= date.max.year or month not in (None, *range(1, 13)):
+            return 1, 0
+        if month is None:
+            return date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal()
+        first = date(year, month, 1).toordinal()
+        if month == 12:
+            return first, date(year, 12, 31).toordinal()
+        return first, date(year, month + 1, 1).toordinal() - 1
+
+    def year(self, year, month=None):
+        """
+        Retourne les documents d'une année, ou d'un mois de cette année.
+
+        Args:
+            year (int): Année.
+            month (int, optional): Mois (de 1 à 12).
+
+        Returns:
+            np.ndarray: Identifiants des documents, par date croissante (aucun pour
+                        une année ou un mois hors des dates représentables).
+        """
+        return self.range(*self.year_bounds(year, month))
+
+    def newest(self, k=None):
+        """
+        Retourne les `k` documents les plus récents.
+
+        Args:
+            k (int, optional): Nombre de documents ; tous les documents datés si None.
+
+        Returns:
+            np.ndarray: Identifiants des documents, du plus récent au plus ancien.
+        """
+        self.sort()
+        return self.order[::-1][:k]
+
+    def undated(self):
+        """
+        Retourne les documents sans date valide.
+
+        Returns:
+            np.ndarray: Identifiants des documents, par identifiant croissant.
+        """
+        return np.flatnonzero(self.ordinals == UNDATED)
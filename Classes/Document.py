@@ -1,8 +1,72 @@
+import sys
+from tokenizer import NO_STOPWORDS, STOPWORDS, tokenize
+
+
+def intern_string(value):
+    """
+    Interne une chaîne (noms d'auteurs, dates) : les documents qui partagent une même
+    valeur partagent alors un seul objet en mémoire.
+
+    Args:
+        value: Valeur à interner ; retournée telle quelle si ce n'est pas une chaîne.
+
+    Returns:
+        Valeur internée.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+class LazyText:
+    """
+    Classe représentant un texte encodé en UTF-8 dans un tampon (éventuellement projeté
+    en mémoire), qui n'est décodé qu'à la première lecture.
+    """
+
+    __slots__ = ("buffer", "start", "end")
+
+    def __init__(self, buffer, start, end):
+        """
+        Initialise la référence vers le texte.
+
+        Args:
+            buffer (np.ndarray): Tampon d'octets contenant le texte.
+            start (int): Position du premier octet du texte.
+            end (int): Position suivant le dernier octet du texte.
+        """
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+
+    def decode(self):
+        """
+        Décode le texte.
+
+        Returns:
+            str: Texte décodé.
+        """
+        return bytes(self.buffer[self.start : self.end]).decode("utf-8")
+
+
 class Document:
     """
     Classe de base représentant un document général.
+
+    Les attributs sont déclarés dans `__slots__` (pas de `__dict__` par instance) et
+    l'auteur et la date sont internés : le coût mémoire d'un document se réduit
+    essentiellement à celui de son titre, de son URL et de son texte.
     """
 
+    __slots__ = (
+        "title",
+        "author",
+        "date",
+        "url",
+        "_text",
+        "_term_counts",
+        "_word_count",
+        "_split_count",
+    )
+
     def __init__(self, title="", author="", date="", url="", text=""):
         """
         Initialise un document avec un titre, un auteur, une date, une URL et un texte.
@@ -15,11 +79,84 @@ class Document:
             text (str): Contenu textuel du document.
         """
         self.title = title
-        self.author = author
-        self.date = date
+        self.author = intern_string(author)
+        self.date = intern_string(date)
         self.url = url
         self.text = text
 
+    @property
+    def text(self):
+        """
+        str: Contenu textuel du document, décodé à la première lecture s'il provient
+        d'un stockage binaire.
+        """
+        if isinstance(self._text, LazyText):
+            self._text = self._text.decode()
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        self._text = text
+        # Les comptes de mots dépendent du texte : ils seront recalculés à la demande
+        self._term_counts = None
+        self._word_count = None
+        self._split_count = None
+
+    def tokenize(self):
+        """
+        Découpe le texte une fois (voir `tokenizer.tokenize`) et mémorise le nombre
+        d'occurrences de chaque mot hors mots vides ainsi que le nombre total de mots.
+        """
+        words = tokenize(self.text, NO_STOPWORDS)
+        term_counts = {}
+        for word in words:
+            if word not in STOPWORDS:
+                term_counts[word] = term_counts.get(word, 0) + 1
+        self._term_counts = term_counts
+        self._word_count = len(words)
+
+    @property
+    def term_counts(self):
+        """
+        dict: Nombre d'occurrences de chaque mot du texte (hors mots vides), dans
+        l'ordre de première apparition. Calculé à la première lecture puis conservé
+        jusqu'à la prochaine modification du texte ; à ne pas modifier.
+        """
+        if self._term_counts is None:
+            self.tokenize()
+        return self._term_counts
+
+    def cached_term_counts(self):
+        """
+        Retourne les comptes de mots s'ils sont déjà en cache, sans découper le texte.
+
+        Returns:
+            dict | None: Comptes de mots, ou None s'ils n'ont pas encore été calculés.
+        """
+        return self._term_counts
+
+    @property
+    def word_count(self):
+        """
+        int: Nombre de mots du texte, mots vides compris (mis en cache comme
+        `term_counts`).
+        """
+        if self._word_count is None:
+            self.tokenize()
+        return self._word_count
+
+    @property
+    def split_count(self):
+        """
+        int: Nombre de mots du texte séparés par des blancs (`len(text.split())`),
+        nombres et ponctuation compris, comme l'affichent les statistiques d'un
+        auteur. Calculé à la première lecture puis conservé jusqu'à la prochaine
+        modification du texte.
+        """
+        if self._split_count is None:
+            self._split_count = len(self.text.split())
+        return self._split_count
+
     def __repr__(self):
         """
         Renvoie une représentation détaillée et formatée du document.
@@ -87,6 +224,8 @@ class RedditDocument(Document):
     Classe représentant un document provenant de Reddit, avec un compteur de commentaires.
     """
 
+    __slots__ = ("num_comments",)
+
     def __init__(self, title="", author="", date="", url="", text="", num_comments=0):
         """
         Initialise un document Reddit avec des attributs spécifiques.
@@ -150,6 +289,8 @@ class ArxivDocument(Document):
     Classe représentant un document provenant d'ArXiv, avec des co-auteurs.
     """
 
+    __slots__ = ("co_authors",)
+
     def __init__(self, title, author, co_authors, date, url, text):
         """
         Initialise un document ArXiv avec des attributs spécifiques.
@@ -163,7 +304,7 @@ class ArxivDocument(Document):
             text (str): Contenu textuel du document.
         """
         super().__init__(title, author, date, url, text)
-        self.co_authors = co_authors
+        self.co_authors = [intern_string(name) for name in co_authors]
 
     def get_type(self):
         """
@@ -194,7 +335,7 @@ class ArxivDocument(Document):
             ValueError: Si `co_authors` n'est pas une liste.
         """
         if isinstance(co_authors, list):
-            self.co_authors = co_authors
+            self.co_authors = [intern_string(name) for name in co_authors]
         else:
             raise ValueError("co_authors doit être une liste de noms.")
 
@@ -0,0 +1,220 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+def grow(array, size):
+    """
+    Garantit qu'un tableau peut contenir au moins `size` éléments.
+
+    La capacité est au moins doublée à chaque agrandissement : une suite d'ajouts
+    coûte donc en moyenne un temps constant par élément, comme pour une liste Python.
+
+    Args:
+        array (np.ndarray): Tableau à agrandir.
+        size (int): Nombre d'éléments nécessaires.
+
+    Returns:
+        np.ndarray: `array` lui-même s'il est assez grand, sinon une copie agrandie
+                    (complétée par des zéros).
+    """
+    if size <= len(array):
+        return array
+    grown = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class GrowableCSR:
+    """
+    Classe représentant une matrice CSR à laquelle on peut ajouter des lignes et des
+    colonnes sans recopier les lignes existantes.
+
+    La matrice est formée de deux segments : les lignes de départ, conservées telles
+    quelles (tableaux exactement dimensionnés, éventuellement projetés en mémoire par
+    `SearchEngine.load`), et les lignes ajoutées, rangées dans des tampons séparés
+    surdimensionnés dont la capacité double à chaque agrandissement. Un ajout ne copie
+    donc jamais les lignes de départ. Ajouter une colonne ne coûte rien en CSR : seule
+    la forme de la matrice change.
+    """
+
+    def __init__(self, matrix):
+        """
+        Initialise la matrice extensible à partir d'une matrice existante.
+
+        Args:
+            matrix (csr_matrix): Matrice de départ.
+        """
+        matrix = csr_matrix(matrix)
+        indices = matrix.indices.astype(np.int64 if matrix.nnz > 2**31 - 1 else np.int32)
+        self.set_base(matrix.data, indices, matrix.indptr.astype(indices.dtype), matrix.shape)
+
+    @classmethod
+    def from_arrays(cls, data, indices, indptr, shape):
+        """
+        Construit la matrice extensible directement sur des tableaux existants (par
+        exemple projetés en mémoire), sans les recopier.
+
+        Args:
+            data (np.ndarray): Valeurs non nulles.
+            indices (np.ndarray): Indices de colonnes.
+            indptr (np.ndarray): Pointeurs de début de ligne.
+            shape (tuple): Forme `(n_rows, n_cols)` de la matrice.
+
+        Returns:
+            GrowableCSR: Matrice extensible partageant la mémoire des tableaux.
+        """
+        matrix = cls.__new__(cls)
+        matrix.set_base(data, indices, indptr, shape)
+        return matrix
+
+    def set_base(self, data, indices, indptr, shape):
+        """
+        Initialise le segment des lignes de départ et un segment d'ajouts vide.
+
+        Args:
+            data (np.ndarray): Valeurs non nulles.
+            indices (np.ndarray): Indices de colonnes.
+            indptr (np.ndarray): Pointeurs de début de ligne.
+            shape (tuple): Forme `(n_rows, n_cols)` de la matrice.
+        """
+        self.base_rows, self.n_cols = shape
+        self.data, self.indices, self.indptr = data, indices, indptr
+        # Lignes ajoutées : pointeurs relatifs au début du segment
+        self.added_rows = 0
+        self.added_data = np.zeros(0, dtype=data.dtype)
+        self.added_indices = np.zeros(0, dtype=np.int32)
+        self.added_indptr = np.zeros(1, dtype=np.int64)
+
+    @property
+    def n_rows(self):
+        """
+        int: Nombre de lignes de la matrice.
+        """
+        return self.base_rows + self.added_rows
+
+    @property
+    def nnz(self):
+        """
+        int: Nombre de valeurs stockées.
+        """
+        return int(self.indptr[self.base_rows]) + int(self.added_indptr[self.added_rows])
+
+    def matrix(self):
+        """
+        Retourne la matrice au format CSR. Sans ligne ajoutée, c'est une vue des
+        tableaux de départ ; sinon, les deux segments sont réunis dans une copie.
+
+        Returns:
+            csr_matrix: Matrice de forme `(n_rows, n_cols)`.
+        """
+        if self.added_rows:
+            return self.rows_from(0)
+        # Les tableaux sont affectés après construction pour éviter que scipy ne les
+        # recopie ou ne les convertisse
+        view = csr_matrix((self.n_rows, self.n_cols), dtype=self.data.dtype)
+        view.data, view.indices, view.indptr = self.data, self.indices, self.indptr
+        return view
+
+    def rows_from(self, start):
+        """
+        Retourne les lignes `start` et suivantes ; seules ces lignes sont copiées.
+
+        Args:
+            start (int): Première ligne retournée.
+
+        Returns:
+            csr_matrix: Matrice de forme `(n_rows - start, n_cols)`.
+        """
+        data, indices, indptr = [], [], []
+        offset = 0
+        if start < self.base_rows:
+            first, last = self.indptr[start], self.indptr[self.base_rows]
+            data.append(self.data[first:last])
+            indices.append(self.indices[first:last])
+            indptr.append(self.indptr[start : self.base_rows] - first)
+            offset = last - first
+        added_start = max(start - self.base_rows, 0)
+        first, last = self.added_indptr[added_start], self.added_indptr[self.added_rows]
+        data.append(self.added_data[first:last])
+        indices.append(self.added_indices[first:last])
+        indptr.append(self.added_indptr[added_start : self.added_rows + 1] - first + offset)
+        return csr_matrix(
+            (np.concatenate(data), np.concatenate(indices), np.concatenate(indptr)),
+            shape=(self.n_rows - start, self.n_cols),
+        )
+
+    def select_rows(self, row_ids):
+        """
+        Retourne une sélection de lignes ; seules ces lignes sont copiées.
+
+        Args:
+            row_ids (np.ndarray): Numéros des lignes, dans l'ordre voulu.
+
+        Returns:
+            csr_matrix: Matrice de forme `(len(row_ids), n_cols)`.
+        """
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        added = row_ids >= self.base_rows
+        added_ids = row_ids - self.base_rows
+        # Les indices hors d'un segment sont ramenés dans ses bornes, puis ignorés
+        starts = np.where(
+            added,
+            self.added_indptr.take(added_ids, mode="clip"),
+            self.indptr.take(row_ids, mode="clip"),
+        )
+        ends = np.where(
+            added,
+            self.added_indptr.take(added_ids + 1, mode="clip"),
+            self.indptr.take(row_ids + 1, mode="clip"),
+        )
+        lengths = ends - starts
+        indptr = np.zeros(len(row_ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        positions = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        from_added = np.repeat(added, lengths)
+
+        data = np.empty(indptr[-1], dtype=self.data.dtype)
+        indices = np.empty(indptr[-1], dtype=self.indices.dtype)
+        data[~from_added] = self.data[positions[~from_added]]
+        indices[~from_added] = self.indices[positions[~from_added]]
+        data[from_added] = self.added_data[positions[from_added]]
+        indices[from_added] = self.added_indices[positions[from_added]]
+        return csr_matrix((data, indices, indptr), shape=(len(row_ids), self.n_cols))
+
+    def append_rows(self, rows):
+        """
+        Ajoute des lignes à la fin de la matrice. Le nombre de colonnes est étendu si
+        les nouvelles lignes en comptent davantage.
+
+        Args:
+            rows (csr_matrix): Lignes à ajouter.
+        """
+        first = int(self.added_indptr[self.added_rows])
+        nnz = first + rows.nnz
+        n_rows = self.added_rows + rows.shape[0]
+        self.added_data = grow(self.added_data, nnz)
+        self.added_indices = grow(self.added_indices, nnz)
+        self.added_indptr = grow(self.added_indptr, n_rows + 1)
+
+        self.added_data[first:nnz] = rows.data
+        self.added_indices[first:nnz] = rows.indices
+        self.added_indptr[self.added_rows + 1 : n_rows + 1] = rows.indptr[1:] + first
+        self.added_rows = n_rows
+        self.n_cols = max(self.n_cols, rows.shape[1])
+
+    def row(self, i):
+        """
+        Retourne les indices de colonnes et les valeurs d'une ligne (vues modifiables).
+
+        Args:
+            i (int): Numéro de la ligne.
+
+        Returns:
+            tuple: `(indices, data)` de la ligne.
+        """
+        if i < self.base_rows:
+            start, end = self.indptr[i], self.indptr[i + 1]
+            return self.indices[start:end], self.data[start:end]
+        i -= self.base_rows
+        start, end = self.added_indptr[i], self.added_indptr[i + 1]
+        return self.added_indices[start:end], self.added_data[start:end]
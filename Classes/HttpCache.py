@@ -0,0 +1,331 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class HttpCache:
+    """
+    Classe représentant un cache disque de réponses HTTP, adressé par contenu.
+
+    Le répertoire du cache contient :
+        - `entries/` : pour chaque URL (identifiée par l'empreinte SHA-256 de l'URL), un
+          fichier JSON donnant l'empreinte du corps, la date de téléchargement et les
+          validateurs (`ETag`, `Last-Modified`) renvoyés par le serveur ;
+        - `objects/` : les corps de réponses, nommés par l'empreinte SHA-256 de leur
+          contenu (deux URL renvoyant le même contenu partagent un seul fichier) ;
+        - `parsed/` : le résultat de l'analyse d'un corps, par empreinte et par analyseur,
+          pour ne pas réanalyser un contenu inchangé.
+
+    Une entrée plus récente que `ttl` secondes est servie sans requête. Au-delà, elle
+    est revalidée par une requête conditionnelle si le serveur a fourni des validateurs,
+    et supprimée sinon. Quand le cache dépasse `max_bytes`, les entrées les moins
+    récemment utilisées (enregistrées, revalidées ou trouvées par `lookup`) sont
+    supprimées.
+
+    Le répertoire n'est parcouru qu'à l'ouverture du cache : l'ordre d'utilisation des
+    entrées, le nombre d'entrées référençant chaque corps et la taille des fichiers
+    sont ensuite tenus à jour en mémoire, si bien qu'un enregistrement ne relit pas
+    les autres entrées. La date de dernière utilisation d'une entrée est la date de
+    modification de son fichier, ce qui conserve l'ordre d'une session à l'autre.
+    """
+
+    def __init__(self, path, ttl=3600, max_bytes=256 * 2**20):
+        """
+        Ouvre (ou crée) un cache dans un répertoire.
+
+        Args:
+            path (str): Répertoire du cache.
+            ttl (float): Durée de fraîcheur d'une réponse, en secondes.
+            max_bytes (int): Taille maximale des corps et résultats stockés, en octets.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # Les écritures et l'éviction sont sérialisées entre les threads d'un collecteur
+        self.lock = threading.Lock()
+        for directory in ["entries", "objects", "parsed"]:
+            os.makedirs(os.path.join(path, directory), exist_ok=True)
+        self.load_state()
+
+    def load_state(self):
+        """
+        Parcourt le répertoire du cache pour initialiser l'état tenu en mémoire :
+            - `entries` : empreinte du corps de chaque entrée (par nom de fichier),
+              de la moins récemment utilisée à la plus récente ;
+            - `files` : fichiers (corps et résultats d'analyse) de chaque empreinte,
+              avec leur taille ;
+            - `references` : nombre d'entrées référençant chaque empreinte ;
+            - `total` : taille des fichiers des empreintes référencées.
+        """
+        entries = []
+        for name in os.listdir(os.path.join(self.path, "entries")):
+            filename = os.path.join(self.path, "entries", name)
+            if name.endswith(".tmp"):
+                continue
+            try:
+                with open(filename, "r", encoding="utf-8") as f:
+                    entries.append((os.path.getmtime(filename), name, json.load(f)["hash"]))
+            except (OSError, ValueError, KeyError):
+                continue
+        self.entries = OrderedDict(
+            (name, content_hash) for _, name, content_hash in sorted(entries)
+        )
+
+        self.files = {}
+        for directory in ["objects", "parsed"]:
+            for name in os.listdir(os.path.join(self.path, directory)):
+                if name.endswith(".tmp"):
+                    continue
+                filename = os.path.join(self.path, directory, name)
+                self.files.setdefault(name.split(".")[0], {})[filename] = os.path.getsize(filename)
+
+        self.references = {}
+        for content_hash in self.entries.values():
+            self.references[content_hash] = self.references.get(content_hash, 0) + 1
+        self.total = sum(
+            sum(self.files.get(content_hash, {}).values()) for content_hash in self.references
+        )
+        # Corps et résultats laissés par des entrées supprimées
+        for content_hash in [h for h in self.files if h not in self.references]:
+            for filename in self.files.pop(content_hash):
+                os.remove(filename)
+
+    @staticmethod
+    def digest(data):
+        """
+        Retourne l'empreinte SHA-256 (hexadécimale) d'une chaîne d'octets.
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    def entry_path(self, url):
+        """
+        Retourne le fichier de métadonnées associé à une URL.
+        """
+        return os.path.join(self.path, "entries", self.digest(url.encode("utf-8")) + ".json")
+
+    def object_path(self, content_hash):
+        """
+        Retourne le fichier contenant le corps d'empreinte `content_hash`.
+        """
+        return os.path.join(self.path, "objects", content_hash)
+
+    def parsed_path(self, content_hash, parser):
+        """
+        Retourne le fichier contenant le résultat de l'analyse d'un corps.
+        """
+        return os.path.join(self.path, "parsed", f"{content_hash}.{parser}.pkl")
+
+    @staticmethod
+    def write_atomic(filename, data):
+        """
+        Écrit un fichier via un fichier temporaire renommé, pour qu'un lecteur
+        concurrent ne voie jamais un fichier partiel.
+        """
+        directory = os.path.dirname(filename)
+        fd, tmp_filename = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_filename, filename)
+
+    def lookup(self, url):
+        """
+        Cherche la réponse en cache d'une URL.
+
+        Args:
+            url (str): URL demandée.
+
+        Returns:
+            dict | None: Métadonnées de l'entrée (`url`, `hash`, `fetched_at`, `etag`,
+                         `last_modified`) et booléen `fresh`, ou None si l'URL n'est pas
+                         en cache (ou si son entrée a expiré sans validateur).
+        """
+        try:
+            with open(self.entry_path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self.object_path(entry["hash"])):
+            return None
+
+        entry["fresh"] = time.time() - entry["fetched_at"] < self.ttl
+        filename = self.entry_path(url)
+        with self.lock:
+            if not entry["fresh"] and not (entry.get("etag") or entry.get("last_modified")):
+                self.remove_entry(filename)
+                return None
+            # L'entrée devient la plus récemment utilisée
+            self.use_entry(filename, entry["hash"])
+            os.utime(filename)
+        return entry
+
+    def conditional_headers(self, entry):
+        """
+        Construit les en-têtes d'une requête de revalidation.
+
+        Args:
+            entry (dict): Entrée retournée par `lookup`.
+
+        Returns:
+            dict: En-têtes `If-None-Match` et/ou `If-Modified-Since`.
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read(self, entry):
+        """
+        Lit le corps d'une entrée.
+        """
+        with open(self.object_path(entry["hash"]), "rb") as f:
+            return f.read()
+
+    def store(self, url, body, etag=None, last_modified=None):
+        """
+        Enregistre la réponse d'une URL.
+
+        Args:
+            url (str): URL demandée.
+            body (bytes): Corps de la réponse.
+            etag (str, optional): En-tête `ETag` de la réponse.
+            last_modified (str, optional): En-tête `Last-Modified` de la réponse.
+
+        Returns:
+            str: Empreinte du corps.
+        """
+        content_hash = self.digest(body)
+        entry = {
+            "url": url,
+            "hash": content_hash,
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        with self.lock:
+            if not os.path.exists(self.object_path(content_hash)):
+                self.write_atomic(self.object_path(content_hash), body)
+                self.add_file(content_hash, self.object_path(content_hash), len(body))
+            self.write_atomic(self.entry_path(url), json.dumps(entry).encode("utf-8"))
+            self.use_entry(self.entry_path(url), content_hash)
+            self.evict()
+        return content_hash
+
+    def touch(self, url, entry):
+        """
+        Marque une entrée comme revalidée (réponse 304) : elle redevient fraîche.
+
+        Args:
+            url (str): URL demandée.
+            entry (dict): Entrée retournée par `lookup`.
+        """
+        entry = {k: v for k, v in entry.items() if k != "fresh"}
+        entry["fetched_at"] = time.time()
+        with self.lock:
+            self.write_atomic(self.entry_path(url), json.dumps(entry).encode("utf-8"))
+            self.use_entry(self.entry_path(url), entry["hash"])
+
+    def load_parsed(self, content_hash, parser):
+        """
+        Retourne le résultat mis en cache de l'analyse d'un corps.
+
+        Args:
+            content_hash (str): Empreinte du corps.
+            parser (str): Nom de l'analyseur.
+
+        Returns:
+            tuple: `(trouvé, résultat)`.
+        """
+        try:
+            with open(self.parsed_path(content_hash, parser), "rb") as f:
+                return True, pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+            # Résultat absent, tronqué ou écrit par une version antérieure des classes
+            return False, None
+
+    def store_parsed(self, content_hash, parser, result):
+        """
+        Met en cache le résultat de l'analyse d'un corps.
+
+        Args:
+            content_hash (str): Empreinte du corps.
+            parser (str): Nom de l'analyseur.
+            result: Résultat de l'analyse (sérialisable par pickle).
+        """
+        data = pickle.dumps(result)
+        with self.lock:
+            self.write_atomic(self.parsed_path(content_hash, parser), data)
+            self.add_file(content_hash, self.parsed_path(content_hash, parser), len(data))
+            self.evict()
+
+    def add_file(self, content_hash, filename, size):
+        """
+        Enregistre en mémoire un fichier écrit pour une empreinte (corps ou résultat
+        d'analyse). Doit être appelée avec `lock` acquis.
+        """
+        hash_files = self.files.setdefault(content_hash, {})
+        if self.references.get(content_hash, 0):
+            self.total += size - hash_files.get(filename, 0)
+        hash_files[filename] = size
+
+    def use_entry(self, filename, content_hash):
+        """
+        Enregistre en mémoire l'utilisation d'une entrée (éventuellement nouvelle ou
+        pointant vers un autre corps) : elle devient la plus récemment utilisée.
+        Doit être appelée avec `lock` acquis.
+        """
+        name = os.path.basename(filename)
+        previous = self.entries.get(name)
+        if previous != content_hash:
+            if previous is not None:
+                self.release(previous)
+            self.references[content_hash] = self.references.get(content_hash, 0) + 1
+            if self.references[content_hash] == 1:
+                self.total += sum(self.files.get(content_hash, {}).values())
+        self.entries[name] = content_hash
+        self.entries.move_to_end(name)
+
+    def remove_entry(self, filename):
+        """
+        Supprime une entrée, ainsi que son corps et ses résultats d'analyse s'ils ne
+        sont plus référencés. Doit être appelée avec `lock` acquis.
+        """
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+        content_hash = self.entries.pop(os.path.basename(filename), None)
+        if content_hash is not None:
+            self.release(content_hash)
+
+    def release(self, content_hash):
+        """
+        Retire une référence à un corps ; le dernier référencement retiré supprime le
+        corps et ses résultats d'analyse. Doit être appelée avec `lock` acquis.
+        """
+        self.references[content_hash] -= 1
+        if self.references[content_hash]:
+            return
+        del self.references[content_hash]
+        for filename, size in self.files.pop(content_hash, {}).items():
+            self.total -= size
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+    def evict(self):
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à ce que la taille du
+        cache repasse sous `max_bytes`, avec les corps et résultats qui ne sont plus
+        référencés par aucune entrée. Doit être appelée avec `lock` acquis.
+        """
+        while self.total > self.max_bytes and self.entries:
+            name = next(iter(self.entries))
+            self.remove_entry(os.path.join(self.path, "entries", name))
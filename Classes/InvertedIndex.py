@@ -0,0 +1,398 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+def candidate_mask(doc_ids, candidates):
+    """
+    Indique quels postings appartiennent à un ensemble de documents candidats.
+
+    Les deux tableaux sont triés : lorsque les candidats sont peu nombreux devant les
+    postings, chacun est localisé par recherche dichotomique au lieu de trier
+    l'ensemble des postings (`np.isin`), si bien qu'une requête restrictive coûte
+    moins cher qu'une requête ouverte.
+
+    Args:
+        doc_ids (np.ndarray): Identifiants triés des documents d'une liste de postings.
+        candidates (np.ndarray): Identifiants triés des documents candidats.
+
+    Returns:
+        np.ndarray: Masque booléen aligné sur `doc_ids`.
+    """
+    candidates = np.asarray(candidates)
+    if 8 * len(candidates) >= len(doc_ids):
+        return np.isin(doc_ids, candidates, assume_unique=True)
+    positions = np.searchsorted(doc_ids, candidates)
+    positions = positions[positions < len(doc_ids)]
+    mask = np.zeros(len(doc_ids), dtype=bool)
+    mask[positions[doc_ids[positions] == candidates[: len(positions)]]] = True
+    return mask
+
+
+class InvertedIndex:
+    """
+    Classe représentant un index inversé : pour chaque terme du vocabulaire, la liste
+    (posting) des documents qui le contiennent, avec leur fréquence et leur poids TF-IDF.
+
+    Les postings sont stockés à plat, au format CSC : les documents du terme `t` se
+    trouvent entre `indptr[t]` et `indptr[t + 1]`, triés par identifiant croissant.
+
+    Les documents ajoutés après la construction forment des segments « delta »
+    séparés, au même format. Chaque ajout crée un segment à partir des seules lignes
+    ajoutées ; le dernier segment est fusionné avec le précédent tant qu'il est au
+    moins aussi grand, si bien que les segments ont des tailles décroissantes, qu'ils
+    sont en nombre logarithmique et que chaque posting n'est recopié qu'un nombre
+    logarithmique de fois. La partie principale n'est reconstruite que lors d'un
+    rafraîchissement complet.
+
+    Pour chaque terme et chaque segment, l'index conserve aussi le plus grand poids
+    normalisé (poids TF-IDF divisé par la norme du document) et la plus grande
+    fréquence : ces maxima bornent la contribution d'un terme au score d'un document
+    et permettent l'élagage dynamique des requêtes (`WandEvaluator`). Retirer un
+    document ne les diminue pas : ils restent des bornes valides.
+    """
+
+    # Tableaux qui décrivent entièrement l'index (utilisés pour la persistance) ; les
+    # segments delta sont réunis en un seul par `arrays`
+    ARRAYS = [
+        "indptr",
+        "doc_ids",
+        "tfs",
+        "weights",
+        "delta_indptr",
+        "delta_doc_ids",
+        "delta_tfs",
+        "delta_weights",
+        "max_weights",
+        "max_tfs",
+        "delta_max_weights",
+        "delta_max_tfs",
+    ]
+    # Tableaux d'un segment
+    SEGMENT_ARRAYS = ["indptr", "doc_ids", "tfs", "weights", "max_weights", "max_tfs"]
+
+    def __init__(self, mat_TF, idf, doc_norms):
+        """
+        Construit l'index inversé à partir de la matrice TF d'un moteur de recherche.
+
+        Args:
+            mat_TF (csr_matrix): Matrice terme-document des fréquences brutes.
+            idf (np.ndarray): Vecteur IDF, un poids par terme.
+            doc_norms (np.ndarray): Norme L2 de chaque ligne de la matrice TF-IDF.
+        """
+        csc = mat_TF.tocsc()
+        csc.sort_indices()
+        self.indptr = csc.indptr
+        self.doc_ids = csc.indices
+        self.tfs = csc.data
+        term_ids = np.repeat(np.arange(csc.shape[1]), np.diff(csc.indptr))
+        self.weights = (csc.data * idf[term_ids]).astype(idf.dtype)
+        self.doc_norms = doc_norms
+        self.max_weights, self.max_tfs = self.term_maxima(
+            self.indptr, self.doc_ids, self.tfs, self.weights
+        )
+        self.delta_start = mat_TF.shape[0]
+        self.deltas = []
+
+    @classmethod
+    def from_arrays(cls, arrays, doc_norms, delta_start):
+        """
+        Reconstruit un index à partir de ses tableaux, sans les recopier.
+
+        Args:
+            arrays (dict): Tableaux de l'index, indexés par les noms de `ARRAYS`.
+            doc_norms (np.ndarray): Norme L2 de chaque ligne de la matrice TF-IDF.
+            delta_start (int): Premier document des segments delta.
+
+        Returns:
+            InvertedIndex: Index reconstruit.
+        """
+        index = cls.__new__(cls)
+        for name in cls.SEGMENT_ARRAYS:
+            setattr(index, name, arrays[name])
+        index.doc_norms = doc_norms
+        index.delta_start = delta_start
+        index.deltas = []
+        if len(arrays["delta_indptr"]) > 1:
+            index.deltas.append(
+                {name: arrays[f"delta_{name}"] for name in cls.SEGMENT_ARRAYS}
+            )
+        return index
+
+    def arrays(self):
+        """
+        Retourne les tableaux qui décrivent l'index, les segments delta étant réunis.
+
+        Returns:
+            dict: Tableaux indexés par les noms de `ARRAYS`.
+        """
+        arrays = {name: getattr(self, name) for name in self.SEGMENT_ARRAYS}
+        if self.deltas:
+            delta = self.deltas[0]
+            for segment in self.deltas[1:]:
+                delta = self.merge_segments(delta, segment)
+        else:
+            delta = {
+                "indptr": np.zeros(1, dtype=self.indptr.dtype),
+                "doc_ids": self.doc_ids[:0],
+                "tfs": self.tfs[:0],
+                "weights": self.weights[:0],
+                "max_weights": self.max_weights[:0],
+                "max_tfs": self.max_tfs[:0],
+            }
+        for name in self.SEGMENT_ARRAYS:
+            arrays[f"delta_{name}"] = delta[name]
+        return arrays
+
+    @property
+    def n_terms(self):
+        """
+        Nombre de termes indexés.
+        """
+        return max([len(self.indptr)] + [len(delta["indptr"]) for delta in self.deltas]) - 1
+
+    def segments(self):
+        """
+        Retourne la partie principale et les segments delta, dans l'ordre des documents.
+
+        Returns:
+            list: Un dictionnaire de tableaux (noms de `SEGMENT_ARRAYS`) par segment.
+        """
+        base = {name: getattr(self, name) for name in self.SEGMENT_ARRAYS}
+        return [base] + self.deltas
+
+    def add_delta(self, delta_TF, delta_TFxIDF, first_doc):
+        """
+        Ajoute les postings de nouveaux documents dans un segment delta, fusionné
+        ensuite avec les segments précédents qui ne sont pas plus grands que lui.
+
+        Args:
+            delta_TF (csr_matrix): Lignes TF des documents `first_doc` et suivants.
+            delta_TFxIDF (csr_matrix): Lignes TF-IDF correspondantes.
+            first_doc (int): Identifiant du premier document ajouté.
+        """
+        csc_tf = delta_TF.tocsc()
+        csc_tf.sort_indices()
+        csc_weights = delta_TFxIDF.tocsc()
+        csc_weights.sort_indices()
+        segment = {
+            "indptr": csc_tf.indptr,
+            "doc_ids": csc_tf.indices + first_doc,
+            "tfs": csc_tf.data,
+            "weights": csc_weights.data,
+        }
+        segment["max_weights"], segment["max_tfs"] = self.term_maxima(
+            segment["indptr"], segment["doc_ids"], segment["tfs"], segment["weights"]
+        )
+        self.deltas.append(segment)
+        while len(self.deltas) > 1 and len(self.deltas[-2]["doc_ids"]) <= len(
+            self.deltas[-1]["doc_ids"]
+        ):
+            last = self.deltas.pop()
+            self.deltas[-1] = self.merge_segments(self.deltas[-1], last)
+
+    @staticmethod
+    def merge_segments(first, second):
+        """
+        Fusionne deux segments dont le second contient des documents postérieurs.
+
+        Args:
+            first (dict): Segment des documents les plus anciens.
+            second (dict): Segment des documents suivants.
+
+        Returns:
+            dict: Segment fusionné, chaque posting restant trié par document.
+        """
+        n_terms = max(len(first["indptr"]), len(second["indptr"])) - 1
+
+        def padded(array, fill):
+            # Tableau prolongé jusqu'au nombre de termes du plus grand segment
+            return np.concatenate([array, np.full(n_terms + 1 - len(array), fill, array.dtype)])
+
+        first_ptr = padded(first["indptr"], first["indptr"][-1]).astype(np.int64)
+        second_ptr = padded(second["indptr"], second["indptr"][-1]).astype(np.int64)
+        # Dans le posting fusionné d'un terme, ceux du premier segment précèdent ceux
+        # du second : chaque posting est déplacé d'autant que les postings de l'autre
+        # segment qui le précèdent
+        n_first, n_second = len(first["doc_ids"]), len(second["doc_ids"])
+        first_terms = np.searchsorted(first_ptr, np.arange(n_first), side="right") - 1
+        second_terms = np.searchsorted(second_ptr, np.arange(n_second), side="right") - 1
+        positions = np.concatenate(
+            [
+                second_ptr[first_terms] + np.arange(n_first),
+                first_ptr[second_terms + 1] + np.arange(n_second),
+            ]
+        )
+        merged = {"indptr": first_ptr + second_ptr}
+        for name in ("doc_ids", "tfs", "weights"):
+            values = np.concatenate([first[name], second[name]])
+            merged[name] = np.empty_like(values)
+            merged[name][positions] = values
+        for name in ("max_weights", "max_tfs"):
+            merged[name] = np.maximum(padded(first[name], 0)[:-1], padded(second[name], 0)[:-1])
+        return merged
+
+    def term_maxima(self, indptr, doc_ids, tfs, weights):
+        """
+        Calcule, pour chaque terme d'un segment, le plus grand poids normalisé et la
+        plus grande fréquence de ses postings.
+
+        Args:
+            indptr (np.ndarray): Début du posting de chaque terme.
+            doc_ids (np.ndarray): Documents des postings.
+            tfs (np.ndarray): Fréquences des postings.
+            weights (np.ndarray): Poids TF-IDF des postings.
+
+        Returns:
+            tuple:
+                - max_weights (np.ndarray): Maximum de `poids / norme du document`.
+                - max_tfs (np.ndarray): Maximum des fréquences.
+        """
+        n_terms = len(indptr) - 1
+        max_weights = np.zeros(n_terms)
+        max_tfs = np.zeros(n_terms, dtype=np.int64)
+        # Les postings vides sont exclus : reduceat ne sait pas les traiter
+        nonempty = np.flatnonzero(np.diff(indptr))
+        if len(nonempty):
+            norms = self.doc_norms[doc_ids].astype(np.float64)
+            normalized = np.divide(weights, norms, out=np.zeros(len(norms)), where=norms > 0)
+            max_weights[nonempty] = np.maximum.reduceat(normalized, indptr[nonempty])
+            max_tfs[nonempty] = np.maximum.reduceat(tfs, indptr[nonempty])
+        return max_weights, max_tfs
+
+    def upper_bounds(self, term_ids, field="max_weights"):
+        """
+        Retourne, pour chaque terme, le maximum d'un champ sur tous les segments.
+
+        Args:
+            term_ids (list): Identifiants des termes.
+            field (str, optional): "max_weights" ou "max_tfs".
+
+        Returns:
+            np.ndarray: Maximum de chaque terme (0 pour un terme sans posting).
+        """
+        term_ids = np.asarray(term_ids, dtype=np.intp)
+        bounds = np.zeros(len(term_ids), dtype=getattr(self, field).dtype)
+        for segment in self.segments():
+            values = segment[field]
+            known = term_ids < len(values)
+            bounds[known] = np.maximum(bounds[known], values[term_ids[known]])
+        return bounds
+
+    def remove_document(self, doc_id, term_ids):
+        """
+        Retire un document de l'index en annulant ses poids. Seuls les postings des
+        termes du document sont parcourus.
+
+        Args:
+            doc_id (int): Identifiant du document à retirer.
+            term_ids (np.ndarray): Termes présents dans le document.
+        """
+        segments = self.segments() if doc_id >= self.delta_start else self.segments()[:1]
+        for segment in segments:
+            indptr, doc_ids = segment["indptr"], segment["doc_ids"]
+            for term_id in term_ids:
+                if term_id >= len(indptr) - 1:
+                    continue
+                start, end = indptr[term_id], indptr[term_id + 1]
+                position = start + np.searchsorted(doc_ids[start:end], doc_id)
+                if position < end and doc_ids[position] == doc_id:
+                    segment["tfs"][position] = 0
+                    segment["weights"][position] = 0
+
+    def postings(self, term_id, field="weights"):
+        """
+        Retourne le posting d'un terme.
+
+        Args:
+            term_id (int): Identifiant du terme dans le vocabulaire.
+            field (str, optional): Valeurs à retourner : "weights" pour les poids
+                TF-IDF, "tfs" pour les fréquences brutes.
+
+        Returns:
+            tuple:
+                - doc_ids (np.ndarray): Identifiants des documents contenant le terme.
+                - values (np.ndarray): Poids TF-IDF (ou fréquences) du terme dans ces documents.
+        """
+        doc_ids, values = [], []
+        for segment in self.segments():
+            indptr = segment["indptr"]
+            if term_id < len(indptr) - 1:
+                start, end = indptr[term_id], indptr[term_id + 1]
+                if end > start or not doc_ids:
+                    doc_ids.append(segment["doc_ids"][start:end])
+                    values.append(segment[field][start:end])
+        if len(doc_ids) == 1:
+            return doc_ids[0], values[0]
+        return np.concatenate(doc_ids), np.concatenate(values)
+
+    def cosine_scores(self, term_ids, candidates=None):
+        """
+        Calcule la similarité cosinus entre une requête binaire et les documents,
+        en ne parcourant que les postings des termes de la requête.
+
+        Args:
+            term_ids (list): Identifiants (distincts) des termes de la requête.
+            candidates (np.ndarray, optional): Identifiants triés (et distincts) des
+                seuls documents à évaluer ; chacun est cherché dans les postings avant
+                le calcul des scores. Par défaut, tous les documents.
+
+        Returns:
+            tuple:
+                - doc_ids (np.ndarray): Documents contenant au moins un terme de la requête.
+                - scores (np.ndarray): Similarité cosinus de chacun de ces documents.
+        """
+        if not term_ids:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+
+        postings = [self.postings(term_id) for term_id in term_ids]
+        if candidates is not None:
+            # Chaque candidat est localisé par dichotomie dans les postings, sans
+            # parcourir ceux des autres documents
+            doc_ids = np.asarray(candidates)
+            dot = np.zeros(len(doc_ids))
+            for docs, weights in postings:
+                if len(docs):
+                    positions = np.minimum(np.searchsorted(docs, doc_ids), len(docs) - 1)
+                    found = docs[positions] == doc_ids
+                    dot[found] += weights[positions[found]]
+        elif len(postings) == 1:
+            doc_ids, dot = postings[0][0], postings[0][1].astype(np.float64)
+        else:
+            all_docs = np.concatenate([docs for docs, _ in postings])
+            all_weights = np.concatenate([weights for _, weights in postings])
+            doc_ids, inverse = np.unique(all_docs, return_inverse=True)
+            dot = np.bincount(inverse, weights=all_weights).astype(np.float64, copy=False)
+
+        # Les documents retirés ont des poids nuls et ne sont pas des candidats
+        matched = dot > 0
+        doc_ids, dot = doc_ids[matched], dot[matched]
+        norms = self.doc_norms[doc_ids] * np.sqrt(len(term_ids))
+        scores = np.divide(dot, norms, out=np.zeros_like(dot), where=norms > 0)
+        return doc_ids, scores
+
+    def score_matrix(self, query_matrix, n_docs):
+        """
+        Calcule les produits scalaires entre plusieurs requêtes et tous les documents,
+        par un produit matriciel sparse avec les postings.
+
+        Args:
+            query_matrix (csr_matrix): Une ligne par requête, une colonne par terme.
+            n_docs (int): Nombre de lignes de la matrice terme-document.
+
+        Returns:
+            csr_matrix: Matrice `(n_requêtes, n_docs)` des produits scalaires.
+        """
+        # Les postings de chaque segment forment la transposée de ses lignes TF-IDF
+        # au format CSR
+        dot = None
+        for segment in self.segments():
+            n_terms = len(segment["indptr"]) - 1
+            if dot is None or len(segment["doc_ids"]):
+                postings = csr_matrix(
+                    (segment["weights"], segment["doc_ids"], segment["indptr"]),
+                    shape=(n_terms, n_docs),
+                )
+                product = query_matrix[:, :n_terms] @ postings
+                dot = product if dot is None else dot + product
+        dot.eliminate_zeros()
+        return dot
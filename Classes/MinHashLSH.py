@@ -0,0 +1,144 @@
+import zlib
+import numpy as np
+from tokenizer import tokenize
+
+# Nombre premier de Mersenne 2^61 - 1 : module des permutations de hachage
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+class MinHashLSH:
+    """
+    Classe représentant un détecteur de quasi-doublons par MinHash et LSH.
+
+    Chaque texte est réduit à l'ensemble de ses n-grammes de mots (« shingles »), puis à
+    une signature MinHash de `num_perm` entiers : la proportion de composantes égales
+    entre deux signatures estime la similarité de Jaccard des deux ensembles.
+
+    Les signatures sont découpées en `bands` bandes ; deux textes sont candidats s'ils
+    partagent au moins une bande, ce qui se teste par une simple table de hachage par
+    bande. Seuls les candidats sont comparés : la recherche ne parcourt jamais tous les
+    textes indexés.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=16, shingle_size=3, seed=1):
+        """
+        Initialise un index vide.
+
+        Args:
+            threshold (float): Similarité de Jaccard estimée à partir de laquelle deux
+                textes sont considérés comme quasi-doublons.
+            num_perm (int): Nombre de fonctions de hachage (taille des signatures).
+            bands (int): Nombre de bandes ; doit diviser `num_perm`.
+            shingle_size (int): Nombre de mots par shingle.
+            seed (int): Graine du tirage des fonctions de hachage.
+
+        Raises:
+            ValueError: Si `bands` ne divise pas `num_perm`.
+        """
+        if num_perm % bands:
+            raise ValueError("Le nombre de bandes doit diviser le nombre de permutations.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, num_perm, dtype=np.uint64)
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+
+    def shingles(self, text):
+        """
+        Retourne les empreintes (sur 32 bits) des shingles distincts d'un texte.
+
+        Args:
+            text (str): Texte à découper.
+
+        Returns:
+            np.ndarray: Empreintes des shingles, vide si le texte ne contient aucun mot.
+        """
+        words = tokenize(text)
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        size = min(self.shingle_size, len(words))
+        shingles = {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+        return np.array([zlib.crc32(s.encode("utf-8")) for s in shingles], dtype=np.uint64)
+
+    def signature(self, text):
+        """
+        Calcule la signature MinHash d'un texte.
+
+        Args:
+            text (str): Texte à signer.
+
+        Returns:
+            np.ndarray | None: Signature de `num_perm` entiers, ou None pour un texte vide.
+        """
+        hashes = self.shingles(text)
+        if not len(hashes):
+            return None
+        # Permutations (a * x + b) mod p ; a, x < 2^32 : pas de dépassement sur 64 bits
+        permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    def band_keys(self, signature):
+        """
+        Retourne la clé de hachage de chaque bande d'une signature.
+        """
+        return [
+            signature[i * self.rows : (i + 1) * self.rows].tobytes() for i in range(self.bands)
+        ]
+
+    def insert(self, key, signature):
+        """
+        Indexe une signature.
+
+        Args:
+            key: Identifiant associé (par exemple l'identifiant du document).
+            signature (np.ndarray | None): Signature calculée par `signature` ; ignorée si None.
+        """
+        if signature is None:
+            return
+        self.signatures[key] = signature
+        for buckets, band in zip(self.buckets, self.band_keys(signature)):
+            buckets.setdefault(band, set()).add(key)
+
+    def remove(self, key):
+        """
+        Retire une signature de l'index (sans effet si la clé n'est pas indexée).
+
+        Args:
+            key: Identifiant associé à la signature.
+        """
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for buckets, band in zip(self.buckets, self.band_keys(signature)):
+            bucket = buckets[band]
+            bucket.discard(key)
+            if not bucket:
+                del buckets[band]
+
+    def query(self, signature):
+        """
+        Cherche les quasi-doublons d'une signature parmi les signatures indexées.
+
+        Args:
+            signature (np.ndarray | None): Signature calculée par `signature`.
+
+        Returns:
+            list: Couples `(clé, similarité estimée)` dont la similarité atteint
+                  `threshold`, par similarité décroissante.
+        """
+        if signature is None:
+            return []
+        candidates = set()
+        for buckets, band in zip(self.buckets, self.band_keys(signature)):
+            candidates |= buckets.get(band, set())
+        matches = []
+        for key in candidates:
+            similarity = float(np.mean(self.signatures[key] == signature))
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        return sorted(matches, key=lambda match: -match[1])
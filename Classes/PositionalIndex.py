@@ -0,0 +1,222 @@
+from bisect import bisect_left
+from tokenizer import tokenize_with_offsets
+
+
+def gallop_intersect(small, large):
+    """
+    Intersecte deux listes triées d'identifiants par recherche galopante : pour
+    chaque élément de la plus petite, la position dans la plus grande est encadrée
+    par des sauts de taille doublée puis trouvée par dichotomie. Le coût est en
+    O(m log(n / m)) au lieu de O(m + n), et devient négligeable quand une liste est
+    beaucoup plus courte que l'autre.
+
+    Args:
+        small (list): Liste triée, de préférence la plus courte.
+        large (list): Liste triée.
+
+    Returns:
+        list: Éléments communs, triés.
+    """
+    result = []
+    low = 0
+    for value in small:
+        step = 1
+        high = low
+        while high < len(large) and large[high] < value:
+            low = high + 1
+            high += step
+            step *= 2
+        low = bisect_left(large, value, low, min(high + 1, len(large)))
+        if low == len(large):
+            break
+        if large[low] == value:
+            result.append(value)
+    return result
+
+
+def intersect_all(lists):
+    """
+    Intersecte plusieurs listes triées, de la plus courte à la plus longue.
+
+    Args:
+        lists (list): Listes triées d'identifiants.
+
+    Returns:
+        list: Éléments présents dans toutes les listes, triés.
+    """
+    if not lists:
+        return []
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for other in lists[1:]:
+        if not result:
+            break
+        result = gallop_intersect(result, other)
+    return list(result)
+
+
+class PositionalIndex:
+    """
+    Classe représentant un index inversé positionnel d'un corpus.
+
+    Pour chaque terme (découpé par `tokenize_with_offsets`, donc en minuscules et hors
+    mots vides), l'index associe à chaque document qui le contient la liste de ses
+    occurrences `(position du mot, début, fin)`, les deux derniers étant des positions
+    de caractères dans le texte du document. Les positions comptent les mots retenus :
+    une expression est retrouvée malgré les mots vides qu'elle contient. Les documents
+    sont rangés par identifiant croissant.
+
+    L'index s'abonne au corpus et se tient à jour à chaque ajout ou retrait de
+    document ; les termes indexés pour chaque document sont conservés, si bien qu'un
+    retrait efface toutes ses occurrences même si son texte a changé entre-temps.
+    Une recherche ne parcourt que les postings des termes demandés : son coût dépend
+    du nombre d'occurrences, pas de la taille du corpus. La liste triée des
+    documents de chaque terme interrogé est conservée jusqu'à la modification
+    suivante de ses postings, pour les intersections galopantes.
+    """
+
+    def __init__(self, corpus):
+        """
+        Construit l'index à partir des documents du corpus et s'y abonne.
+
+        Args:
+            corpus (Corpus): Corpus à indexer.
+        """
+        self.corpus = corpus
+        self.postings = {}
+        self.doc_lists = {}
+        self.doc_terms = {}
+        for doc_id, document in corpus.id2doc.items():
+            self.document_added(doc_id, document)
+        corpus.subscribe(self)
+
+    def document_added(self, doc_id, document):
+        """
+        Notifié par le corpus lorsqu'un document est ajouté : indexe ses mots.
+
+        Args:
+            doc_id (int): Identifiant du document dans le corpus.
+            document (Document): Document ajouté.
+        """
+        terms = {}
+        for position, (term, start, end) in enumerate(tokenize_with_offsets(document.text)):
+            self.postings.setdefault(term, {}).setdefault(doc_id, []).append(
+                (position, start, end)
+            )
+            terms[term] = None
+        for term in terms:
+            self.doc_lists.pop(term, None)
+        self.doc_terms[doc_id] = list(terms)
+
+    def document_removed(self, doc_id, document):
+        """
+        Notifié par le corpus lorsqu'un document est retiré : retire les occurrences
+        indexées à son ajout.
+
+        Args:
+            doc_id (int): Identifiant du document dans le corpus.
+            document (Document): Document retiré.
+        """
+        for term in self.doc_terms.pop(doc_id, ()):
+            self.doc_lists.pop(term, None)
+            documents = self.postings.get(term)
+            if documents is not None:
+                documents.pop(doc_id, None)
+                if not documents:
+                    del self.postings[term]
+
+    def documents(self, term):
+        """
+        Retourne les documents qui contiennent un terme.
+
+        Args:
+            term (str): Terme normalisé.
+
+        Returns:
+            list: Identifiants des documents, par ordre croissant (liste partagée, à ne
+                  pas modifier).
+        """
+        documents = self.doc_lists.get(term)
+        if documents is None:
+            documents = self.doc_lists[term] = list(self.postings.get(term, ()))
+        return documents
+
+    def phrase_documents(self, terms):
+        """
+        Retourne les documents qui contiennent tous les termes d'une expression (sans
+        vérifier leurs positions), par intersection galopante des postings.
+
+        Args:
+            terms (list): Termes normalisés.
+
+        Returns:
+            list: Identifiants des documents, par ordre croissant.
+        """
+        return intersect_all([self.documents(term) for term in terms])
+
+    def phrase_matches(self, terms, doc_id):
+        """
+        Cherche les occurrences d'une suite de termes consécutifs dans un document qui
+        contient tous les termes.
+
+        Args:
+            terms (list): Termes normalisés.
+            doc_id (int): Identifiant du document.
+
+        Returns:
+            list: Triplets `(position du premier mot, début, fin)` des occurrences, les
+                  deux derniers étant des positions de caractères.
+        """
+        occurrences = [self.postings[term][doc_id] for term in terms]
+        following = [{position for position, _, _ in found} for found in occurrences[1:]]
+        last = {position: end for position, _, end in occurrences[-1]}
+        return [
+            (position, start, last[position + len(terms) - 1])
+            for position, start, _ in occurrences[0]
+            if all(position + i + 1 in positions for i, positions in enumerate(following))
+        ]
+
+    def find(self, phrase):
+        """
+        Cherche les occurrences d'un mot ou d'une suite de mots consécutifs.
+
+        Args:
+            phrase (str): Mot ou expression recherchée (insensible à la casse).
+
+        Returns:
+            list: Triplets `(doc_id, début, fin)` des occurrences, par document puis
+                  par position.
+        """
+        terms = [term for term, _, _ in tokenize_with_offsets(phrase)]
+        if not terms:
+            return []
+        hits = []
+        for doc_id in self.phrase_documents(terms):
+            for _, start, end in self.phrase_matches(terms, doc_id):
+                hits.append((doc_id, start, end))
+        return hits
+
+    def concordance(self, phrase, context_size=15):
+        """
+        Construit les lignes de concordance d'un mot ou d'une expression.
+
+        Args:
+            phrase (str): Mot ou expression recherchée.
+            context_size (int): Nombre de caractères de contexte de chaque côté.
+
+        Returns:
+            list: Une ligne par occurrence : dictionnaire avec l'identifiant du document,
+                  le contexte gauche, le motif trouvé et le contexte droit.
+        """
+        lines = []
+        for doc_id, start, end in self.find(phrase):
+            text = self.corpus.id2doc[doc_id].text
+            lines.append(
+                {
+                    "Document ID": doc_id,
+                    "Contexte gauche": "..." + text[max(0, start - context_size) : start].strip(),
+                    "Motif trouvé": text[start:end],
+                    "Contexte droit": text[end : end + context_size].strip() + "...",
+                }
+            )
+        return lines
@@ -0,0 +1,79 @@
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    """
+    Classe représentant un cache mémoire de résultats de recherche, de politique LRU
+    (le résultat le moins récemment utilisé est évincé lorsque le cache est plein),
+    avec une durée de vie optionnelle des entrées.
+
+    Le cache ne connaît pas l'état de l'index : c'est à l'appelant d'inclure dans la
+    clé de quoi distinguer les versions successives de l'index (par exemple un
+    numéro de génération), ce qui rend les anciennes entrées inaccessibles.
+
+    Les compteurs `stats` indiquent le nombre de résultats servis par le cache
+    ("hits"), de résultats absents ("misses"), d'entrées évincées faute de place
+    ("evictions") et d'entrées périmées ("expired").
+    """
+
+    def __init__(self, max_size=128, ttl=None):
+        """
+        Initialise un cache vide.
+
+        Args:
+            max_size (int): Nombre maximal de résultats conservés ; 0 désactive le cache.
+            ttl (float, optional): Durée de vie d'une entrée, en secondes. Par défaut,
+                illimitée.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Retourne le résultat associé à une clé et le marque comme récemment utilisé.
+
+        Args:
+            key (tuple): Clé de la requête.
+
+        Returns:
+            Any: Résultat mis en cache, ou None s'il est absent ou périmé.
+        """
+        entry = self.entries.get(key)
+        if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+            del self.entries[key]
+            self.stats["expired"] += 1
+            entry = None
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def put(self, key, value):
+        """
+        Conserve un résultat, en évinçant au besoin le moins récemment utilisé.
+
+        Args:
+            key (tuple): Clé de la requête.
+            value (Any): Résultat à conserver.
+        """
+        if self.max_size <= 0:
+            return
+        self.entries[key] = (time.monotonic(), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        """
+        Vide le cache (les compteurs sont conservés).
+        """
+        self.entries.clear()
@@ -0,0 +1,291 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from Classes.InvertedIndex import candidate_mask
+
+
+class Scorer:
+    """
+    Classe de base des modèles de pondération du moteur de recherche.
+
+    Un modèle évalue une requête (identifiants de termes distincts) à partir de
+    l'index inversé et des statistiques précalculées du moteur (`SearchEngine`) :
+    fréquences documentaires, longueurs des documents, normes. Seuls les postings
+    des termes de la requête sont parcourus.
+
+    Le score d'un document est obtenu en sommant, terme par terme, les contributions
+    de ses postings, puis en transformant la somme (`finalize`). Les contributions
+    sont calculées à la demande à partir des valeurs brutes des postings (champ
+    `field` de l'index : poids TF-IDF ou fréquences) par `contributions`, si bien
+    qu'un évaluateur peut n'en calculer qu'une partie. Chaque modèle fournit en outre
+    une borne supérieure de la contribution de chaque terme au score final
+    (`upper_bounds`), utilisée pour l'élagage dynamique.
+    """
+
+    # Valeurs des postings lues dans l'index ("weights" ou "tfs")
+    field = "weights"
+
+    def cache_key(self):
+        """
+        Décrit le modèle et ses paramètres courants, pour les clés du cache des
+        résultats : modifier un paramètre (par exemple `k1` de BM25) change la clé.
+
+        Returns:
+            tuple: Classe du modèle et couples `(paramètre, valeur)` triés.
+        """
+        return (type(self), tuple(sorted(vars(self).items())))
+
+    def term_parameters(self, engine, term_ids):
+        """
+        Précalcule les paramètres propres à chaque terme de la requête (par exemple
+        son IDF), transmis ensuite à `contributions`.
+
+        Args:
+            engine (SearchEngine): Moteur de recherche à interroger.
+            term_ids (list): Identifiants des termes de la requête.
+
+        Returns:
+            np.ndarray: Un paramètre par terme (nul par défaut).
+        """
+        return np.zeros(len(term_ids))
+
+    def contributions(self, engine, parameter, doc_ids, values):
+        """
+        Calcule la contribution d'un terme au score de documents, à partir des valeurs
+        brutes de ses postings. Le calcul est élément par élément : une tranche de
+        postings donne exactement les mêmes contributions que le posting entier.
+
+        Args:
+            engine (SearchEngine): Moteur de recherche à interroger.
+            parameter (float | np.ndarray): Paramètre du terme (`term_parameters`), ou
+                paramètre de chaque posting lorsqu'ils relèvent de plusieurs termes.
+            doc_ids (np.ndarray): Documents des postings.
+            values (np.ndarray): Valeurs brutes des postings (champ `field`).
+
+        Returns:
+            np.ndarray: Contribution de chaque posting.
+
+        Raises:
+            NotImplementedError: Si la sous-classe ne définit pas le modèle.
+        """
+        raise NotImplementedError
+
+    def term_postings(self, engine, term_ids, candidates=None):
+        """
+        Retourne les postings des termes de la requête avec la contribution de chaque
+        document. Les postings des documents retirés (valeurs nulles) sont exclus.
+
+        Args:
+            engine (SearchEngine): Moteur de recherche à interroger.
+            term_ids (list): Identifiants (distincts) des termes de la requête.
+            candidates (np.ndarray, optional): Identifiants triés des seuls documents
+                à conserver. Par défaut, tous les documents.
+
+        Returns:
+            list: Un couple `(doc_ids, contributions)` par terme, les documents étant
+                  triés par identifiant croissant.
+        """
+        postings = []
+        for term_id, parameter in zip(term_ids, self.term_parameters(engine, term_ids)):
+            docs, values = engine.index.postings(term_id, self.field)
+            kept = values > 0
+            if candidates is not None:
+                kept &= candidate_mask(docs, candidates)
+            docs = docs[kept]
+            postings.append((docs, self.contributions(engine, parameter, docs, values[kept])))
+        return postings
+
+    def finalize(self, engine, doc_ids, sums, n_terms):
+        """
+        Transforme les sommes des contributions en scores. Par défaut, les sommes
+        sont les scores.
+
+        Args:
+            engine (SearchEngine): Moteur de recherche à interroger.
+            doc_ids (np.ndarray): Documents évalués.
+            sums (np.ndarray): Somme des contributions de chaque document (float64).
+            n_terms (int): Nombre de termes de la requête.
+
+        Returns:
+            np.ndarray: Score de chaque document.
+        """
+        return sums
+
+    def upper_bounds(self, engine, term_ids):
+        """
+        Borne la contribution de chaque terme au score final d'un document.
+
+        Args:
+            engine (SearchEngine): Moteur de recherche à interroger.
+            term_ids (list): Identifiants des termes de la requête.
+
+        Returns:
+            np.ndarray: Borne supérieure de chaque terme.
+
+        Raises:
+            NotImplementedError: Si la sous-classe ne définit pas le modèle.
+        """
+        raise NotImplementedError
+
+    def score(self, engine, term_ids, candidates=None):
+        """
+        Calcule le score des documents qui contiennent au moins un terme de la requête,
+        en accumulant les contributions terme par terme.
+
+        Args:
+            engine (SearchEngine): Moteur de recherche à interroger.
+            term_ids (list): Identifiants (distincts) des termes de la requête.
+            candidates (np.ndarray, optional): Identifiants triés des seuls documents
+                à évaluer. Par défaut, tous les documents.
+
+        Returns:
+            tuple:
+                - doc_ids (np.ndarray): Documents évalués, par identifiant croissant.
+                - scores (np.ndarray): Score de chacun de ces documents.
+        """
+        postings = self.term_postings(engine, term_ids, candidates)
+        if not postings:
+            return np.empty(0, dtype=np.int32), self.finalize(engine, [], np.empty(0), 0)
+        doc_ids, inverse = np.unique(
+            np.concatenate([docs for docs, _ in postings]), return_inverse=True
+        )
+        sums = np.bincount(
+            inverse, weights=np.concatenate([values for _, values in postings])
+        )
+        return doc_ids, self.finalize(engine, doc_ids, sums, len(term_ids))
+
+    def score_batch(self, engine, queries):
+        """
+        Évalue plusieurs requêtes. Par défaut, chaque requête est évaluée par `score`.
+
+        Args:
+            engine (SearchEngine): Moteur de recherche à interroger.
+            queries (list): Identifiants des termes de chaque requête.
+
+        Returns:
+            tuple: Trois tableaux alignés `(query_ids, doc_ids, scores)`.
+        """
+        query_ids, doc_ids, scores = [], [], []
+        for query_id, term_ids in enumerate(queries):
+            docs, values = self.score(engine, term_ids)
+            query_ids.append(np.full(len(docs), query_id, dtype=np.intp))
+            doc_ids.append(docs)
+            scores.append(values)
+        if not queries:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.int32), np.empty(0)
+        return np.concatenate(query_ids), np.concatenate(doc_ids), np.concatenate(scores)
+
+
+class CosineScorer(Scorer):
+    """
+    Similarité cosinus entre une requête binaire et les vecteurs TF-IDF des documents
+    (modèle historique du moteur).
+    """
+
+    def contributions(self, engine, parameter, doc_ids, values):
+        return values
+
+    def finalize(self, engine, doc_ids, sums, n_terms):
+        norms = engine.doc_norms[doc_ids] * np.sqrt(n_terms)
+        return np.divide(sums, norms, out=np.zeros_like(sums), where=norms > 0)
+
+    def upper_bounds(self, engine, term_ids):
+        return engine.index.upper_bounds(term_ids) / np.sqrt(max(len(term_ids), 1))
+
+    def score(self, engine, term_ids, candidates=None):
+        return engine.index.cosine_scores(term_ids, candidates)
+
+    def score_batch(self, engine, queries):
+        """
+        Rassemble toutes les requêtes dans une matrice sparse et les évalue par un
+        unique produit matriciel avec les postings de l'index.
+        """
+        rows = [query_id for query_id, term_ids in enumerate(queries) for _ in term_ids]
+        cols = [term_id for term_ids in queries for term_id in term_ids]
+        n_queries = len(queries)
+        query_matrix = csr_matrix(
+            (np.ones(len(rows), dtype=engine.dtype), (rows, cols)),
+            shape=(n_queries, len(engine.vocab)),
+        )
+        dot = engine.index.score_matrix(query_matrix, engine.n_docs)
+
+        query_ids = np.repeat(np.arange(n_queries), np.diff(dot.indptr))
+        doc_ids = dot.indices
+        query_norms = np.sqrt(np.diff(query_matrix.indptr))
+        norms = engine.doc_norms[doc_ids] * query_norms[query_ids]
+        scores = np.divide(dot.data, norms, out=np.zeros(len(doc_ids)), where=norms > 0)
+        return query_ids, doc_ids, scores
+
+
+class BM25Scorer(Scorer):
+    """
+    Modèle probabiliste BM25 (Okapi) : la fréquence d'un terme dans un document est
+    saturée par `k1` et normalisée par la longueur du document rapportée à la
+    longueur moyenne du corpus (paramètre `b`).
+
+    Les contributions sont accumulées terme par terme sur les postings des fréquences
+    brutes ; les longueurs des documents sont précalculées par le moteur
+    (`SearchEngine.doc_lengths`). Les scores sont en float32.
+    """
+
+    field = "tfs"
+
+    def __init__(self, k1=1.2, b=0.75, delta=0.0):
+        """
+        Args:
+            k1 (float): Saturation de la fréquence des termes.
+            b (float): Poids de la normalisation par la longueur (entre 0 et 1).
+            delta (float): Bonus accordé à chaque terme présent (BM25+). Par défaut,
+                aucun (BM25 classique).
+        """
+        self.k1 = k1
+        self.b = b
+        self.delta = delta
+
+    def idf(self, engine, term_ids):
+        """
+        Calcule l'IDF probabiliste des termes, toujours positif.
+
+        Args:
+            engine (SearchEngine): Moteur de recherche.
+            term_ids (list): Identifiants des termes.
+
+        Returns:
+            np.ndarray: IDF de chaque terme.
+        """
+        doc_count = engine.doc_count[term_ids].astype(np.float64)
+        return np.log1p((engine.n_indexed - doc_count + 0.5) / (doc_count + 0.5))
+
+    def term_parameters(self, engine, term_ids):
+        return self.idf(engine, term_ids)
+
+    def contributions(self, engine, parameter, doc_ids, values):
+        average_length = engine.total_length / max(engine.n_indexed, 1) or 1.0
+        tfs = values.astype(np.float32)
+        lengths = engine.doc_lengths[doc_ids].astype(np.float32)
+        norm = self.k1 * (1 - self.b + self.b * lengths / average_length)
+        return np.float32(parameter) * (tfs * (self.k1 + 1) / (tfs + norm) + self.delta)
+
+    def finalize(self, engine, doc_ids, sums, n_terms):
+        return sums.astype(np.float32)
+
+    def upper_bounds(self, engine, term_ids):
+        """
+        Borne BM25 d'un terme : sa plus grande fréquence (conservée par l'index) dans
+        un document de longueur nulle, cas le plus favorable de la normalisation.
+        """
+        max_tfs = engine.index.upper_bounds(term_ids, "max_tfs").astype(np.float64)
+        denominator = max_tfs + self.k1 * (1 - self.b)
+        saturation = np.divide(
+            max_tfs * (self.k1 + 1), denominator, out=np.zeros_like(max_tfs), where=denominator > 0
+        )
+        return self.idf(engine, term_ids) * (saturation + self.delta * (max_tfs > 0))
+
+
+class BM25PlusScorer(BM25Scorer):
+    """
+    Variante BM25+ : un bonus `delta` par terme présent évite que les longs documents
+    contenant le terme soient classés derrière des documents qui ne le contiennent pas.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, delta=1.0):
+        super().__init__(k1, b, delta)
@@ -1,79 +1,677 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from scipy.sparse import csr_matrix
-from sklearn.metrics.pairwise import cosine_similarity
-from utils import remove_stopwords
+from Classes.GrowableCSR import GrowableCSR, grow
+from Classes.DateIndex import DateIndex
+from Classes.AuthorIndex import normalize_name
+from Classes.BooleanQuery import parse_query
+from Classes.InvertedIndex import InvertedIndex
+from Classes.QueryCache import QueryCache
+from Classes.Scorer import CosineScorer
+from Classes.SimilarityIndex import SimilarityIndex
+from Classes.WandEvaluator import WandEvaluator
+from tokenizer import token_ids, tokenize
+
+
+def term_counts(text):
+    """
+    Compte les occurrences de chaque mot (hors mots vides) d'un texte, découpé par
+    `tokenize`.
+
+    Args:
+        text (str): Texte à analyser.
+
+    Returns:
+        dict: Dictionnaire associant chaque mot à son nombre d'occurrences.
+    """
+    word_counts = {}
+    for word in tokenize(text):
+        word_counts[word] = word_counts.get(word, 0) + 1
+    return word_counts
+
+
+def count_terms_shard(documents):
+    """
+    Compte les termes d'un lot de documents avec un vocabulaire local au lot.
+    Fonction de module pour pouvoir être exécutée dans un processus de travail.
+
+    Args:
+        documents (list): Couples `(doc_id, texte)` ou `(doc_id, comptes)`, les comptes
+            étant ceux déjà calculés par `Document.term_counts`.
+
+    Returns:
+        tuple:
+            - words (list): Mots du lot, dans l'ordre de première apparition.
+            - rows (np.ndarray): Identifiant de document de chaque triplet.
+            - cols (np.ndarray): Identifiant local (indice dans `words`) de chaque triplet.
+            - data (np.ndarray): Nombre d'occurrences de chaque triplet.
+    """
+    local_vocab = {}
+    rows, cols, data = [], [], []
+    for doc_id, content in documents:
+        counts = content if isinstance(content, dict) else term_counts(content)
+        for word, count in counts.items():
+            if word not in local_vocab:
+                local_vocab[word] = len(local_vocab)
+            rows.append(doc_id)
+            cols.append(local_vocab[word])
+            data.append(count)
+    return (
+        list(local_vocab),
+        np.asarray(rows, dtype=np.int32),
+        np.asarray(cols, dtype=np.int32),
+        np.asarray(data, dtype=np.int32),
+    )
+
+
+def top_k(scores, k):
+    """
+    Sélectionne les `k` meilleurs scores sans trier l'ensemble des candidats.
+
+    Une sélection partielle (`np.partition`) isole le k-ième score, puis seuls les
+    `k` candidats retenus sont triés. À score égal, l'ordre des candidats est conservé,
+    ce qui départage par identifiant de document lorsque ceux-ci sont croissants.
+
+    Args:
+        scores (np.ndarray): Scores des candidats.
+        k (int): Nombre de candidats à retenir.
+
+    Returns:
+        np.ndarray: Indices des `k` meilleurs candidats, par score décroissant.
+    """
+    if k <= 0 or len(scores) == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[: k - len(above)]
+        selected = np.concatenate([above, tied])
+    else:
+        selected = np.arange(len(scores))
+    return selected[np.argsort(-scores[selected], kind="stable")]
+
+
+INDEX_FORMAT = "QueryPy-index"
+INDEX_VERSION = 3
 
 
 class SearchEngine:
     """
     Classe implémentant un moteur de recherche basé sur un corpus.
+
+    Le moteur s'abonne au corpus : les documents ajoutés ou retirés sont mis en attente
+    puis intégrés à la prochaine recherche (ou à l'appel de `update`), pour un coût
+    proportionnel au nombre de documents modifiés. L'IDF des termes existants n'est
+    recalculé que lorsque la proportion de documents modifiés depuis le dernier
+    rafraîchissement dépasse `idf_staleness`.
+
+    Le classement est délégué à un modèle de pondération (`Scorer`) : par défaut la
+    similarité cosinus TF-IDF, ou BM25/BM25+ qui s'appuient sur les longueurs des
+    documents précalculées dans `doc_lengths`.
+
+    Les résultats de `search` sont mis en cache (`self.cache`). La clé comprend un
+    numéro de génération de l'index, incrémenté à chaque modification du corpus ou
+    rafraîchissement de l'index : les résultats antérieurs ne sont plus jamais servis.
+    Elle comprend aussi le modèle de pondération et ses paramètres courants
+    (`Scorer.cache_key`), si bien que modifier un paramètre du modèle invalide
+    également les résultats calculés avec l'ancienne valeur.
     """
 
-    def __init__(self, corpus):
+    def __init__(
+        self,
+        corpus,
+        dtype=np.float32,
+        idf_staleness=0.1,
+        n_jobs=1,
+        scorer=None,
+        cache_size=128,
+        cache_ttl=None,
+    ):
         """
         Initialise le moteur de recherche avec un corpus donné.
 
         Args:
             corpus (Corpus): Le corpus à utiliser pour la recherche.
+            dtype (np.dtype, optional): Type flottant des poids TF-IDF. Par défaut, float32.
+            idf_staleness (float, optional): Proportion de documents ajoutés ou retirés
+                tolérée avant de recalculer l'IDF et de reconstruire l'index. Par défaut, 0.1.
+            n_jobs (int, optional): Nombre de processus utilisés pour tokeniser le corpus
+                lors de la construction. Par défaut, 1 (construction séquentielle).
+            scorer (Scorer, optional): Modèle de pondération des résultats. Par défaut,
+                la similarité cosinus (`CosineScorer`).
+            cache_size (int, optional): Nombre de résultats de recherche conservés en
+                cache ; 0 désactive le cache. Par défaut, 128.
+            cache_ttl (float, optional): Durée de vie d'un résultat en cache, en
+                secondes. Par défaut, illimitée.
         """
         self.corpus = corpus
+        self.scorer = scorer if scorer is not None else CosineScorer()
+        self.n_jobs = n_jobs
+        self.dtype = np.dtype(dtype)
+        self.idf_staleness = idf_staleness
+        self.n_indexed = len(corpus.id2doc)
         self.vocab, self.mat_TF = self.build_term_document_matrix()
         self.mat_TFxIDF = self.build_tfidf_matrix()
+        self.index = InvertedIndex(self.mat_TF, self.idf, self.doc_norms)
+        self.pending_added = []
+        self.pending_removed = []
+        self.stale_changes = 0
+        self.query_stats = {}
+        self.evaluator = WandEvaluator(self)
+        self.generation = 0
+        self.cache = QueryCache(cache_size, cache_ttl)
+        self.similarity_index = None
+        corpus.subscribe(self)
+
+    @property
+    def mat_TF(self):
+        """
+        csr_matrix: Matrice terme-document des fréquences brutes (vue sans copie, ou
+        copie réunissant les lignes ajoutées depuis la construction).
+        """
+        return self._mat_TF.matrix()
+
+    @mat_TF.setter
+    def mat_TF(self, matrix):
+        self._mat_TF = GrowableCSR(matrix)
+
+    @property
+    def mat_TFxIDF(self):
+        """
+        csr_matrix: Matrice TF-IDF (vue sans copie, ou copie réunissant les lignes
+        ajoutées depuis la construction).
+        """
+        return self._mat_TFxIDF.matrix()
+
+    @mat_TFxIDF.setter
+    def mat_TFxIDF(self, matrix):
+        self._mat_TFxIDF = GrowableCSR(matrix)
+
+    def tfidf_rows(self, doc_ids):
+        """
+        Retourne les lignes TF-IDF de quelques documents, sans réunir toute la matrice.
+
+        Args:
+            doc_ids (np.ndarray): Identifiants des documents.
+
+        Returns:
+            csr_matrix: Une ligne par document, dans l'ordre de `doc_ids`.
+        """
+        return self._mat_TFxIDF.select_rows(doc_ids)
+
+    @property
+    def n_docs(self):
+        """
+        int: Nombre de lignes de la matrice terme-document (identifiant maximal + 1).
+        """
+        return self._mat_TF.n_rows
+
+    def document_term_counts(self, doc):
+        """
+        Compte les occurrences de chaque mot (hors mots vides) d'un document. Les
+        comptes sont ceux mis en cache par le document (`Document.term_counts`).
+
+        Args:
+            doc (Document): Document à analyser.
+
+        Returns:
+            dict: Dictionnaire associant chaque mot à son nombre d'occurrences.
+        """
+        return doc.term_counts
 
     def build_term_document_matrix(self):
         """
         Construit une matrice terme-document (TF) à partir du corpus.
 
+        Si `self.n_jobs` est supérieur à 1, les documents sont répartis en lots
+        contigus entre plusieurs processus. Chaque lot produit un vocabulaire local et
+        des triplets COO ; la fusion attribue les identifiants globaux en parcourant
+        les lots dans l'ordre, ce qui reproduit exactement la construction séquentielle.
+
+        Les comptes de mots déjà mis en cache par les documents sont réutilisés ; en
+        mode séquentiel, ceux qui manquent sont calculés et conservés par les documents.
+
         Returns:
             tuple:
                 - vocab (dict): Dictionnaire associant chaque mot à un index unique.
                 - mat_TF (csr_matrix): Matrice sparse représentant les fréquences des mots dans les documents.
         """
+        if self.n_jobs > 1 and len(self.corpus.id2doc) > 1:
+            # Les textes sans comptes en cache sont découpés dans les processus de travail
+            documents = [
+                (doc_id, doc.cached_term_counts() or doc.text)
+                for doc_id, doc in self.corpus.id2doc.items()
+            ]
+            n_shards = self.n_jobs * 4
+            size = -(-len(documents) // n_shards)
+            shards = [documents[i : i + size] for i in range(0, len(documents), size)]
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                partials = list(executor.map(count_terms_shard, shards))
+        else:
+            documents = [(doc_id, doc.term_counts) for doc_id, doc in self.corpus.id2doc.items()]
+            partials = [count_terms_shard(documents)]
+
         vocab = {}
         rows, cols, data = [], [], []
-
-        for doc_id, doc in self.corpus.id2doc.items():
-            word_counts = {}
-            words = remove_stopwords(doc.text.lower()).split()
-
-            for word in words:
-                word_counts[word] = word_counts.get(word, 0) + 1
-
-            for word, count in word_counts.items():
-                if word not in vocab:
-                    vocab[word] = len(vocab)
-                rows.append(doc_id)
-                cols.append(vocab[word])
-                data.append(count)
+        for words, shard_rows, shard_cols, shard_data in partials:
+            global_ids = np.array(
+                [vocab.setdefault(word, len(vocab)) for word in words], dtype=np.int32
+            )
+            rows.append(shard_rows)
+            cols.append(global_ids[shard_cols])
+            data.append(shard_data)
 
         mat_TF = csr_matrix(
-            (data, (rows, cols)), shape=(len(self.corpus.id2doc), len(vocab))
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(self.corpus.next_id, len(vocab)),
         )
         return vocab, mat_TF
 
     def build_tfidf_matrix(self):
         """
-        Construit une matrice TF-IDF à partir de la matrice TF.
+        Construit une matrice TF-IDF à partir de la matrice TF sans jamais la densifier.
+
+        La pondération IDF est appliquée colonne par colonne directement sur les
+        valeurs non nulles de la matrice, et la norme L2 de chaque ligne est
+        précalculée dans `self.doc_norms`. Le nombre de documents contenant chaque
+        terme est conservé dans `self.doc_count` pour les mises à jour incrémentales,
+        et la longueur de chaque document (nombre de mots indexés) dans
+        `self.doc_lengths`.
 
         Returns:
             csr_matrix: Matrice sparse représentant les scores TF-IDF.
         """
-        doc_count = np.array((self.mat_TF > 0).sum(axis=0)).flatten()
-        idf = np.log((1 + self.mat_TF.shape[0]) / (1 + doc_count)) + 1
-        tf = self.mat_TF.copy().toarray()
-        tfidf = tf * idf
-        return csr_matrix(tfidf)
+        mat_TF = self.mat_TF
+        n_terms = mat_TF.shape[1]
+        self.doc_count = np.bincount(mat_TF.indices, minlength=n_terms).astype(np.int64)
+        self.idf = self.compute_idf(self.doc_count)
+
+        tfidf = mat_TF.astype(self.dtype)
+        tfidf.data *= self.idf[tfidf.indices]
+        self.doc_norms = self.row_norms(tfidf)
+        self.doc_lengths = self.row_lengths(mat_TF)
+        self.total_length = int(self.doc_lengths.sum())
+        return tfidf
+
+    def compute_idf(self, doc_count):
+        """
+        Calcule l'IDF lissé de termes à partir de leur fréquence documentaire.
+
+        Args:
+            doc_count (np.ndarray): Nombre de documents contenant chaque terme.
+
+        Returns:
+            np.ndarray: Vecteur IDF au type `self.dtype`.
+        """
+        return (np.log((1 + self.n_indexed) / (1 + doc_count)) + 1).astype(self.dtype)
+
+    def row_norms(self, matrix):
+        """
+        Calcule la norme L2 de chaque ligne d'une matrice sparse.
+
+        Args:
+            matrix (csr_matrix): Matrice dont on veut les normes de lignes.
+
+        Returns:
+            np.ndarray: Normes au type `self.dtype`.
+        """
+        row_ids = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        return np.sqrt(
+            np.bincount(
+                row_ids,
+                weights=matrix.data.astype(np.float64) ** 2,
+                minlength=matrix.shape[0],
+            )
+        ).astype(self.dtype)
+
+    def row_lengths(self, matrix):
+        """
+        Calcule la somme des fréquences de chaque ligne d'une matrice TF.
+
+        Args:
+            matrix (csr_matrix): Matrice des fréquences brutes.
+
+        Returns:
+            np.ndarray: Longueur de chaque document, en entiers 32 bits.
+        """
+        row_ids = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        return np.bincount(
+            row_ids, weights=matrix.data, minlength=matrix.shape[0]
+        ).astype(np.int32)
+
+    def document_added(self, doc_id, document):
+        """
+        Notifié par le corpus lorsqu'un document est ajouté. Le document est indexé
+        à la prochaine mise à jour.
+
+        Args:
+            doc_id (int): Identifiant du document dans le corpus.
+            document (Document): Document ajouté.
+        """
+        self.pending_added.append(doc_id)
+        self.generation += 1
+
+    def document_removed(self, doc_id, document):
+        """
+        Notifié par le corpus lorsqu'un document est retiré. Le document est retiré
+        de l'index à la prochaine mise à jour.
+
+        Args:
+            doc_id (int): Identifiant du document dans le corpus.
+            document (Document): Document retiré.
+        """
+        if doc_id in self.pending_added:
+            self.pending_added.remove(doc_id)
+        else:
+            self.pending_removed.append(doc_id)
+        self.generation += 1
+
+    def update(self):
+        """
+        Intègre à l'index les ajouts et retraits de documents en attente, puis
+        rafraîchit l'IDF si la tolérance `idf_staleness` est dépassée.
+        """
+        if self.pending_added:
+            self.add_documents(self.pending_added)
+            self.pending_added = []
+        if self.pending_removed:
+            self.remove_documents(self.pending_removed)
+            self.pending_removed = []
+        if self.stale_changes > self.idf_staleness * max(self.n_indexed, 1):
+            self.refresh()
+
+    def add_documents(self, doc_ids):
+        """
+        Ajoute des documents du corpus à la fin des matrices et au segment delta de
+        l'index, en étendant le vocabulaire si nécessaire. Les lignes existantes ne
+        sont pas recopiées.
+
+        Args:
+            doc_ids (list): Identifiants croissants des documents à ajouter, tous
+                supérieurs ou égaux à `self.n_docs`.
+        """
+        first_row = self.n_docs
+        rows, cols, data = [], [], []
+        for doc_id in doc_ids:
+            for word, count in self.document_term_counts(self.corpus.id2doc[doc_id]).items():
+                if word not in self.vocab:
+                    self.vocab[word] = len(self.vocab)
+                rows.append(doc_id - first_row)
+                cols.append(self.vocab[word])
+                data.append(count)
+
+        n_terms = len(self.vocab)
+        new_tf = csr_matrix(
+            (
+                np.asarray(data, dtype=np.int32),
+                (np.asarray(rows, dtype=np.int32), np.asarray(cols, dtype=np.int32)),
+            ),
+            shape=(doc_ids[-1] + 1 - first_row, n_terms),
+        )
+
+        # Les nouveaux termes reçoivent un IDF calculé avec les effectifs actuels ;
+        # celui des termes existants reste figé jusqu'au prochain rafraîchissement
+        self.n_indexed += len(doc_ids)
+        n_known = len(self.idf)
+        self.doc_count = grow(self.doc_count, n_terms)
+        np.add.at(self.doc_count, new_tf.indices, 1)
+        self.idf = grow(self.idf, n_terms)
+        self.idf[n_known:n_terms] = self.compute_idf(self.doc_count[n_known:n_terms])
+
+        new_tfidf = new_tf.astype(self.dtype)
+        new_tfidf.data *= self.idf[new_tfidf.indices]
+        self._mat_TF.append_rows(new_tf)
+        self._mat_TFxIDF.append_rows(new_tfidf)
+        self._mat_TF.n_cols = self._mat_TFxIDF.n_cols = n_terms
+
+        self.doc_norms = grow(self.doc_norms, self.n_docs)
+        self.doc_norms[first_row : self.n_docs] = self.row_norms(new_tfidf)
+        self.index.doc_norms = self.doc_norms
+        self.doc_lengths = grow(self.doc_lengths, self.n_docs)
+        self.doc_lengths[first_row : self.n_docs] = self.row_lengths(new_tf)
+        self.total_length += int(new_tf.sum())
+
+        self.index.add_delta(new_tf, new_tfidf, first_row)
+        self.stale_changes += len(doc_ids)
+
+    def remove_documents(self, doc_ids):
+        """
+        Retire des documents de l'index : leurs lignes sont annulées dans les matrices
+        et leurs poids annulés dans les postings, sans reconstruction.
+
+        Args:
+            doc_ids (list): Identifiants des documents à retirer.
+        """
+        for doc_id in doc_ids:
+            # Les documents sans mot indexé comptent aussi dans les effectifs
+            self.n_indexed -= 1
+            self.stale_changes += 1
+            term_ids, tfs = self._mat_TF.row(doc_id)
+            present = term_ids[tfs > 0]
+            if len(present) == 0:
+                continue
+            self.doc_count[present] -= 1
+            self.total_length -= int(tfs.sum())
+            self.doc_lengths[doc_id] = 0
+            tfs[:] = 0
+            self._mat_TFxIDF.row(doc_id)[1][:] = 0
+            self.index.remove_document(doc_id, present)
 
-    def search(self, query_keywords, top_n=10, author_filter=None, year_filter=None):
+    def refresh(self):
+        """
+        Recalcule l'IDF, la matrice TF-IDF, les normes et l'index à partir de la
+        matrice TF courante (sans retokeniser les documents).
+        """
+        mat_TF = self.mat_TF.copy()
+        mat_TF.eliminate_zeros()
+        self.mat_TF = mat_TF
+        self.mat_TFxIDF = self.build_tfidf_matrix()
+        self.index = InvertedIndex(self.mat_TF, self.idf, self.doc_norms)
+        self.stale_changes = 0
+        self.generation += 1
+
+    def save(self, path):
+        """
+        Sauvegarde l'index construit dans un répertoire, dans un format versionné.
+
+        Chaque tableau (CSR de la matrice TF, poids TF-IDF, IDF, normes, postings de
+        l'index inversé) est écrit dans son propre fichier
+        `.npy` afin de pouvoir être projeté en mémoire au chargement. Le vocabulaire
+        est écrit dans `vocab.txt` (un terme par ligne, dans l'ordre des identifiants)
+        et les métadonnées dans `meta.json`. L'index des documents semblables, s'il a
+        été construit, est écrit dans le sous-répertoire `similarity`.
+
+        Args:
+            path (str): Répertoire de destination (créé s'il n'existe pas).
+        """
+        self.update()
+        os.makedirs(path, exist_ok=True)
+        n_docs, n_terms = self.n_docs, len(self.vocab)
+        mat_TF, mat_TFxIDF = self.mat_TF, self.mat_TFxIDF
+
+        # Les matrices TF et TF-IDF partagent toujours la même structure creuse
+        arrays = {
+            "tf_data": mat_TF.data,
+            "tf_indices": mat_TF.indices,
+            "tf_indptr": mat_TF.indptr,
+            "tfidf_data": mat_TFxIDF.data,
+            "idf": self.idf[:n_terms],
+            "doc_count": self.doc_count[:n_terms],
+            "doc_norms": self.doc_norms[:n_docs],
+            "doc_lengths": self.doc_lengths[:n_docs],
+        }
+        for name, array in self.index.arrays().items():
+            arrays[f"index_{name}"] = array
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), array)
+
+        with open(os.path.join(path, "vocab.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(self.vocab))
+
+        meta = {
+            "format": INDEX_FORMAT,
+            "version": INDEX_VERSION,
+            "dtype": self.dtype.name,
+            "n_docs": n_docs,
+            "n_terms": n_terms,
+            "n_indexed": self.n_indexed,
+            "idf_staleness": self.idf_staleness,
+            "stale_changes": self.stale_changes,
+            "total_length": self.total_length,
+            "delta_start": self.index.delta_start,
+        }
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=4, ensure_ascii=False)
+        if self.similarity_index is not None:
+            self.similarity_index.save(os.path.join(path, "similarity"))
+
+    @classmethod
+    def load(cls, path, corpus, mmap=True, scorer=None, cache_size=128, cache_ttl=None):
+        """
+        Charge un index sauvegardé par `save` pour le corpus dont il est issu.
+
+        Avec `mmap=True`, les tableaux sont projetés en mémoire en copie sur écriture :
+        plusieurs processus chargeant le même index partagent une seule copie via le
+        cache de pages du système, et le chargement ne lit pas les données. Les
+        documents ajoutés au corpus après la sauvegarde sont indexés à la prochaine
+        recherche.
+
+        Args:
+            path (str): Répertoire contenant l'index.
+            corpus (Corpus): Corpus dont l'index a été construit.
+            mmap (bool, optional): Projeter les tableaux en mémoire plutôt que les lire.
+            scorer (Scorer, optional): Modèle de pondération. Par défaut, `CosineScorer`.
+            cache_size (int, optional): Nombre de résultats de recherche conservés en cache.
+            cache_ttl (float, optional): Durée de vie d'un résultat en cache, en secondes.
+
+        Returns:
+            SearchEngine: Moteur de recherche prêt à l'emploi.
+
+        Raises:
+            ValueError: Si le répertoire ne contient pas un index d'une version prise en charge.
+        """
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != INDEX_FORMAT or meta.get("version") != INDEX_VERSION:
+            raise ValueError(
+                f"Format d'index non pris en charge : {meta.get('format')} "
+                f"version {meta.get('version')}"
+            )
+
+        def load_array(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="c" if mmap else None)
+
+        engine = cls.__new__(cls)
+        engine.corpus = corpus
+        engine.scorer = scorer if scorer is not None else CosineScorer()
+        engine.dtype = np.dtype(meta["dtype"])
+        engine.idf_staleness = meta["idf_staleness"]
+        engine.n_jobs = 1
+        engine.n_indexed = meta["n_indexed"]
+        engine.stale_changes = meta["stale_changes"]
+        engine.query_stats = {}
+        engine.evaluator = WandEvaluator(engine)
+        engine.generation = 0
+        engine.cache = QueryCache(cache_size, cache_ttl)
+        similarity_path = os.path.join(path, "similarity")
+        engine.similarity_index = (
+            SimilarityIndex.load(similarity_path, engine, mmap)
+            if os.path.isdir(similarity_path)
+            else None
+        )
+        engine.total_length = meta["total_length"]
+
+        with open(os.path.join(path, "vocab.txt"), "r", encoding="utf-8") as f:
+            words = f.read().split("\n") if meta["n_terms"] else []
+        engine.vocab = dict(zip(words, range(len(words))))
+
+        shape = (meta["n_docs"], meta["n_terms"])
+        indices, indptr = load_array("tf_indices"), load_array("tf_indptr")
+        engine._mat_TF = GrowableCSR.from_arrays(load_array("tf_data"), indices, indptr, shape)
+        engine._mat_TFxIDF = GrowableCSR.from_arrays(
+            load_array("tfidf_data"), indices, indptr, shape
+        )
+        engine.idf = load_array("idf")
+        engine.doc_count = load_array("doc_count")
+        engine.doc_norms = load_array("doc_norms")
+        engine.doc_lengths = load_array("doc_lengths")
+        engine.index = InvertedIndex.from_arrays(
+            {name: load_array(f"index_{name}") for name in InvertedIndex.ARRAYS},
+            engine.doc_norms,
+            meta["delta_start"],
+        )
+
+        engine.pending_added = [doc_id for doc_id in corpus.id2doc if doc_id >= engine.n_docs]
+        engine.pending_removed = []
+        corpus.subscribe(engine)
+        return engine
+
+    def filter_mask(self, doc_ids, author_filter=None, year_filter=None):
+        """
+        Indique quels documents candidats respectent les filtres d'auteur et d'année.
+
+        Le filtre d'auteur (sous-chaîne insensible à la casse) est résolu par l'index
+        des auteurs du corpus, co-auteurs compris (`Corpus.get_author_index`).
+
+        Args:
+            doc_ids (np.ndarray): Identifiants des documents candidats.
+            author_filter (str, optional): Sous-chaîne recherchée dans le nom d'un auteur.
+            year_filter (int, optional): Année de publication attendue.
+
+        Returns:
+            np.ndarray: Masque booléen aligné sur `doc_ids`.
+        """
+        mask = np.ones(len(doc_ids), dtype=bool)
+        if author_filter:
+            mask &= np.isin(doc_ids, self.corpus.get_author_index().lookup(author_filter))
+        if year_filter:
+            # Dates analysées une seule fois par le corpus : une comparaison d'ordinaux
+            first, last = DateIndex.year_bounds(year_filter)
+            ordinals = self.corpus.dates.ordinals[doc_ids]
+            mask &= (ordinals >= first) & (ordinals <= last)
+        return mask
+
+    def query_term_ids(self, query_keywords):
+        """
+        Convertit une liste de mots-clés en identifiants de termes distincts et triés.
+        Les mots-clés sont découpés et normalisés comme les documents (`tokenize`) ;
+        ceux absents du vocabulaire sont ignorés.
+
+        Args:
+            query_keywords (list): Liste de mots-clés.
+
+        Returns:
+            list: Identifiants des termes de la requête.
+        """
+        return sorted(
+            {term_id for keyword in query_keywords for term_id in token_ids(keyword, self.vocab)}
+        )
+
+    def search(
+        self, query_keywords, top_n=10, author_filter=None, year_filter=None, prune=False
+    ):
         """
         Recherche les documents les plus pertinents en fonction de mots-clés et de filtres optionnels.
+        Seuls les documents contenant au moins un des mots-clés sont retournés.
+
+        Avec `prune=True`, les `top_n` meilleurs documents sont obtenus par élagage
+        dynamique (`WandEvaluator`) : les documents qui ne peuvent pas atteindre le
+        classement ne sont pas évalués, pour un résultat identique. Les compteurs de
+        la requête (postings lus et sautés) sont alors conservés dans `self.query_stats`.
+
+        Le résultat est servi par le cache (`self.cache`) si la même requête (mêmes
+        termes normalisés, `top_n` et filtres) a déjà été évaluée sur la même
+        génération de l'index et avec le même modèle de pondération.
 
         Args:
             query_keywords (list): Liste de mots-clés pour la recherche.
             top_n (int, optional): Nombre maximum de documents à retourner. Par défaut, 10.
-            author_filter (str, optional): Filtrer les résultats par auteur. Par défaut, aucun filtre.
+            author_filter (str, optional): Filtrer les résultats par auteur ou co-auteur. Par défaut, aucun filtre.
             year_filter (int, optional): Filtrer les résultats par année. Par défaut, aucun filtre.
+            prune (bool, optional): Évaluer la requête par élagage dynamique. Par défaut, non.
 
         Returns:
             pd.DataFrame: Résultats de la recherche sous forme de DataFrame contenant les colonnes :
@@ -83,34 +681,247 @@ class SearchEngine:
                           - "Date"
                           - "Texte"
         """
-        query_vector = np.zeros(len(self.vocab))
-        for word in query_keywords:
-            if word in self.vocab:
-                query_vector[self.vocab[word]] = 1
+        self.update()
+        term_ids = self.query_term_ids(query_keywords)
+        key = (
+            self.generation,
+            tuple(term_ids),
+            top_n,
+            normalize_name(author_filter) if author_filter else None,
+            year_filter or None,
+            prune,
+            self.scorer.cache_key(),
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached.copy()
 
-        similarities = cosine_similarity(
-            self.mat_TFxIDF, query_vector.reshape(1, -1)
-        ).flatten()
-        top_indices = similarities.argsort()[-top_n:][::-1]
-        results = []
+        # Les documents des auteurs demandés sont intersectés avec les postings avant
+        # le calcul des scores
+        candidates = None
+        if author_filter:
+            candidates = self.corpus.get_author_index().lookup(author_filter)
 
-        for idx in top_indices:
-            doc = self.corpus.id2doc[idx]
-            if author_filter and author_filter.lower() not in doc.author.lower():
-                continue
+        if prune:
+            # Avec l'élagage, le filtre d'année restreint aussi les candidats
             if year_filter:
-                doc_year = int(doc.date.split("/")[0])
-                if doc_year != year_filter:
-                    continue
+                in_year = np.sort(self.corpus.dates.year(year_filter))
+                candidates = in_year if candidates is None else np.intersect1d(candidates, in_year)
+            doc_ids, similarities, self.query_stats = self.evaluator.top_k(
+                term_ids, top_n, candidates
+            )
+        else:
+            # Seuls les postings des termes de la requête sont parcourus
+            doc_ids, similarities = self.scorer.score(self, term_ids, candidates)
+
+        # Les filtres sont appliqués avant la sélection pour toujours remplir top_n
+        if year_filter and not prune:
+            mask = self.filter_mask(doc_ids, year_filter=year_filter)
+            doc_ids, similarities = doc_ids[mask], similarities[mask]
+
+        results = self.results_frame(doc_ids, similarities, top_n)
+        self.cache.put(key, results)
+        return results.copy()
+
+    def results_frame(self, doc_ids, scores, top_n):
+        """
+        Met en forme les `top_n` meilleurs documents d'une recherche.
+
+        Args:
+            doc_ids (np.ndarray): Documents évalués, par identifiant croissant.
+            scores (np.ndarray): Score de chacun de ces documents.
+            top_n (int): Nombre maximum de documents à retourner.
 
+        Returns:
+            pd.DataFrame: Résultats, avec les colonnes décrites dans `search`.
+        """
+        results = []
+        for idx in top_k(scores, top_n):
+            doc_id = int(doc_ids[idx])
+            doc = self.corpus.id2doc[doc_id]
             results.append(
                 {
-                    "Document ID": idx,
-                    "Score": similarities[idx],
+                    "Document ID": doc_id,
+                    "Score": scores[idx],
                     "Auteur": doc.author,
                     "Date": doc.date,
                     "Texte": doc.text,
                 }
             )
+        return pd.DataFrame(results)
+
+    def search_query(self, query, top_n=10, author_filter=None, year_filter=None):
+        """
+        Recherche les documents qui satisfont une requête booléenne (expressions entre
+        guillemets, AND, OR, NOT, parenthèses et proximité `NEAR/k`, voir
+        `QueryParser`), classés par le modèle de pondération.
+
+        Les documents qui satisfont la requête sont obtenus sur l'index positionnel du
+        corpus en intersectant les postings par sauts exponentiels, du terme le plus
+        rare au plus fréquent, et restreints aux filtres d'auteur et d'année avant
+        toute évaluation. Seuls ces documents sont ensuite évalués, sur les termes qui
+        ne sont pas sous un NOT : plus la requête est restrictive, moins il y a de
+        documents à évaluer. Un document qui ne contient aucun de ces termes (requête
+        `NOT x`) a un score nul.
+
+        Le résultat est mis en cache comme celui de `search`.
+
+        Args:
+            query (str): Requête booléenne.
+            top_n (int, optional): Nombre maximum de documents à retourner. Par défaut, 10.
+            author_filter (str, optional): Filtrer les résultats par auteur ou co-auteur. Par défaut, aucun filtre.
+            year_filter (int, optional): Filtrer les résultats par année. Par défaut, aucun filtre.
+
+        Returns:
+            pd.DataFrame: Résultats de la recherche, avec les colonnes de `search`.
+
+        Raises:
+            ValueError: Si la requête est mal formée.
+        """
+        node = parse_query(query)
+        self.update()
+        key = (
+            self.generation,
+            repr(node),
+            top_n,
+            normalize_name(author_filter) if author_filter else None,
+            year_filter or None,
+            self.scorer,
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached.copy()
+
+        if node is None:
+            doc_ids, scores = np.empty(0, dtype=np.int64), np.empty(0)
+        else:
+            candidates = None
+            if author_filter:
+                candidates = self.corpus.get_author_index().lookup(author_filter)
+            if year_filter:
+                in_year = np.sort(self.corpus.dates.year(year_filter))
+                candidates = in_year if candidates is None else np.intersect1d(candidates, in_year)
+            doc_ids = np.asarray(
+                node.documents(
+                    self.corpus.get_positional_index(),
+                    None if candidates is None else candidates.tolist(),
+                ),
+                dtype=np.int64,
+            )
+            term_ids = self.query_term_ids(node.terms())
+            matched, matched_scores = self.scorer.score(self, term_ids, doc_ids)
+            scores = np.zeros(len(doc_ids), dtype=matched_scores.dtype)
+            scores[np.searchsorted(doc_ids, matched)] = matched_scores
+
+        results = self.results_frame(doc_ids, scores, top_n)
+        self.cache.put(key, results)
+        return results.copy()
+
+    def build_similarity_index(self, **params):
+        """
+        Construit (hors ligne) l'index des documents semblables utilisé par
+        `similar_documents`.
+
+        Args:
+            **params: Paramètres de `SimilarityIndex` (`dim`, `n_lists`, `n_probe`...).
+
+        Returns:
+            SimilarityIndex: Index construit.
+        """
+        self.similarity_index = SimilarityIndex(self, **params)
+        return self.similarity_index
+
+    def similar_documents(self, doc_id, top_n=10, n_probe=None):
+        """
+        Recherche les documents les plus semblables à un document du corpus (similarité
+        cosinus TF-IDF), par l'index de plus proches voisins approché. L'index est
+        construit au premier appel s'il ne l'a pas été.
+
+        Args:
+            doc_id (int): Identifiant du document de référence.
+            top_n (int, optional): Nombre maximum de documents à retourner. Par défaut, 10.
+            n_probe (int, optional): Nombre de listes de l'index parcourues ; plus il est
+                grand, meilleur est le rappel. Par défaut, celui de l'index.
+
+        Returns:
+            pd.DataFrame: Documents semblables, avec les colonnes de `search`.
+        """
+        self.update()
+        if self.similarity_index is None:
+            self.build_similarity_index()
+        doc_ids, scores = self.similarity_index.similar(doc_id, top_n, n_probe)
+        return pd.DataFrame(
+            [
+                {
+                    "Document ID": int(similar_id),
+                    "Score": score,
+                    "Auteur": self.corpus.id2doc[similar_id].author,
+                    "Date": self.corpus.id2doc[similar_id].date,
+                    "Texte": self.corpus.id2doc[similar_id].text,
+                }
+                for similar_id, score in zip(doc_ids.tolist(), scores)
+            ]
+        )
+
+    def search_batch(
+        self,
+        list_of_queries,
+        top_n=10,
+        author_filter=None,
+        year_filter=None,
+        as_dataframe=False,
+    ):
+        """
+        Recherche les documents les plus pertinents pour plusieurs requêtes à la fois.
+
+        Les requêtes sont évaluées ensemble par le modèle de pondération (un unique
+        produit matriciel avec les postings de l'index pour la similarité cosinus) ;
+        la sélection des `top_n` meilleurs documents de chaque requête se fait en un
+        seul tri vectorisé.
+
+        Args:
+            list_of_queries (list): Liste de requêtes, chacune étant une liste de mots-clés.
+            top_n (int, optional): Nombre maximum de documents par requête. Par défaut, 10.
+            author_filter (str, optional): Filtrer les résultats par auteur ou co-auteur. Par défaut, aucun filtre.
+            year_filter (int, optional): Filtrer les résultats par année. Par défaut, aucun filtre.
+            as_dataframe (bool, optional): Retourner un DataFrame plutôt que des tableaux.
+
+        Returns:
+            tuple | pd.DataFrame: Par défaut, trois tableaux alignés `(query_ids, doc_ids, scores)`
+                                  triés par requête puis par score décroissant. Si `as_dataframe`
+                                  est vrai, un DataFrame avec les colonnes "Requête" en plus de
+                                  celles de `search`.
+        """
+        self.update()
+        n_queries = len(list_of_queries)
+        queries = [self.query_term_ids(query_keywords) for query_keywords in list_of_queries]
+        query_ids, doc_ids, scores = self.scorer.score_batch(self, queries)
+
+        if author_filter or year_filter:
+            mask = self.filter_mask(doc_ids, author_filter, year_filter)
+            query_ids, doc_ids, scores = query_ids[mask], doc_ids[mask], scores[mask]
+
+        # Tri global par requête, score décroissant puis identifiant de document
+        order = np.lexsort((doc_ids, -scores, query_ids))
+        query_ids, doc_ids, scores = query_ids[order], doc_ids[order], scores[order]
+        starts = np.searchsorted(query_ids, np.arange(n_queries))
+        rank = np.arange(len(query_ids)) - starts[query_ids]
+        keep = rank < top_n
+        query_ids, doc_ids, scores = query_ids[keep], doc_ids[keep], scores[keep]
+
+        if not as_dataframe:
+            return query_ids, doc_ids, scores
 
-        return pd.DataFrame(results)
\ No newline at end of file
+        return pd.DataFrame(
+            [
+                {
+                    "Requête": int(query_id),
+                    "Document ID": int(doc_id),
+                    "Score": score,
+                    "Auteur": self.corpus.id2doc[doc_id].author,
+                    "Date": self.corpus.id2doc[doc_id].date,
+                    "Texte": self.corpus.id2doc[doc_id].text,
+                }
+                for query_id, doc_id, score in zip(query_ids, doc_ids, scores)
+            ]
+        )
@@ -1,5 +1,6 @@
 import ipywidgets as widgets
 from IPython.display import display, clear_output
+from Classes.BooleanQuery import is_boolean_query
 
 
 class SearchInterface:
@@ -57,25 +58,43 @@ class SearchInterface:
         with self.output:
             clear_output()
 
-            keywords = self.text_input.value.lower().split()
+            query = self.text_input.value
+            keywords = query.lower().split()
             top_n = self.int_slider.value
             author_filter = self.author_input.value
             year_filter = self.year_input.value
             year_filter = int(year_filter) if year_filter.isdigit() else None
 
             if keywords:
-                print(f"Recherche pour les mots-clés : {keywords}")
+                # Guillemets, parenthèses ou opérateurs : requête booléenne
+                boolean = is_boolean_query(query)
+                if boolean:
+                    print(f"Recherche pour la requête : {query}")
+                else:
+                    print(f"Recherche pour les mots-clés : {keywords}")
                 if author_filter:
                     print(f"Filtre d'auteur : {author_filter}")
                 if year_filter:
                     print(f"Filtre d'année : {year_filter}")
 
-                results = self.search_engine.search(
-                    query_keywords=keywords,
-                    top_n=top_n,
-                    author_filter=author_filter,
-                    year_filter=year_filter,
-                )
+                if boolean:
+                    try:
+                        results = self.search_engine.search_query(
+                            query,
+                            top_n=top_n,
+                            author_filter=author_filter,
+                            year_filter=year_filter,
+                        )
+                    except ValueError as error:
+                        print(error)
+                        return
+                else:
+                    results = self.search_engine.search(
+                        query_keywords=keywords,
+                        top_n=top_n,
+                        author_filter=author_filter,
+                        year_filter=year_filter,
+                    )
 
                 if not results.empty:
                     print("\nRésultats de la recherche :")
@@ -0,0 +1,217 @@
+import json
+import os
+import numpy as np
+
+
+def randomized_svd(matrix, dim, n_oversamples=10, n_iter=4, seed=0):
+    """
+    Calcule les `dim` premiers vecteurs singuliers droits d'une matrice sparse par
+    projection aléatoire (méthode de Halko et al.), sans jamais densifier la matrice.
+
+    Args:
+        matrix (csr_matrix): Matrice documents × termes.
+        dim (int): Nombre de composantes.
+        n_oversamples (int): Composantes supplémentaires tirées pour la précision.
+        n_iter (int): Nombre d'itérations de puissance.
+        seed (int): Graine du générateur aléatoire.
+
+    Returns:
+        np.ndarray: Matrice `(n_termes, dim)` des composantes, en float32.
+    """
+    rng = np.random.default_rng(seed)
+    size = min(dim + n_oversamples, *matrix.shape)
+    sample = matrix @ rng.standard_normal((matrix.shape[1], size)).astype(np.float32)
+    for _ in range(n_iter):
+        sample, _ = np.linalg.qr(sample)
+        sample, _ = np.linalg.qr(matrix.T @ sample)
+        sample = matrix @ sample
+    basis, _ = np.linalg.qr(sample)
+    _, _, components = np.linalg.svd(np.asarray((matrix.T @ basis).T), full_matrices=False)
+    return np.ascontiguousarray(components[:dim].T, dtype=np.float32)
+
+
+def normalize_rows(vectors):
+    """
+    Normalise les lignes d'une matrice dense (les lignes nulles restent nulles).
+    """
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class SimilarityIndex:
+    """
+    Classe représentant un index de plus proches voisins approché des documents
+    d'un moteur de recherche, pour retrouver les documents semblables à un document.
+
+    Les vecteurs TF-IDF sont projetés sur leurs `dim` premières composantes
+    singulières (SVD tronquée), puis les documents sont répartis en `n_lists` listes
+    par k-means sphérique (structure IVF). Une requête ne parcourt que les documents
+    des `n_probe` listes dont le centroïde est le plus proche du document : ces
+    candidats sont reclassés par la similarité cosinus exacte sur la matrice TF-IDF.
+    Augmenter `n_probe` améliore le rappel au prix de la latence.
+
+    L'index est construit hors ligne (`SearchEngine.build_similarity_index`) et
+    sauvegardé avec le moteur. Les documents ajoutés ensuite sont toujours candidats
+    (ils sont comparés exactement) jusqu'à la reconstruction suivante.
+    """
+
+    def __init__(self, engine, dim=64, n_lists=None, n_probe=None, n_iter=10, seed=0):
+        """
+        Construit l'index à partir de la matrice TF-IDF du moteur.
+
+        Args:
+            engine (SearchEngine): Moteur de recherche dont les documents sont indexés.
+            dim (int): Dimension de l'espace réduit.
+            n_lists (int, optional): Nombre de listes ; par défaut, la racine carrée du
+                nombre de documents.
+            n_probe (int, optional): Nombre de listes parcourues par requête ; par
+                défaut, un huitième des listes.
+            n_iter (int): Nombre d'itérations du k-means.
+            seed (int): Graine du générateur aléatoire.
+        """
+        self.engine = engine
+        engine.update()
+        matrix = engine.mat_TFxIDF
+        self.components = randomized_svd(matrix, dim, seed=seed)
+        embeddings = normalize_rows(matrix @ self.components)
+        doc_ids = np.flatnonzero(np.any(embeddings != 0, axis=1))
+        embeddings = embeddings[doc_ids]
+
+        if n_lists is None:
+            n_lists = int(np.sqrt(len(doc_ids)))
+        n_lists = min(max(n_lists, 1), len(doc_ids))
+        self.n_probe = n_probe if n_probe is not None else max(1, n_lists // 8)
+        self.n_built = matrix.shape[0]
+
+        # K-means sphérique : centroïdes normalisés, affectation par produit scalaire
+        rng = np.random.default_rng(seed)
+        centroids = embeddings[rng.choice(len(doc_ids), n_lists, replace=False)]
+        assignment = np.zeros(len(doc_ids), dtype=np.int64)
+        for _ in range(n_iter if len(doc_ids) else 0):
+            assignment = np.argmax(embeddings @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, embeddings)
+            empty = ~np.any(sums != 0, axis=1)
+            sums[empty] = centroids[empty]
+            centroids = normalize_rows(sums)
+        self.centroids = centroids
+
+        order = np.argsort(assignment, kind="stable")
+        self.list_doc_ids = doc_ids[order]
+        self.list_indptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(assignment, minlength=len(centroids)))]
+        )
+
+    @property
+    def n_lists(self):
+        """
+        Nombre de listes de l'index.
+        """
+        return len(self.centroids)
+
+    def embed(self, doc_id):
+        """
+        Projette le vecteur TF-IDF courant d'un document dans l'espace réduit.
+
+        Args:
+            doc_id (int): Identifiant du document.
+
+        Returns:
+            np.ndarray: Vecteur normalisé de dimension `dim` (nul si le document est vide).
+        """
+        row = self.engine.tfidf_rows([doc_id])
+        # Les termes apparus après la construction n'ont pas de composante
+        known = row.indices < self.components.shape[0]
+        embedding = row.data[known] @ self.components[row.indices[known]]
+        return normalize_rows(embedding[None, :])[0]
+
+    def candidates(self, doc_id, n_probe=None):
+        """
+        Retourne les documents des listes les plus proches d'un document, ainsi que
+        les documents ajoutés depuis la construction.
+
+        Args:
+            doc_id (int): Identifiant du document de référence.
+            n_probe (int, optional): Nombre de listes parcourues. Par défaut, `self.n_probe`.
+
+        Returns:
+            np.ndarray: Identifiants des documents candidats.
+        """
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        embedding = self.embed(doc_id)
+        if not np.any(embedding):
+            return np.empty(0, dtype=np.int64)
+        probed = np.argsort(-(self.centroids @ embedding), kind="stable")[:n_probe]
+        lists = [
+            self.list_doc_ids[self.list_indptr[i] : self.list_indptr[i + 1]] for i in probed
+        ]
+        lists.append(np.arange(self.n_built, self.engine.n_docs))
+        return np.concatenate(lists)
+
+    def similar(self, doc_id, k=10, n_probe=None):
+        """
+        Retourne les documents les plus semblables à un document.
+
+        Args:
+            doc_id (int): Identifiant du document de référence.
+            k (int): Nombre de documents à retourner.
+            n_probe (int, optional): Nombre de listes parcourues. Par défaut, `self.n_probe`.
+
+        Returns:
+            tuple:
+                - doc_ids (np.ndarray): Documents semblables, par similarité décroissante
+                  (le document de référence est exclu).
+                - scores (np.ndarray): Similarité cosinus TF-IDF de chacun d'eux.
+        """
+        # Candidats triés : à similarité égale, l'ordre est celui des identifiants
+        candidates = np.sort(self.candidates(doc_id, n_probe))
+        candidates = candidates[candidates != doc_id]
+        norms = self.engine.doc_norms
+        dot = np.asarray(
+            (self.engine.tfidf_rows(candidates) @ self.engine.tfidf_rows([doc_id]).T).todense(),
+            dtype=np.float64,
+        ).ravel()
+        denominator = norms[candidates] * norms[doc_id]
+        scores = np.divide(dot, denominator, out=np.zeros_like(dot), where=denominator > 0)
+        # Les documents retirés ont des poids nuls
+        kept = scores > 0
+        candidates, scores = candidates[kept], scores[kept]
+        selected = np.argsort(-scores, kind="stable")[:k]
+        return candidates[selected], scores[selected]
+
+    def save(self, path):
+        """
+        Sauvegarde l'index dans un répertoire.
+
+        Args:
+            path (str): Répertoire de destination (créé s'il n'existe pas).
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in ["components", "centroids", "list_doc_ids", "list_indptr"]:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"n_probe": self.n_probe, "n_built": self.n_built}, f, indent=4)
+
+    @classmethod
+    def load(cls, path, engine, mmap=True):
+        """
+        Charge un index sauvegardé par `save`.
+
+        Args:
+            path (str): Répertoire contenant l'index.
+            engine (SearchEngine): Moteur de recherche dont l'index est issu.
+            mmap (bool, optional): Projeter les tableaux en mémoire plutôt que les lire.
+
+        Returns:
+            SimilarityIndex: Index prêt à l'emploi.
+        """
+        index = cls.__new__(cls)
+        index.engine = engine
+        for name in ["components", "centroids", "list_doc_ids", "list_indptr"]:
+            array = np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+            setattr(index, name, array)
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index.n_probe = meta["n_probe"]
+        index.n_built = meta["n_built"]
+        return index
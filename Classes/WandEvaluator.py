@@ -0,0 +1,241 @@
+import numpy as np
+from Classes.InvertedIndex import candidate_mask
+
+# Marge relative ajoutée aux bornes pour absorber les erreurs d'arrondi des scores
+BOUND_MARGIN = 1e-6
+
+
+class WandEvaluator:
+    """
+    Classe évaluant les `k` meilleurs documents d'une requête par élagage dynamique
+    (variante MaxScore de WAND), avec le modèle de pondération du moteur de recherche.
+
+    Chaque terme a une borne supérieure de sa contribution au score
+    (`Scorer.upper_bounds`, tirée des maxima conservés par l'index). Les postings
+    sont lus par borne décroissante et leurs contributions accumulées en scores
+    partiels ; après chaque terme, les documents lus de plus forte majoration (score
+    partiel plus bornes des termes non lus) sont évalués, ce qui relève le seuil
+    d'entrée dans le classement (score du k-ième document). Dès que la somme des
+    bornes des termes restants passe sous le seuil, ces termes sont « non
+    essentiels » : un document qui ne contient qu'eux ne peut pas entrer dans le
+    classement, et leurs postings (les plus longs, les termes fréquents ayant les
+    plus faibles bornes) ne sont pas parcourus.
+
+    Seuls les documents lus dont la majoration atteint le seuil sont ensuite évalués.
+    Un document évalué est localisé par dichotomie dans le posting brut de chaque
+    terme et reçoit exactement le score du calcul exhaustif (contributions sommées
+    dans l'ordre des termes) : les résultats sont identiques à ceux de
+    `Scorer.score` suivi d'une sélection des `k` meilleurs. Lorsque le seuil ne
+    permet de sauter qu'une faible part des postings restants (bornes trop lâches,
+    fréquent avec la similarité cosinus), la requête est évaluée de façon exhaustive.
+
+    Le score final d'un document doit être une somme de contributions transformée
+    par `Scorer.finalize` de façon linéaire (division par la norme du document pour
+    la similarité cosinus, identité pour BM25).
+
+    Les sommes partielles sont accumulées dans des tableaux de travail de la taille
+    du corpus, alloués une fois et réutilisés d'une requête à l'autre : seules les
+    positions des documents lus sont parcourues puis remises à zéro, si bien qu'une
+    requête ne coûte rien en proportion du nombre total de documents.
+    """
+
+    # Nombre de documents évalués pour relever le seuil après chaque terme lu
+    CHUNK_SIZE = 256
+
+    def __init__(self, engine):
+        """
+        Args:
+            engine (SearchEngine): Moteur de recherche dont l'index et le modèle de
+                pondération sont utilisés.
+        """
+        self.engine = engine
+        # Tableaux de travail, agrandis avec le corpus et remis à zéro après chaque
+        # requête aux seules positions lues
+        self.sums = np.zeros(0)
+        self.pending = np.zeros(0, dtype=bool)
+        self.evaluated = np.zeros(0, dtype=bool)
+
+    def scratch(self, n_docs):
+        """
+        Retourne les tableaux de travail (sommes partielles, documents en attente,
+        documents évalués), agrandis si le corpus a grandi. Ils sont nuls (faux) en
+        dehors d'une requête.
+        """
+        if len(self.sums) < n_docs:
+            self.sums = np.zeros(n_docs)
+            self.pending = np.zeros(n_docs, dtype=bool)
+            self.evaluated = np.zeros(n_docs, dtype=bool)
+        return self.sums, self.pending, self.evaluated
+
+    def evaluate(self, doc_ids, postings, parameters, visited):
+        """
+        Calcule le score exact de documents en les cherchant dans chaque posting.
+
+        Args:
+            doc_ids (np.ndarray): Documents à évaluer, triés.
+            postings (list): Postings bruts `(doc_ids, valeurs)` de chaque terme.
+            parameters (np.ndarray): Paramètres des termes (`Scorer.term_parameters`).
+            visited (np.ndarray): Nombre de postings lus par terme, mis à jour.
+
+        Returns:
+            tuple:
+                - doc_ids (np.ndarray): Documents présents (non retirés).
+                - scores (np.ndarray): Score de chacun d'eux.
+        """
+        engine, scorer = self.engine, self.engine.scorer
+        rows, found_values, found_parameters = [], [], []
+        for rank, (docs, values) in enumerate(postings):
+            if not len(docs):
+                continue
+            positions = np.minimum(np.searchsorted(docs, doc_ids), len(docs) - 1)
+            # Les documents retirés ont des valeurs nulles
+            found = np.flatnonzero((docs[positions] == doc_ids) & (values[positions] > 0))
+            rows.append(found)
+            found_values.append(values[positions[found]])
+            found_parameters.append(np.full(len(found), parameters[rank]))
+            visited[rank] += len(found)
+        if not rows:
+            return doc_ids[:0], scorer.finalize(engine, doc_ids[:0], np.empty(0), len(postings))
+
+        # Contributions calculées en une fois, puis sommées document par document dans
+        # l'ordre des termes, comme le calcul exhaustif
+        rows = np.concatenate(rows)
+        contributions = scorer.contributions(
+            engine,
+            np.concatenate(found_parameters),
+            doc_ids[rows],
+            np.concatenate(found_values),
+        )
+        sums = np.bincount(rows, weights=contributions, minlength=len(doc_ids))
+        matched = np.bincount(rows, minlength=len(doc_ids)) > 0
+        doc_ids = doc_ids[matched]
+        return doc_ids, scorer.finalize(engine, doc_ids, sums[matched], len(postings))
+
+    def top_k(self, term_ids, k, candidates=None):
+        """
+        Retourne les `k` documents de meilleur score pour une requête.
+
+        Args:
+            term_ids (list): Identifiants (distincts) des termes de la requête.
+            k (int): Nombre de documents à retourner.
+            candidates (np.ndarray, optional): Identifiants triés des seuls documents
+                à évaluer. Par défaut, tous les documents.
+
+        Returns:
+            tuple:
+                - doc_ids (np.ndarray): Documents retenus, par score décroissant puis
+                  par identifiant croissant.
+                - scores (np.ndarray): Score de chacun de ces documents.
+                - stats (dict): Compteurs de la requête : "postings" (nombre total de
+                  postings des termes), "visited" (postings lus : postings parcourus
+                  et documents localisés par dichotomie), "skipped" (postings jamais
+                  lus) et "evaluated" (documents entièrement évalués).
+        """
+        engine, scorer = self.engine, self.engine.scorer
+        postings = [engine.index.postings(term_id, scorer.field) for term_id in term_ids]
+        parameters = scorer.term_parameters(engine, term_ids)
+        bounds = scorer.upper_bounds(engine, term_ids) * (1 + BOUND_MARGIN)
+        lengths = np.array([len(docs) for docs, _ in postings], dtype=np.int64)
+        visited = np.zeros(len(term_ids), dtype=np.int64)
+        evaluated_ids, evaluated_scores = [], []
+        threshold = -np.inf
+
+        def record(doc_ids):
+            nonlocal threshold
+            doc_ids, scores = self.evaluate(np.sort(doc_ids), postings, parameters, visited)
+            evaluated_ids.append(doc_ids)
+            evaluated_scores.append(scores)
+            all_scores = np.concatenate(evaluated_scores)
+            if len(all_scores) >= k:
+                threshold = float(np.partition(all_scores, len(all_scores) - k)[-k])
+
+        # Sommes partielles des contributions des termes lus, documents lus en attente
+        # d'évaluation et documents évalués, dans les tableaux de travail ; `read`
+        # liste (sans doublon) les documents lus, seules positions parcourues
+        sums, pending, evaluated = self.scratch(engine.n_docs)
+        read = []
+
+        def reachable(rest, limit=None):
+            # Documents en attente dont la majoration (somme partielle et bornes des
+            # termes non lus) atteint le seuil ; au plus `limit`, de majoration maximale
+            doc_ids = np.concatenate(read) if read else np.empty(0, dtype=np.int64)
+            doc_ids = doc_ids[pending[doc_ids]]
+            upper = scorer.finalize(engine, doc_ids, sums[doc_ids], len(term_ids)) + rest
+            kept = upper * (1 + BOUND_MARGIN) >= threshold
+            doc_ids, upper = doc_ids[kept], upper[kept]
+            if limit is not None and len(doc_ids) > limit:
+                doc_ids = doc_ids[np.argpartition(-upper, limit)[:limit]]
+            return doc_ids
+
+        def evaluate_best(doc_ids):
+            if not len(doc_ids):
+                return
+            record(doc_ids)
+            pending[doc_ids] = False
+            evaluated[doc_ids] = True
+
+        try:
+            # Termes lus par borne décroissante, tant que les bornes des termes restants
+            # atteignent le seuil ; les suivants sont non essentiels : un document qui ne
+            # contient qu'eux ne peut pas entrer dans le classement
+            by_bound = np.argsort(-bounds, kind="stable")
+            unread = np.append(np.cumsum(bounds[by_bound][::-1])[::-1], 0.0)
+            n_read, exhaustive = 0, False
+            while k > 0 and n_read < len(term_ids) and unread[n_read] >= threshold:
+                skippable = lengths[by_bound[np.count_nonzero(unread[:-1] >= threshold) :]].sum()
+                if n_read and 2 * skippable < lengths[by_bound[n_read:]].sum():
+                    # Le seuil ne permet de sauter qu'une faible part des postings restants
+                    # (bornes lâches) : l'évaluation exhaustive est alors moins coûteuse
+                    doc_ids, scores = scorer.score(engine, term_ids, candidates)
+                    evaluated_ids[:], evaluated_scores[:] = [doc_ids], [scores]
+                    visited[:], exhaustive = lengths, True
+                    break
+                rank = by_bound[n_read]
+                docs, values = postings[rank]
+                kept = values > 0
+                if candidates is not None:
+                    kept &= candidate_mask(docs, candidates)
+                docs, values = docs[kept], values[kept]
+                read.append(docs[~(pending[docs] | evaluated[docs])])
+                sums[docs] += scorer.contributions(engine, parameters[rank], docs, values)
+                pending[docs] = ~evaluated[docs]
+                visited[rank] = lengths[rank]
+                n_read += 1
+                if unread[n_read] >= threshold:
+                    # Les meilleurs documents lus relèvent le seuil, ce qui peut éviter
+                    # de lire le terme suivant
+                    evaluate_best(reachable(unread[n_read], self.CHUNK_SIZE))
+
+            # Évaluation des documents restants dont la majoration atteint le seuil : les
+            # meilleurs d'abord, qui relèvent le seuil, puis les autres en une fois
+            if k > 0 and not exhaustive:
+                evaluate_best(reachable(unread[n_read], self.CHUNK_SIZE))
+                evaluate_best(reachable(unread[n_read]))
+        finally:
+            # Remise à zéro des tableaux de travail aux seules positions lues
+            if read:
+                touched = np.concatenate(read)
+                sums[touched], pending[touched], evaluated[touched] = 0, False, False
+
+        visited = np.minimum(visited, lengths)
+        stats = {
+            "postings": int(lengths.sum()),
+            "visited": int(visited.sum()),
+            "skipped": int((lengths - visited).sum()),
+            "evaluated": int(sum(len(doc_ids) for doc_ids in evaluated_ids)),
+        }
+        dtype = scorer.finalize(engine, np.empty(0, dtype=np.int64), np.empty(0), 0).dtype
+        if not evaluated_ids or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=dtype), stats
+
+        # Sélection finale : les documents d'au moins le k-ième score, par score
+        # décroissant puis par identifiant croissant, comme le calcul exhaustif
+        doc_ids = np.concatenate(evaluated_ids)
+        scores = np.concatenate(evaluated_scores)
+        if k < len(scores):
+            kept = scores >= np.partition(scores, len(scores) - k)[len(scores) - k]
+            doc_ids, scores = doc_ids[kept], scores[kept]
+        order = np.argsort(doc_ids, kind="stable")
+        doc_ids, scores = doc_ids[order], scores[order]
+        selected = np.argsort(-scores, kind="stable")[:k]
+        return doc_ids[selected].astype(np.int64), scores[selected], stats
@@ -6,22 +6,22 @@ def test_author_initialization():
     author = Author("Test Author")
     assert author.name == "Test Author"
     assert author.ndoc == 0
-    assert author.production == []
+    assert len(author.production) == 0
 
 
 def test_author_add_production():
-    author = Author("Test Author")
     doc = RedditDocument(
         "Test Title", "Test Author", "2022/01/01", "http://test.url", "Test text", 5
     )
-    author.add(doc)
+    author = Author("Test Author", {7: doc})
+    author.add(7)
     assert author.ndoc == 1
     assert len(author.production) == 1
-    assert author.production[0] == doc
+    assert author.production[0] == 7
+    assert author.productions()[0] == doc
 
 
 def test_author_display_stats(capsys):
-    author = Author("Test Author")
     doc1 = RedditDocument(
         "Title 1", "Test Author", "2022/01/01", "http://url1", "Some short text", 5
     )
@@ -33,14 +33,29 @@ def test_author_display_stats(capsys):
         "Another longer text here",
         10,
     )
-    author.add(doc1)
-    author.add(doc2)
+    author = Author("Test Author", {0: doc1, 1: doc2})
+    author.add(0)
+    author.add(1)
     author.display_stats()
     captured = capsys.readouterr()
     assert "Nombre de documents produits : 2" in captured.out
     assert "Taille moyenne des documents : 4 mots" in captured.out
 
 
+def test_author_display_stats_counts_whitespace_separated_words(capsys):
+    doc = RedditDocument("Title", "Test Author", "2022/01/01", "http://url", "COVID-19 : 2 doses", 0)
+    author = Author("Test Author", {0: doc})
+    author.add(0)
+    author.display_stats()
+    # Nombres et ponctuation comptent comme des mots, contrairement au découpage du
+    # moteur de recherche
+    assert doc.word_count == 2
+    assert "Taille moyenne des documents : 4 mots" in capsys.readouterr().out
+    doc.text = "booster"
+    author.display_stats()
+    assert "Taille moyenne des documents : 1 mots" in capsys.readouterr().out
+
+
 def test_author_str():
     author = Author("Test Author")
     assert str(author) == "Auteur : Test Author\t# productions : 0"
\ No newline at end of file
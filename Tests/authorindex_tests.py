@@ -0,0 +1,39 @@
+from Classes.AuthorIndex import AuthorIndex, normalize_name
+from Classes.Corpus import Corpus
+from Classes.Document import ArxivDocument, RedditDocument
+
+
+def build_corpus():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(
+        ArxivDocument(
+            "A", "Marie Curie", ["Pierre Curie", "Émile Borel"], "2020/01/01", "http://a", "x"
+        )
+    )
+    corpus.add_document(RedditDocument("B", "pierre curie", "2021/01/01", "http://b", "y", 0))
+    corpus.add_document(RedditDocument("C", "Ada Lovelace", "2022/01/01", "http://c", "z", 0))
+    return corpus
+
+
+### Tests pour la classe AuthorIndex ###
+def test_author_index_lookup_includes_co_authors():
+    index = AuthorIndex(build_corpus())
+    assert normalize_name("  Émile   BOREL ") == "emile borel"
+    assert index.lookup("curie").tolist() == [0, 1]
+    assert index.lookup("EMILE").tolist() == [0]
+    assert index.lookup("da").tolist() == [2]
+    assert index.lookup("inconnu").tolist() == []
+    assert index.documents("Pierre Curie").tolist() == [0, 1]
+    assert index.suggest("Ada Lovlace", n=1)[0][0] == "Ada Lovelace"
+
+
+def test_author_index_follows_corpus():
+    corpus = build_corpus()
+    index = corpus.get_author_index()
+    corpus.remove_document(2)
+    assert index.lookup("lovelace").tolist() == []
+    assert "ada lovelace" not in index.names
+    assert not any("ada lovelace" in names for names in index.grams.values())
+    corpus.add_document(RedditDocument("D", "Ada Lovelace", "2023/01/01", "http://d", "w", 0))
+    assert index.lookup("lovelace").tolist() == [3]
@@ -0,0 +1,91 @@
+import pytest
+from Classes.BinaryCorpus import (
+    BinaryCorpusWriter,
+    convert_json,
+    read_binary_documents,
+    date_to_days,
+    days_to_date,
+)
+from Classes.Corpus import Corpus
+from Classes.Document import Document, RedditDocument, ArxivDocument, LazyText
+
+
+### Tests pour le format binaire du corpus ###
+def test_binary_corpus_round_trip(tmp_path):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(
+        RedditDocument("Titre é", "Auteur 1", "2022/01/01", "http://url1", "Texte ü", 5)
+    )
+    corpus.add_document(
+        ArxivDocument("Titre 2", "Auteur 2", ["Auteur 1", "Co"], "2023/02/03", "http://url2", "")
+    )
+    corpus.save_to_binary(tmp_path / "corpus.qpc")
+
+    Corpus.reset_instance()
+    new_corpus = Corpus("New Corpus")
+    new_corpus.load_from_binary(tmp_path / "corpus.qpc")
+    assert new_corpus.ndoc == 2
+    assert new_corpus.naut == 3
+    reddit, arxiv = new_corpus.id2doc[0], new_corpus.id2doc[1]
+    assert isinstance(reddit._text, LazyText)
+    assert reddit.text == "Texte ü"
+    assert (reddit.title, reddit.date, reddit.num_comments) == ("Titre é", "2022/01/01", 5)
+    assert arxiv.co_authors == ["Auteur 1", "Co"]
+    assert arxiv.author == "Auteur 2" and arxiv.text == ""
+    assert arxiv.co_authors[0] is reddit.author
+
+
+def test_binary_corpus_convert_json(tmp_path):
+    convert_json("Data/coronavirus_data.json", tmp_path / "corpus.qpc")
+    documents = list(read_binary_documents(tmp_path / "corpus.qpc"))
+    expected = [doc for batch in Corpus.read_json_batches("Data/coronavirus_data.json") for doc in batch]
+    assert len(documents) == len(expected)
+    for doc, reference in zip(documents, expected):
+        assert repr(doc) == repr(reference)
+
+
+def test_binary_corpus_dates():
+    assert days_to_date(date_to_days("2024/12/31")) == "2024/12/31"
+    assert date_to_days("") == -1
+    assert days_to_date(-1) == ""
+
+
+def test_binary_corpus_keeps_non_canonical_dates(tmp_path):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(RedditDocument("Titre 1", "Auteur", "2022-01-05", "http://url1", "a", 1))
+    corpus.add_document(RedditDocument("Titre 2", "Auteur", "2022/01/05", "http://url2", "b", 1))
+    corpus.add_document(RedditDocument("Titre 3", "Auteur", "", "http://url3", "c", 1))
+    corpus.save_to_binary(tmp_path / "corpus.qpc")
+    documents = list(read_binary_documents(tmp_path / "corpus.qpc"))
+    assert [doc.date for doc in documents] == ["2022-01-05", "2022/01/05", ""]
+
+    # Un corpus de la version 1 (sans dates brutes) reste lisible
+    meta_filename = tmp_path / "corpus.qpc" / "meta.json"
+    meta_filename.write_text(meta_filename.read_text().replace('"version": 2', '"version": 1'))
+    (tmp_path / "corpus.qpc" / "raw_dates.bin").unlink()
+    (tmp_path / "corpus.qpc" / "raw_dates_offsets.npy").unlink()
+    documents = list(read_binary_documents(tmp_path / "corpus.qpc"))
+    assert [doc.date for doc in documents] == ["", "2022/01/05", ""]
+
+
+class UnknownDocument(Document):
+    # Type de document que le format binaire ne connaît pas
+    def get_type(self):
+        return "Mastodon"
+
+
+def test_binary_corpus_writer_cleans_up_on_error(tmp_path):
+    doc = RedditDocument("Titre", "Auteur", "2022/01/01", "http://url1", "Texte", 1)
+    with pytest.raises(KeyError):
+        with BinaryCorpusWriter(tmp_path / "corpus.qpc") as writer:
+            writer.add(doc)
+            writer.add(UnknownDocument("Titre", "Auteur", "2022/01/01", "http://url2", "Texte"))
+    assert all(file.closed for file in writer.files.values())
+    assert not (tmp_path / "corpus.qpc").exists()
+
+    (tmp_path / "corpus.json").write_text('{"documents": [', encoding="utf-8")
+    with pytest.raises(ValueError):
+        convert_json(tmp_path / "corpus.json", tmp_path / "converti.qpc")
+    assert not (tmp_path / "converti.qpc").exists()
@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+from Classes.BooleanQuery import (
+    AndQuery,
+    NearQuery,
+    NotQuery,
+    OrQuery,
+    PhraseQuery,
+    TermQuery,
+    is_boolean_query,
+    parse_query,
+)
+from Classes.Corpus import Corpus
+from Classes.Document import RedditDocument
+from Classes.PositionalIndex import gallop_intersect, intersect_all
+from Classes.Scorer import BM25Scorer
+from Classes.SearchEngine import SearchEngine
+
+TEXTS = [
+    "covid vaccine trial results",
+    "vaccine against covid in schools",
+    "mask mandate in schools",
+    "the vaccine trial was paused",
+    "covid mask and vaccine",
+]
+
+
+def make_corpus(texts=TEXTS):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    for i, text in enumerate(texts):
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"A{i % 2}", f"{2020 + i % 2}/01/01", f"http://url{i}", text, 0)
+        )
+    return corpus
+
+
+def matching(query, corpus):
+    return parse_query(query).documents(corpus.get_positional_index())
+
+
+### Tests pour l'intersection galopante ###
+def test_gallop_intersect_matches_set_intersection():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        small = sorted(rng.choice(1000, rng.integers(0, 30), replace=False).tolist())
+        large = sorted(rng.choice(1000, rng.integers(0, 400), replace=False).tolist())
+        expected = sorted(set(small) & set(large))
+        assert gallop_intersect(small, large) == expected
+        assert intersect_all([large, small, large[::2]]) == sorted(set(expected) & set(large[::2]))
+    assert intersect_all([]) == []
+
+
+### Tests pour l'analyseur de requêtes ###
+def test_parse_query_builds_tree_with_precedence():
+    node = parse_query('covid AND "vaccine trials" OR NOT mask')
+    assert isinstance(node, OrQuery)
+    conjunction, negation = node.children
+    assert isinstance(conjunction, AndQuery) and isinstance(negation, NotQuery)
+    assert isinstance(conjunction.children[1], PhraseQuery)
+    assert conjunction.children[1].phrase == ["vaccine", "trials"]
+    assert repr(parse_query("covid vaccine")) == repr(parse_query("Covid AND vaccine"))
+
+    near = parse_query("(vaccine NEAR/2 trial)")
+    assert isinstance(near, NearQuery) and near.distance == 2
+    assert isinstance(near.left, TermQuery) and near.left.term == "vaccine"
+    # Les mots vides ne contraignent pas la requête
+    assert repr(parse_query("the covid")) == repr(TermQuery("covid"))
+    assert parse_query("the") is None and parse_query("") is None
+
+
+def test_parse_query_rejects_malformed_queries():
+    malformed = ["(covid", "covid)", "covid AND", "OR covid", "(covid OR mask) NEAR/3 vaccine", "NEAR/2"]
+    for query in malformed:
+        with pytest.raises(ValueError):
+            parse_query(query)
+
+
+def test_is_boolean_query():
+    assert is_boolean_query('"covid vaccine"')
+    assert is_boolean_query("covid NOT mask")
+    assert is_boolean_query("vaccine NEAR/3 trial")
+    assert not is_boolean_query("covid vaccine or mask")
+
+
+### Tests pour l'évaluation des requêtes ###
+def test_boolean_operators_and_phrases():
+    corpus = make_corpus()
+    assert matching("covid vaccine", corpus) == [0, 1, 4]
+    assert matching('"covid vaccine"', corpus) == [0]
+    assert matching("mask OR trial", corpus) == [0, 2, 3, 4]
+    assert matching("vaccine NOT covid", corpus) == [3]
+    assert matching("NOT vaccine", corpus) == [2]
+    assert matching("(mask OR trial) AND NOT schools", corpus) == [0, 3, 4]
+    assert matching('"vaccine trial" OR "mask mandate"', corpus) == [0, 2, 3]
+    assert matching("unknown AND covid", corpus) == []
+
+
+def test_near_operator_counts_indexed_words():
+    corpus = make_corpus()
+    # « vaccine against covid » : « against » est un mot vide, les termes sont voisins
+    assert matching("covid NEAR/1 vaccine", corpus) == [0, 1]
+    assert matching("covid NEAR/2 vaccine", corpus) == [0, 1, 4]
+    assert matching("covid NEAR/1 trial", corpus) == []
+    assert matching("covid NEAR/2 trial", corpus) == [0]
+    assert matching('"covid vaccine" NEAR/1 results', corpus) == []
+    assert matching('"covid vaccine" NEAR/2 results', corpus) == [0]
+    assert matching("mask NEAR/1 schools", corpus) == []
+
+
+def test_evaluation_follows_corpus_updates():
+    corpus = make_corpus()
+    corpus.add_document(RedditDocument("N", "B", "2022/01/01", "http://n", "covid vaccine", 0))
+    corpus.remove_document(0)
+    assert matching('"covid vaccine"', corpus) == [5]
+
+
+### Tests pour SearchEngine.search_query ###
+def test_search_query_ranks_matching_documents():
+    corpus = make_corpus()
+    engine = SearchEngine(corpus, scorer=BM25Scorer())
+    results = engine.search_query("vaccine AND (trial OR schools)")
+    assert sorted(results["Document ID"]) == [0, 1, 3]
+
+    # Mêmes scores que la recherche par mots-clés, restreinte aux documents retenus
+    keywords = engine.search(["vaccine", "trial", "schools"], top_n=10)
+    expected = keywords[keywords["Document ID"].isin([0, 1, 3])]
+    assert results["Document ID"].tolist() == expected["Document ID"].tolist()
+    assert results["Score"].tolist() == expected["Score"].tolist()
+
+    assert engine.search_query('"vaccine trial"', author_filter="A1")["Document ID"].tolist() == [3]
+    assert sorted(engine.search_query("vaccine", year_filter=2020)["Document ID"]) == [0, 4]
+    # Documents sans terme positif : score nul
+    negation = engine.search_query("NOT vaccine")
+    assert negation["Document ID"].tolist() == [2] and negation["Score"].tolist() == [0]
+    assert engine.search_query("the").empty
+
+
+def test_search_query_cache_follows_generation():
+    corpus = make_corpus()
+    engine = SearchEngine(corpus)
+    assert engine.search_query('"mask mandate"')["Document ID"].tolist() == [2]
+    engine.search_query('"mask mandate"')
+    assert engine.cache.stats["hits"] == 1
+    corpus.add_document(RedditDocument("N", "B", "2022/01/01", "http://n", "mask mandate", 0))
+    assert sorted(engine.search_query('"mask mandate"')["Document ID"]) == [2, 5]
@@ -1,5 +1,17 @@
-from Classes.Corpus import Corpus
-from Classes.Document import RedditDocument
+import json
+import os
+import stat
+from Classes.Corpus import Corpus, iter_json_records
+from Classes.Document import RedditDocument, ArxivDocument
+from Classes.MinHashLSH import MinHashLSH
+from utils import count_document_frequency, count_occurrences, remove_stopwords
+
+
+def word(i):
+    """
+    Retourne un mot distinct par entier (les chiffres sont retirés par `clean_text`).
+    """
+    return "m" + "".join(chr(97 + int(d)) for d in str(i))
 
 ### Tests pour la classe Corpus ###
 def test_corpus_initialization():
@@ -53,4 +65,210 @@ def test_corpus_display_sorted_by_date(capsys):
     corpus.display_sorted_by_date()
     captured = capsys.readouterr()
     assert "2023/01/01 - Title 1" in captured.out
-    assert "2022/01/01 - Title 2" in captured.out
\ No newline at end of file
+    assert "2022/01/01 - Title 2" in captured.out
+
+def test_corpus_display_sorted_by_date_uses_date_index(capsys):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    dates = ["2021/05/01", "", "2023/02/10", "2023/07/01", "2022/01/01"]
+    for i, date_str in enumerate(dates):
+        corpus.add_document(
+            RedditDocument(f"Title {i}", "Author", date_str, f"http://url{i}", f"Text {i}", 0)
+        )
+    corpus.remove_document(4)
+    corpus.display_sorted_by_date()
+    titles = [line.split(" - ")[1].split(" (")[0] for line in capsys.readouterr().out.splitlines()]
+    assert titles == ["Title 3", "Title 2", "Title 0", "Title 1"]
+    corpus.display_sorted_by_date(n=1, year=2023)
+    assert "Title 3" in capsys.readouterr().out
+    corpus.display_sorted_by_date(year=2023, month=2)
+    assert capsys.readouterr().out.count("Title") == 1
+
+
+def test_corpus_save_to_json_matches_json_dump(tmp_path):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(
+        RedditDocument("Titre 1", "Auteur 1", "2022/01/01", "http://url1", "Texte é", 5)
+    )
+    corpus.add_document(
+        ArxivDocument("Titre 2", "Auteur 2", ["Co 1", "Co 2"], "2023/01/01", "http://url2", "Texte")
+    )
+    corpus.add_document(
+        ArxivDocument("Titre 3", "Auteur 3", [], "2023/01/02", "http://url3", "Texte")
+    )
+    json_file = tmp_path / "corpus.json"
+    corpus.save_to_json(json_file, atomic=True)
+
+    expected = {"Reddit": [], "Arxiv": []}
+    for doc_id, doc in corpus.id2doc.items():
+        expected[doc.get_type()].append(Corpus.document_record(doc_id, doc))
+    assert json_file.read_text(encoding="utf-8") == json.dumps(
+        expected, indent=4, ensure_ascii=False
+    )
+    assert [path.name for path in tmp_path.iterdir()] == ["corpus.json"]
+
+
+def test_corpus_atomic_save_keeps_file_permissions(tmp_path):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(RedditDocument("Titre", "Auteur", "2022/01/01", "http://url", "Texte", 0))
+    umask = os.umask(0o022)
+    try:
+        created = tmp_path / "nouveau.json"
+        corpus.save_to_json(created, atomic=True)
+        assert stat.S_IMODE(created.stat().st_mode) == 0o644
+        existing = tmp_path / "existant.json"
+        existing.write_text("{}")
+        existing.chmod(0o640)
+        corpus.save_to_json(existing, atomic=True)
+        assert stat.S_IMODE(existing.stat().st_mode) == 0o640
+    finally:
+        os.umask(umask)
+
+
+def test_corpus_stream_from_json_in_batches(tmp_path):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    for i in range(5):
+        corpus.add_document(
+            RedditDocument(f"Titre {i}", f"Auteur {i}", "2022/01/01", f"http://url{i}", "Texte", i)
+        )
+    corpus.add_document(
+        ArxivDocument("Titre 5", "Auteur 5", ["Co 1"], "2023/01/01", "http://url5", "Texte")
+    )
+    json_file = tmp_path / "corpus.json"
+    corpus.save_to_json(json_file)
+
+    batches = [len(batch) for batch in Corpus.read_json_batches(json_file, batch_size=2)]
+    assert batches == [2, 2, 2]
+
+    Corpus.reset_instance()
+    new_corpus = Corpus("New Corpus")
+    added = list(new_corpus.stream_from_json(json_file, batch_size=4))
+    assert added == [[0, 1, 2, 3], [4, 5]]
+    assert new_corpus.id2doc[5].co_authors == ["Co 1"]
+    assert new_corpus.id2doc[3].num_comments == 3
+
+
+def test_iter_json_records_small_chunks():
+    records = list(iter_json_records("Data/coronavirus_data.json", chunk_size=5))
+    with open("Data/coronavirus_data.json", encoding="utf-8") as f:
+        data = json.load(f)
+    assert records == [(key, row) for key, rows in data.items() for row in rows]
+
+
+def test_corpus_skips_duplicates_from_overlapping_loads(tmp_path):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(
+        ArxivDocument("Titre", "Auteur 1", ["Co"], "2023/01/01", "http://arxiv.org/abs/2101.00001v1", "Texte")
+    )
+    corpus.add_document(
+        RedditDocument("Post", "Auteur 2", "2022/01/01", "https://www.reddit.com/r/a/1/", "Texte", 5)
+    )
+    json_file = tmp_path / "corpus.json"
+    corpus.save_to_json(json_file)
+    corpus.load_from_json(json_file)
+    # Même article dans une autre version, même post sous une autre forme d'URL
+    doc_id = corpus.add_document(
+        ArxivDocument("Titre", "Auteur 1", ["Co"], "2023/01/01", "https://arxiv.org/abs/2101.00001v2", "Texte")
+    )
+    corpus.add_document(
+        RedditDocument("Post", "Auteur 2", "2022/01/01", "http://reddit.com/r/a/1", "Texte", 5)
+    )
+    assert doc_id == 0
+    assert corpus.ndoc == 2
+    assert corpus.authors["Auteur 1"].ndoc == 1 and corpus.authors["Co"].ndoc == 1
+
+
+def test_corpus_merge_replaces_previous_version():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus", on_duplicate="merge")
+    corpus.add_document(RedditDocument("Post", "Auteur", "2022/01/01", "http://url1", "Texte", 5))
+    doc_id = corpus.add_document(
+        RedditDocument("Post", "Auteur", "2022/01/01", "http://url1", "Texte", 12)
+    )
+    assert list(corpus.id2doc) == [doc_id]
+    assert corpus.id2doc[doc_id].num_comments == 12
+    assert corpus.authors["Auteur"].ndoc == 1
+
+
+def test_corpus_near_duplicates_are_skipped():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus", near_duplicates=MinHashLSH(threshold=0.7))
+    text = " ".join(word(i) for i in range(200))
+    corpus.add_document(RedditDocument("A", "Auteur", "2022/01/01", "http://url1", text, 0))
+    corpus.add_document(RedditDocument("B", "Auteur", "2022/01/01", "http://url2", text + " fin", 0))
+    corpus.add_document(RedditDocument("C", "Auteur", "2022/01/01", "http://url3", "autre chose", 0))
+    assert corpus.ndoc == 2
+    corpus.remove_document(0)
+    assert corpus.add_document(RedditDocument("B", "Auteur", "2022/01/01", "http://url2", text, 0)) == 2
+
+
+def test_corpus_search_and_concorde_report_documents(capsys):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(RedditDocument("A", "Auteur", "2022/01/01", "http://url1", "Le Virus circule.", 0))
+    corpus.add_document(RedditDocument("B", "Auteur", "2022/01/01", "http://url2", "Aucun rapport.", 0))
+    corpus.add_document(RedditDocument("C", "Auteur", "2022/01/01", "http://url3", "Un virus, puis un autre virus", 0))
+    matches = corpus.search("virus", context_size=5)
+    assert [doc_id for doc_id, _ in matches] == [0, 2, 2]
+    assert matches[0][1] == "Le Virus circ"
+    assert "3 occurence(s)" in capsys.readouterr().out
+
+    concordances = corpus.concorde("virus", context_size=8)
+    assert list(concordances["Document ID"]) == [0, 2, 2]
+    assert list(concordances["Motif trouvé"]) == ["Virus", "virus", "virus"]
+    assert concordances["Contexte droit"][0] == "circule..."
+
+    corpus.remove_document(2)
+    assert [doc_id for doc_id, _ in corpus.search("virus")] == [0]
+
+
+def test_corpus_stats_match_full_recount(capsys):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.load_from_json("Data/coronavirus_data.json")
+    result = corpus.stats(10)
+
+    filtered_text = remove_stopwords("\n".join(doc.text for doc in corpus.id2doc.values()))
+    occurrences = count_occurrences(filtered_text)
+    document_frequency = count_document_frequency(
+        [remove_stopwords(doc.text) for doc in corpus.id2doc.values()]
+    )
+    assert result["vocabulary_size"] == len(occurrences)
+    assert result["most_common"] == sorted(occurrences.items(), key=lambda x: x[1], reverse=True)[:10]
+    table = result["table"].set_index("Mot")
+    assert all(table.loc[word, "Fréquence de documents"] == df for word, df in document_frequency.items())
+    assert f"- {result['most_common'][0][0]} :" in capsys.readouterr().out
+
+
+def test_corpus_stats_follow_additions_and_cache_results():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(RedditDocument("A", "Auteur", "2022/01/01", "http://url1", "virus virus vaccine", 0))
+    statistics = corpus.get_statistics()
+    assert statistics.most_common(2) == [("virus", 2), ("vaccine", 1)]
+    table = statistics.table()
+    assert statistics.table() is table
+
+    corpus.add_document(RedditDocument("B", "Auteur", "2022/01/01", "http://url2", "Vaccine trial, the vaccine", 0))
+    assert statistics.most_common(1) == [("vaccine", 3)]
+    assert statistics.document_frequency["vaccine"] == 2
+    corpus.remove_document(0)
+    assert "virus" not in statistics.term_frequency
+    assert statistics.vocabulary_size == 2
+
+
+def test_corpus_stats_remove_what_was_counted_after_a_text_change():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(RedditDocument("A", "Auteur", "2022/01/01", "http://url1", "virus virus vaccine", 0))
+    corpus.add_document(RedditDocument("B", "Auteur", "2022/01/01", "http://url2", "vaccine trial", 0))
+    statistics = corpus.get_statistics()
+    corpus.id2doc[0].text = "booster booster booster"
+    corpus.remove_document(0)
+    assert dict(statistics.term_frequency) == {"vaccine": 1, "trial": 1}
+    assert dict(statistics.document_frequency) == {"vaccine": 1, "trial": 1}
+    assert all(count > 0 for count in statistics.term_frequency.values())
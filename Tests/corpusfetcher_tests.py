@@ -0,0 +1,274 @@
+import base64
+import hashlib
+import json
+import threading
+import urllib.error
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from Classes.Corpus import Corpus
+from Classes.CorpusFetcher import CorpusFetcher
+from Classes.HttpCache import HttpCache
+
+ARXIV_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title type="html">ArXiv Query: search_query=all:covid</title>
+  <opensearch:totalResults xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">{total}</opensearch:totalResults>
+  <opensearch:startIndex xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">{start}</opensearch:startIndex>
+  {entries}
+</feed>"""
+
+ARXIV_ENTRY = """<entry>
+    <id>http://arxiv.org/abs/2101.{i:05d}v1</id>
+    <published>2021-01-{day:02d}T10:00:00Z</published>
+    <title>Article {i}</title>
+    <summary>Resume de l'article
+{i} sur le covid</summary>
+    <author><name>Auteur {i}</name></author>
+    <author><name>Co-auteur {i}</name></author>
+  </entry>"""
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """
+    Serveur local imitant l'API ArXiv (flux Atom paginés) et les listings Reddit.
+    """
+
+    arxiv_total = 7
+    reddit_total = 5
+    requests = []
+    failures = {}
+
+    token = None
+
+    def do_POST(self):
+        # Délivrance d'un jeton OAuth « application only »
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        assert self.headers["Authorization"] == "Basic " + base64.b64encode(b"id:secret").decode()
+        assert body == b"grant_type=client_credentials"
+        StandIn.token = f"jeton{len(StandIn.requests)}"
+        StandIn.requests.append(self.path)
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(json.dumps({"access_token": StandIn.token, "expires_in": 3600}).encode())
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(url.query))
+        StandIn.requests.append(self.path)
+        if StandIn.token and url.path != "/api/query":
+            if self.headers.get("Authorization") != f"bearer {StandIn.token}":
+                self.send_response(401)
+                self.end_headers()
+                return
+        if StandIn.failures.get(url.path, 0) > 0:
+            StandIn.failures[url.path] -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        if url.path == "/api/query":
+            start, size = int(params["start"]), int(params["max_results"])
+            ids = range(start, min(start + size, StandIn.arxiv_total))
+            entries = "".join(ARXIV_ENTRY.format(i=i, day=i % 28 + 1) for i in ids)
+            body = ARXIV_FEED.format(total=StandIn.arxiv_total, start=start, entries=entries)
+        else:
+            start = int(params.get("after", "t3_0")[3:])
+            ids = range(start, min(start + int(params["limit"]), StandIn.reddit_total))
+            children = [
+                {
+                    "data": {
+                        "title": f"Post {i}",
+                        "author": f"redditeur{i}",
+                        "created_utc": 1700000000 + i * 86400,
+                        "permalink": f"/r/covid/comments/{i}/",
+                        "selftext": f"Texte\ndu post {i}",
+                        "num_comments": i,
+                    }
+                }
+                for i in ids
+            ]
+            after = f"t3_{ids.stop}" if ids.stop < StandIn.reddit_total else None
+            body = json.dumps({"data": {"children": children, "after": after}})
+
+        etag = f'"{hashlib.sha256(body.encode()).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    StandIn.requests, StandIn.failures, StandIn.token = [], {}, None
+    StandIn.arxiv_total = 7
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def make_fetcher(base_url, cache=None):
+    return CorpusFetcher(
+        arxiv_url=f"{base_url}/api/query",
+        reddit_url=base_url,
+        min_interval=0,
+        backoff=0,
+        cache=cache,
+    )
+
+
+### Tests pour la classe CorpusFetcher ###
+def test_fetcher_paginates_both_sources(stand_in):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    added = make_fetcher(stand_in).fetch_corpus(
+        corpus, "covid", reddit_limit=10, arxiv_limit=6, page_size=2
+    )
+    assert added == {"Reddit": 5, "Arxiv": 6}
+    assert corpus.ndoc == 11
+    arxiv_pages = [path for path in StandIn.requests if path.startswith("/api/query")]
+    assert len(arxiv_pages) == 3
+    titles = {doc.title for doc in corpus.id2doc.values()}
+    assert {f"Post {i}" for i in range(5)} <= titles
+    assert {f"Article {i}" for i in range(6)} <= titles
+    arxiv_doc = next(doc for doc in corpus.id2doc.values() if doc.title == "Article 3")
+    assert arxiv_doc.co_authors == ["Co-auteur 3"]
+    assert arxiv_doc.text == "Resume de l'article 3 sur le covid"
+
+
+def test_fetcher_reads_reddit_with_oauth_credentials(stand_in):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    fetcher = CorpusFetcher(
+        reddit_url=stand_in,
+        reddit_client_id="id",
+        reddit_client_secret="secret",
+        reddit_token_url=f"{stand_in}/api/v1/access_token",
+        min_interval=0,
+        backoff=0,
+    )
+    added = fetcher.fetch_corpus(corpus, "covid", reddit_limit=4, arxiv_limit=0, page_size=2)
+    assert added == {"Reddit": 4, "Arxiv": 0}
+    # Un seul jeton pour toutes les pages
+    assert StandIn.requests.count("/api/v1/access_token") == 1
+
+
+def test_fetcher_spaces_requests_per_host():
+    fetcher = CorpusFetcher(min_interval=0.5)
+    assert fetcher.reddit_url == "https://www.reddit.com"
+    fetcher.wait_turn("http://export.arxiv.org/api/query?start=0")
+    fetcher.wait_turn("https://example.org/page")
+    next_request = fetcher.next_request
+    assert next_request["export.arxiv.org"] - next_request["example.org"] == pytest.approx(
+        2.5, abs=0.1
+    )
+    authenticated = CorpusFetcher(reddit_client_id="id", reddit_client_secret="secret")
+    assert authenticated.reddit_url == "https://oauth.reddit.com"
+
+
+def test_failed_revalidation_is_not_retried_as_an_eviction(stand_in, tmp_path):
+    fetcher = make_fetcher(stand_in, HttpCache(str(tmp_path / "cache"), ttl=0))
+    url = fetcher.arxiv_page_url("covid", 0, 2)
+    fetcher.fetch(url)
+    StandIn.requests, StandIn.failures = [], {"/api/query": 10}
+    with pytest.raises(urllib.error.HTTPError) as error:
+        fetcher.fetch(url)
+    assert error.value.code == 503
+    assert len(StandIn.requests) == fetcher.max_retries + 1
+
+
+def test_reddit_pages_are_not_queued_behind_rate_limited_arxiv_pages(stand_in):
+    # Hôtes distincts pour les deux sources, ArXiv interrogé toutes les 0,2 s
+    arxiv_base = stand_in.replace("127.0.0.1", "localhost")
+    fetcher = CorpusFetcher(
+        arxiv_url=f"{arxiv_base}/api/query",
+        reddit_url=stand_in,
+        max_workers=2,
+        host_intervals={urllib.parse.urlsplit(arxiv_base).netloc: 0.2},
+        min_interval=0,
+        backoff=0,
+    )
+    StandIn.arxiv_total = 12
+    Corpus.reset_instance()
+    added = fetcher.fetch_corpus(
+        Corpus("Test Corpus"), "covid", reddit_limit=5, arxiv_limit=12, page_size=2
+    )
+    assert added == {"Reddit": 5, "Arxiv": 12}
+    last_reddit = max(i for i, path in enumerate(StandIn.requests) if path.startswith("/r/"))
+    arxiv_after = [path for path in StandIn.requests[last_reddit:] if path.startswith("/api/")]
+    # Les pages Reddit se terminent alors que des pages ArXiv restent à venir
+    assert len(arxiv_after) >= 3
+
+
+def test_fetcher_retries_transient_errors(stand_in):
+    StandIn.failures = {"/api/query": 2}
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    added = make_fetcher(stand_in).fetch_corpus(
+        corpus, "covid", reddit_limit=0, arxiv_limit=3, page_size=5
+    )
+    assert added == {"Reddit": 0, "Arxiv": 3}
+    assert len(StandIn.requests) == 3
+
+
+def test_generate_corpus_with_fetcher(stand_in, capsys):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.generate_corpus("covid", reddit_limit=2, arxiv_limit=2, fetcher=make_fetcher(stand_in))
+    assert corpus.ndoc == 4
+    assert "2 documents Reddit et 2 documents ArXiv" in capsys.readouterr().out
+
+
+def test_generate_corpus_uses_the_given_cache(tmp_path, monkeypatch, capsys):
+    created = []
+
+    class Recorder:
+        def __init__(self, **kwargs):
+            created.append(kwargs)
+
+        def fetch_corpus(self, corpus, user_query, reddit_limit, arxiv_limit):
+            return {"Reddit": 0, "Arxiv": 0}
+
+    monkeypatch.setattr("Classes.Corpus.CorpusFetcher", Recorder)
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    cache = HttpCache(str(tmp_path / "cache"), ttl=86400, max_bytes=2**20)
+    corpus.generate_corpus("covid", cache=cache)
+    corpus.generate_corpus("covid", cache_dir=str(tmp_path / "other"))
+    assert created[0]["cache"] is cache
+    assert created[1]["cache"].path == str(tmp_path / "other")
+
+
+def test_warm_rebuild_hits_no_network(stand_in, tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"))
+    titles = []
+    for _ in range(2):
+        Corpus.reset_instance()
+        corpus = Corpus("Test Corpus")
+        fetcher = make_fetcher(stand_in, cache)
+        fetcher.fetch_corpus(corpus, "covid", reddit_limit=4, arxiv_limit=4, page_size=2)
+        titles.append(sorted(doc.title for doc in corpus.id2doc.values()))
+    assert titles[0] == titles[1] and len(titles[0]) == 8
+    assert len(StandIn.requests) == 4
+    assert fetcher.stats["cache_hits"] == 4 and fetcher.stats["downloads"] == 0
+    assert fetcher.stats["parse_skipped"] == 4
+
+
+def test_stale_entries_are_revalidated(stand_in, tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"), ttl=0)
+    for _ in range(2):
+        Corpus.reset_instance()
+        fetcher = make_fetcher(stand_in, cache)
+        fetcher.fetch_corpus(Corpus("Test Corpus"), "covid", reddit_limit=0, arxiv_limit=2)
+    # Seconde passe : requête conditionnelle, réponse 304 et analyse évitée
+    assert len(StandIn.requests) == 2
+    assert fetcher.stats["revalidated"] == 1 and fetcher.stats["parse_skipped"] == 1
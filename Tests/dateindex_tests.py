@@ -0,0 +1,31 @@
+from Classes.DateIndex import DateIndex, date_to_days
+
+
+### Tests pour la classe DateIndex ###
+def test_dateindex_range_year_and_month():
+    index = DateIndex()
+    for doc_id, date_str in enumerate(["2023/03/05", "2022/12/31", "2023/01/01", "2023/03/20"]):
+        index.add(doc_id, date_str)
+    assert index.year(2023).tolist() == [2, 0, 3]
+    assert index.year(2023, 3).tolist() == [0, 3]
+    assert index.year(2022, 12).tolist() == [1]
+    assert index.year(2021).tolist() == []
+    assert index.between("2022/12/31", "2023/03/05").tolist() == [1, 2, 0]
+    assert index.ordinals[1] == date_to_days("2022/12/31")
+    assert index.year(20222).tolist() == [] and index.year(0).tolist() == []
+    assert index.year(2023, 13).tolist() == []
+    assert DateIndex.year_bounds(9999, 12) == (date_to_days("9999/12/01"), date_to_days("9999/12/31"))
+
+
+def test_dateindex_newest_removal_and_undated():
+    index = DateIndex()
+    for doc_id, date_str in enumerate(["2021/06/01", "", "2024/02/29", "2021/06/01", "pas une date"]):
+        index.add(doc_id, date_str)
+    # À date égale, les identifiants restent dans l'ordre croissant
+    assert index.newest().tolist() == [2, 0, 3]
+    assert index.newest(2).tolist() == [2, 0]
+    assert index.undated().tolist() == [1, 4]
+    index.remove(2)
+    index.add(7, "2025/01/01")
+    assert index.newest().tolist() == [7, 0, 3]
+    assert index.year(2024).tolist() == []
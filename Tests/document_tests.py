@@ -0,0 +1,34 @@
+from Classes.Corpus import Corpus
+from Classes.Document import Document, RedditDocument
+from Classes.SearchEngine import SearchEngine
+
+
+### Tests pour la classe Document ###
+def test_document_term_counts_are_cached_and_invalidated():
+    doc = RedditDocument("T", "A", "2022/01/01", "http://url", "The virus, the VIRUS and vaccines", 0)
+    counts = doc.term_counts
+    assert counts == {"virus": 2, "vaccines": 1}
+    assert doc.word_count == 6
+    assert doc.term_counts is counts
+    doc.text = "booster"
+    assert doc.term_counts == {"booster": 1} and doc.word_count == 1
+
+
+def test_documents_are_tokenised_once_across_consumers(monkeypatch):
+    calls = []
+    tokenize = Document.tokenize
+
+    def counting_tokenize(self):
+        calls.append(self.title)
+        tokenize(self)
+
+    monkeypatch.setattr(Document, "tokenize", counting_tokenize)
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    for i, text in enumerate(["virus vaccine", "vaccine trial", "booster"]):
+        corpus.add_document(RedditDocument(f"T{i}", "A", "2022/01/01", f"http://url{i}", text, 0))
+    corpus.get_statistics()
+    engine = SearchEngine(corpus)
+    corpus.authors["A"].display_stats()
+    assert sorted(calls) == ["T0", "T1", "T2"]
+    assert list(engine.search(["vaccine"])["Document ID"]) == [0, 1]
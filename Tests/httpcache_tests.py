@@ -0,0 +1,72 @@
+import os
+import pytest
+from Classes.HttpCache import HttpCache
+
+
+### Tests pour la classe HttpCache ###
+def test_cache_is_content_addressed(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    first = cache.store("http://a/1", b"meme contenu", etag='"x"')
+    second = cache.store("http://a/2", b"meme contenu")
+    assert first == second
+    assert os.listdir(tmp_path / "objects") == [first]
+    entry = cache.lookup("http://a/1")
+    assert entry["fresh"] and cache.read(entry) == b"meme contenu"
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"x"'}
+    assert cache.lookup("http://a/3") is None
+
+
+def test_expired_entry_without_validator_is_dropped(tmp_path):
+    cache = HttpCache(str(tmp_path), ttl=0)
+    cache.store("http://a/1", b"contenu")
+    cache.store("http://a/2", b"autre", last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    assert cache.lookup("http://a/1") is None
+    entry = cache.lookup("http://a/2")
+    assert not entry["fresh"]
+    cache.touch("http://a/2", entry)
+    assert cache.lookup("http://a/2")["last_modified"] is not None
+
+
+def test_size_eviction_removes_oldest_entries(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=25)
+    cache.store("http://a/1", b"x" * 10)
+    cache.store_parsed(HttpCache.digest(b"x" * 10), "parser", ["resultat"])
+    cache.store("http://a/2", b"y" * 10)
+    cache.store("http://a/3", b"z" * 10)
+    assert cache.lookup("http://a/1") is None
+    assert cache.load_parsed(HttpCache.digest(b"x" * 10), "parser") == (False, None)
+    assert cache.read(cache.lookup("http://a/3")) == b"z" * 10
+
+
+def test_size_eviction_keeps_recently_used_entries(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=25)
+    cache.store("http://a/1", b"x" * 10)
+    cache.store("http://a/2", b"y" * 10)
+    assert cache.lookup("http://a/1") is not None
+    cache.store("http://a/3", b"z" * 10)
+    assert cache.lookup("http://a/2") is None
+    assert cache.read(cache.lookup("http://a/1")) == b"x" * 10
+
+
+def test_eviction_does_not_rescan_the_cache(tmp_path, monkeypatch):
+    first = HttpCache(str(tmp_path))
+    first.store("http://a/1", b"x" * 10)
+    first.store("http://a/2", b"y" * 10)
+    first.lookup("http://a/1")
+    # L'ordre d'utilisation est retrouvé à la réouverture, sans relecture ensuite
+    cache = HttpCache(str(tmp_path), max_bytes=25)
+    monkeypatch.setattr(os, "listdir", lambda path: pytest.fail("listdir"))
+    cache.store("http://a/3", b"z" * 10)
+    assert cache.lookup("http://a/2") is None
+    assert cache.lookup("http://a/1") is not None
+    assert cache.total == 20
+
+
+def test_parsed_results_are_evicted_past_the_size_limit(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=100)
+    first = cache.store("http://a/1", b"x" * 10)
+    cache.store("http://a/2", b"y" * 10)
+    cache.store_parsed(first, "parser", "r" * 200)
+    assert cache.total <= 100
+    assert cache.lookup("http://a/1") is None
+    assert cache.load_parsed(first, "parser") == (False, None)
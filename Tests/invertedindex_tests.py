@@ -0,0 +1,64 @@
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+from Classes.Corpus import Corpus
+from Classes.SearchEngine import SearchEngine
+from Classes.Document import RedditDocument
+
+TEXTS = [
+    "virus vaccine trial results",
+    "vaccine vaccine rollout",
+    "virus spread in cities",
+    "economy after the pandemic",
+    "virus virus virus mutation and vaccine",
+]
+
+
+def build_engine():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    for i, text in enumerate(TEXTS):
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"A{i}", "2022/01/01", f"http://url{i}", text, 0)
+        )
+    return SearchEngine(corpus)
+
+
+### Tests pour la classe InvertedIndex ###
+def test_inverted_index_postings():
+    engine = build_engine()
+    doc_ids, weights = engine.index.postings(engine.vocab["virus"])
+    assert list(doc_ids) == [0, 2, 4]
+    assert np.allclose(weights, engine.mat_TFxIDF[:, engine.vocab["virus"]].data)
+
+
+def test_inverted_index_matches_cosine_ranking():
+    engine = build_engine()
+    query = ["virus", "vaccine"]
+    query_vector = np.zeros((1, len(engine.vocab)))
+    for word in query:
+        query_vector[0, engine.vocab[word]] = 1
+    expected = cosine_similarity(engine.mat_TFxIDF, query_vector).ravel()
+
+    results = engine.search(query, top_n=len(TEXTS))
+    expected_order = [i for i in np.argsort(-expected, kind="stable") if expected[i] > 0]
+    assert list(results["Document ID"]) == expected_order
+    assert np.allclose(results["Score"], expected[expected_order])
+
+
+def test_inverted_index_unknown_terms():
+    engine = build_engine()
+    doc_ids, scores = engine.index.cosine_scores([])
+    assert len(doc_ids) == 0 and len(scores) == 0
+    assert engine.search(["unknownword"]).empty
+
+
+def test_inverted_index_candidates_keep_exhaustive_scores():
+    engine = build_engine()
+    term_ids = engine.query_term_ids(["virus", "vaccine", "spread"])
+    all_ids, all_scores = engine.index.cosine_scores(term_ids)
+    subsets = [np.array([0, 2, 3]), np.array([4]), np.arange(len(TEXTS)), np.array([], int)]
+    for candidates in subsets:
+        doc_ids, scores = engine.index.cosine_scores(term_ids, candidates)
+        kept = np.isin(all_ids, candidates)
+        assert doc_ids.tolist() == all_ids[kept].tolist()
+        assert scores.tolist() == all_scores[kept].tolist()
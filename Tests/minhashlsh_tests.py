@@ -0,0 +1,32 @@
+import numpy as np
+from Classes.MinHashLSH import MinHashLSH
+
+
+def word(i):
+    """
+    Retourne un mot distinct par entier (les chiffres sont retirés par `clean_text`).
+    """
+    return "m" + "".join(chr(97 + int(d)) for d in str(i))
+
+
+### Tests pour la classe MinHashLSH ###
+def test_minhash_estimates_jaccard_similarity():
+    lsh = MinHashLSH(num_perm=256, bands=32, shingle_size=1)
+    words = [word(i) for i in range(300)]
+    # Ensembles de 300 mots dont 200 communs : Jaccard = 200 / 400 = 0.5
+    first = lsh.signature(" ".join(words))
+    second = lsh.signature(" ".join(words[100:] + [word(i + 1000) for i in range(100)]))
+    assert abs(np.mean(first == second) - 0.5) < 0.1
+    assert lsh.signature("") is None
+
+
+def test_lsh_query_returns_only_near_duplicates():
+    lsh = MinHashLSH(threshold=0.8)
+    base = " ".join(word(i) for i in range(100))
+    lsh.insert("a", lsh.signature(base))
+    lsh.insert("b", lsh.signature(" ".join(word(i + 1000) for i in range(100))))
+    matches = lsh.query(lsh.signature(base + " supplementaire"))
+    assert [key for key, _ in matches] == ["a"]
+    lsh.remove("a")
+    assert lsh.query(lsh.signature(base)) == []
+    assert all(not buckets or "a" not in set().union(*buckets.values()) for buckets in lsh.buckets)
@@ -0,0 +1,43 @@
+from Classes.Corpus import Corpus
+from Classes.Document import RedditDocument
+from Classes.PositionalIndex import PositionalIndex
+
+
+def make_corpus(texts):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    for i, text in enumerate(texts):
+        corpus.add_document(RedditDocument(f"T{i}", f"A{i}", "2022/01/01", f"http://url{i}", text, 0))
+    return corpus
+
+
+### Tests pour la classe PositionalIndex ###
+def test_positional_index_records_offsets():
+    corpus = make_corpus(["virus et vaccin", "vaccin"])
+    index = PositionalIndex(corpus)
+    assert index.postings["vaccin"] == {0: [(2, 9, 15)], 1: [(0, 0, 6)]}
+    assert index.find("VIRUS") == [(0, 0, 5)]
+
+
+def test_positional_index_finds_phrases_and_follows_corpus():
+    corpus = make_corpus(["the covid vaccine", "vaccine against covid", "covid  vaccine trial"])
+    index = PositionalIndex(corpus)
+    assert index.find("covid vaccine") == [(0, 4, 17), (2, 0, 14)]
+    corpus.add_document(RedditDocument("T3", "A3", "2022/01/01", "http://url3", "Covid vaccine", 0))
+    corpus.remove_document(0)
+    assert [doc_id for doc_id, _, _ in index.find("covid vaccine")] == [2, 3]
+    # Les mots vides ne sont pas indexés : « vaccine against covid » contient l'expression
+    assert "the" not in index.postings and "against" not in index.postings
+    assert index.find("vaccine covid") == [(1, 0, 21)]
+    assert index.find("vaccine covid trial") == []
+
+
+def test_positional_index_removes_documents_whose_text_changed():
+    corpus = make_corpus(["virus et vaccin", "vaccin"])
+    index = corpus.get_positional_index()
+    corpus.id2doc[0].text = "un autre texte"
+    corpus.remove_document(0)
+    assert index.documents("virus") == [] and "virus" not in index.postings
+    assert index.documents("vaccin") == [1]
+    assert not any(0 in documents for documents in index.postings.values())
+    assert list(corpus.concorde("vaccin")["Document ID"]) == [1]
@@ -0,0 +1,28 @@
+from Classes import QueryCache as query_cache_module
+from Classes.QueryCache import QueryCache
+
+
+### Tests pour la classe QueryCache ###
+def test_query_cache_evicts_least_recently_used():
+    cache = QueryCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats == {"hits": 3, "misses": 1, "evictions": 1, "expired": 0}
+    assert len(QueryCache(max_size=0)) == 0
+
+
+def test_query_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(query_cache_module.time, "monotonic", lambda: now[0])
+    cache = QueryCache(ttl=10)
+    cache.put("a", 1)
+    now[0] += 5
+    assert cache.get("a") == 1
+    now[0] += 6
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats["expired"] == 1 and cache.stats["misses"] == 1
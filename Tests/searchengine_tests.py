@@ -1,6 +1,10 @@
+import pytest
+import numpy as np
+from scipy.sparse import issparse
 from Classes.Corpus import Corpus
-from Classes.SearchEngine import SearchEngine
-from Classes.Document import RedditDocument
+from Classes.SearchEngine import INDEX_VERSION, SearchEngine, top_k
+from Classes.Scorer import BM25PlusScorer, BM25Scorer
+from Classes.Document import ArxivDocument, RedditDocument
 
 ### Tests pour la classe SearchEngine ###
 def test_search_engine_initialization():
@@ -64,4 +68,374 @@ def test_search_engine_with_filters():
     results = search_engine.search(["AI"], author_filter="Author 1", year_filter=2022)
     assert len(results) == 1
     assert results.iloc[0]["Auteur"] == "Author 1"
-    assert results.iloc[0]["Date"] == "2022/01/01"
\ No newline at end of file
+    assert results.iloc[0]["Date"] == "2022/01/01"
+    # Une année hors des dates représentables (faute de frappe) ne trouve rien
+    for year in [20222, 10000, -1]:
+        assert search_engine.search(["AI"], year_filter=year).empty
+        assert len(search_engine.search_batch([["AI"]], year_filter=year)[1]) == 0
+
+def test_search_engine_tfidf_stays_sparse():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(
+        RedditDocument("T1", "A1", "2022/01/01", "http://url1", "virus virus vaccine", 5)
+    )
+    corpus.add_document(
+        RedditDocument("T2", "A2", "2022/01/02", "http://url2", "vaccine trial", 5)
+    )
+    search_engine = SearchEngine(corpus)
+    tf = search_engine.mat_TF.toarray()
+    doc_count = (tf > 0).sum(axis=0)
+    idf = np.log(3 / (1 + doc_count)) + 1
+    expected = tf * idf
+    assert issparse(search_engine.mat_TFxIDF)
+    assert search_engine.mat_TFxIDF.dtype == np.float32
+    assert np.allclose(search_engine.mat_TFxIDF.toarray(), expected)
+    assert np.allclose(search_engine.doc_norms, np.linalg.norm(expected, axis=1))
+
+
+def test_search_engine_dtype_is_configurable():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(
+        RedditDocument("T1", "A1", "2022/01/01", "http://url1", "virus vaccine", 5)
+    )
+    search_engine = SearchEngine(corpus, dtype=np.float64)
+    assert search_engine.mat_TFxIDF.dtype == np.float64
+    assert search_engine.idf.dtype == np.float64
+
+
+def test_search_engine_filters_fill_top_n():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    for i in range(20):
+        author = "Author A" if i % 4 == 0 else "Author B"
+        year = 2022 if i % 2 == 0 else 2023
+        text = "vaccine " * (20 - i) + "trial"
+        corpus.add_document(
+            RedditDocument(f"T{i}", author, f"{year}/01/01", f"http://url{i}", text, 0)
+        )
+    search_engine = SearchEngine(corpus)
+    results = search_engine.search(["vaccine"], top_n=3, author_filter="author a")
+    assert list(results["Document ID"]) == [0, 4, 8]
+    results = search_engine.search(["vaccine"], top_n=4, year_filter=2023)
+    assert len(results) == 4
+    assert all(date.startswith("2023") for date in results["Date"])
+
+
+def test_search_engine_author_filter_matches_co_authors():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(
+        ArxivDocument(
+            "T0", "Alice Martin", ["Bob Durand"], "2022/01/01", "http://a", "vaccine trial"
+        )
+    )
+    corpus.add_document(
+        RedditDocument("T1", "Bob Durand", "2022/01/01", "http://b", "vaccine", 0)
+    )
+    corpus.add_document(RedditDocument("T2", "Carol", "2022/01/01", "http://c", "vaccine", 0))
+    search_engine = SearchEngine(corpus)
+    results = search_engine.search(["vaccine"], author_filter="durand")
+    assert sorted(results["Document ID"]) == [0, 1]
+    _, doc_ids, _ = search_engine.search_batch([["vaccine"]], author_filter="durand")
+    assert sorted(doc_ids) == [0, 1]
+
+
+def test_top_k_matches_full_sort():
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 5, size=200).astype(float)
+    expected = np.argsort(-scores, kind="stable")[:17]
+    assert list(top_k(scores, 17)) == list(expected)
+    assert list(top_k(scores, 500)) == list(np.argsort(-scores, kind="stable"))
+    assert len(top_k(scores, 0)) == 0
+
+
+def test_search_engine_search_batch_matches_search():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    texts = ["virus vaccine", "vaccine trial", "virus spread", "economy", "virus virus"]
+    for i, text in enumerate(texts):
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"A{i}", "2022/01/01", f"http://url{i}", text, 0)
+        )
+    search_engine = SearchEngine(corpus)
+    queries = [["virus"], ["vaccine", "trial"], ["unknown"], ["virus", "economy"]]
+    query_ids, doc_ids, scores = search_engine.search_batch(queries, top_n=2)
+    for query_id, query in enumerate(queries):
+        expected = search_engine.search(query, top_n=2)
+        selected = query_ids == query_id
+        assert list(doc_ids[selected]) == list(expected.get("Document ID", []))
+        assert np.allclose(scores[selected], expected.get("Score", []))
+
+    results = search_engine.search_batch(queries, top_n=2, as_dataframe=True)
+    assert list(results.columns[:3]) == ["Requête", "Document ID", "Score"]
+    assert len(results) == len(doc_ids)
+
+
+def test_search_engine_incremental_add():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(
+        RedditDocument("T1", "A1", "2022/01/01", "http://url1", "virus vaccine", 5)
+    )
+    search_engine = SearchEngine(corpus, idf_staleness=10)
+    vaccine_id = search_engine.vocab["vaccine"]
+    corpus.add_document(
+        RedditDocument("T2", "A2", "2023/01/01", "http://url2", "vaccine booster", 5)
+    )
+    results = search_engine.search(["booster"])
+    assert list(results["Document ID"]) == [1]
+    assert search_engine.mat_TF.shape == (2, 3)
+    assert search_engine.vocab["vaccine"] == vaccine_id
+    assert search_engine.doc_count[vaccine_id] == 2
+    assert list(search_engine.search(["vaccine"], year_filter=2023)["Document ID"]) == [1]
+
+
+def test_search_engine_incremental_matches_rebuild():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    texts = ["virus vaccine", "vaccine trial", "virus spread", "economy virus"]
+    for i, text in enumerate(texts[:2]):
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"A{i}", "2022/01/01", f"http://url{i}", text, 0)
+        )
+    search_engine = SearchEngine(corpus, idf_staleness=0)
+    for i, text in enumerate(texts[2:], start=2):
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"A{i}", "2022/01/01", f"http://url{i}", text, 0)
+        )
+    corpus.remove_document(1)
+    search_engine.update()
+
+    rebuilt = SearchEngine(corpus)
+    assert search_engine.vocab.keys() >= rebuilt.vocab.keys()
+    for word in ["virus", "vaccine", "trial"]:
+        expected = rebuilt.search([word])
+        results = search_engine.search([word])
+        assert list(results.get("Document ID", [])) == list(expected.get("Document ID", []))
+        assert np.allclose(results.get("Score", []), expected.get("Score", []))
+    assert search_engine.search(["trial"]).empty
+
+
+def test_search_engine_removing_empty_documents_updates_counts():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    for i, text in enumerate(["virus vaccine", "", "1234 !!"]):
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"A{i}", "2022/01/01", f"http://url{i}", text, 0)
+        )
+    search_engine = SearchEngine(corpus, idf_staleness=10)
+    corpus.remove_document(1)
+    corpus.remove_document(2)
+    search_engine.update()
+    assert search_engine.n_indexed == corpus.ndoc == 1
+    assert search_engine.stale_changes == 2
+    search_engine.refresh()
+    assert np.allclose(search_engine.idf, SearchEngine(corpus).idf)
+
+
+def test_search_engine_save_and_load(tmp_path):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    texts = ["virus vaccine", "vaccine trial", "virus spread", "économie virus"]
+    for i, text in enumerate(texts):
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"A{i}", f"202{i}/01/01", f"http://url{i}", text, 0)
+        )
+    search_engine = SearchEngine(corpus)
+    search_engine.save(tmp_path / "index")
+
+    loaded = SearchEngine.load(tmp_path / "index", corpus, mmap=True)
+    assert loaded.vocab == search_engine.vocab
+    assert isinstance(loaded.index.weights, np.memmap)
+    for query in [["virus"], ["vaccine", "trial"], ["économie"]]:
+        expected = search_engine.search(query)
+        results = loaded.search(query)
+        assert list(results["Document ID"]) == list(expected["Document ID"])
+        assert np.allclose(results["Score"], expected["Score"])
+    assert list(loaded.search(["virus"], year_filter=2022)["Document ID"]) == [2]
+
+    corpus.add_document(
+        RedditDocument("T4", "A4", "2024/01/01", "http://url4", "booster", 0)
+    )
+    assert list(loaded.search(["booster"])["Document ID"]) == [4]
+
+
+def test_search_engine_loaded_index_grows_without_copying(tmp_path):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    for i, text in enumerate(["virus vaccine", "vaccine trial", "virus spread"]):
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"A{i}", "2022/01/01", f"http://url{i}", text, 0)
+        )
+    SearchEngine(corpus, idf_staleness=10).save(tmp_path / "index")
+    loaded = SearchEngine.load(tmp_path / "index", corpus, mmap=True)
+    for i, text in enumerate(["booster virus", "vaccine booster"], start=3):
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"A{i}", "2022/01/01", f"http://url{i}", text, 0)
+        )
+    corpus.remove_document(3)
+    assert list(loaded.search(["booster"])["Document ID"]) == [4]
+
+    # Les lignes ajoutées sont rangées à part : les tableaux projetés ne sont pas recopiés
+    assert isinstance(loaded._mat_TF.data, np.memmap)
+    assert isinstance(loaded.index.doc_ids, np.memmap)
+    assert (loaded._mat_TF.base_rows, loaded._mat_TF.added_rows) == (3, 2)
+    expected = loaded.mat_TFxIDF[[4, 0, 3]].toarray()
+    assert loaded.tfidf_rows([4, 0, 3]).toarray().tolist() == expected.tolist()
+
+    # Les segments delta sont réunis à la sauvegarde
+    loaded.save(tmp_path / "index2")
+    reloaded = SearchEngine.load(tmp_path / "index2", corpus, mmap=False)
+    for query in [["booster"], ["virus", "vaccine"]]:
+        expected = loaded.search(query)
+        results = reloaded.search(query)
+        assert list(results["Document ID"]) == list(expected["Document ID"])
+        assert results["Score"].tolist() == expected["Score"].tolist()
+
+
+def test_search_engine_delta_segments_stay_few_and_match_rebuild():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(
+        RedditDocument("T0", "A0", "2022/01/01", "http://url0", "virus vaccine", 0)
+    )
+    search_engine = SearchEngine(corpus, idf_staleness=1000)
+    for i in range(1, 65):
+        # Mots distincts par document, écrits en lettres (les chiffres ne sont pas indexés)
+        text = "virus mot" + "abcde"[i % 5] + " unique" + "".join(chr(97 + int(d)) for d in str(i))
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"A{i}", "2022/01/01", f"http://url{i}", text, 0)
+        )
+        search_engine.update()
+    corpus.remove_document(10)
+    corpus.remove_document(63)
+    search_engine.update()
+
+    # Segments fusionnés par tailles décroissantes : nombre logarithmique d'ajouts
+    sizes = [len(delta["doc_ids"]) for delta in search_engine.index.deltas]
+    assert len(sizes) <= 7 and sizes == sorted(sizes, reverse=True)
+    rebuilt = SearchEngine(corpus)
+    for word in ["virus", "motd", "uniquebd", "uniqueca"]:
+        doc_ids, tfs = search_engine.index.postings(search_engine.vocab[word], "tfs")
+        expected_ids, expected_tfs = rebuilt.index.postings(rebuilt.vocab[word], "tfs")
+        assert doc_ids[tfs > 0].tolist() == expected_ids.tolist()
+        assert tfs[tfs > 0].tolist() == expected_tfs.tolist()
+
+
+def test_search_engine_load_rejects_unknown_version(tmp_path):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    corpus.add_document(
+        RedditDocument("T1", "A1", "2022/01/01", "http://url1", "virus", 0)
+    )
+    SearchEngine(corpus).save(tmp_path / "index")
+    meta_file = tmp_path / "index" / "meta.json"
+    meta = meta_file.read_text().replace(f'"version": {INDEX_VERSION}', '"version": 99')
+    meta_file.write_text(meta)
+    with pytest.raises(ValueError):
+        SearchEngine.load(tmp_path / "index", corpus)
+
+
+def test_search_engine_parallel_build_is_identical():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    for i in range(40):
+        text = " ".join(f"mot{(i * j) % 23}" for j in range(i % 7 + 1)) + f" unique{i}"
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"A{i}", "2022/01/01", f"http://url{i}", text, 0)
+        )
+    serial = SearchEngine(corpus)
+    parallel = SearchEngine(corpus, n_jobs=2)
+    assert list(parallel.vocab.items()) == list(serial.vocab.items())
+    for name in ["data", "indices", "indptr"]:
+        expected = getattr(serial.mat_TF, name)
+        actual = getattr(parallel.mat_TF, name)
+        assert actual.dtype == expected.dtype
+        assert actual.tobytes() == expected.tobytes()
+
+
+def bm25_reference(corpus, keywords, k1=1.2, b=0.75, delta=0.0):
+    """
+    Calcule BM25 document par document, directement à partir des comptes de mots.
+    """
+    counts = {doc_id: doc.term_counts for doc_id, doc in corpus.id2doc.items()}
+    lengths = {doc_id: sum(c.values()) for doc_id, c in counts.items()}
+    average = sum(lengths.values()) / len(counts)
+    scores = {}
+    for word in keywords:
+        df = sum(word in c for c in counts.values())
+        idf = np.log(1 + (len(counts) - df + 0.5) / (df + 0.5))
+        for doc_id, c in counts.items():
+            if word in c:
+                tf = c[word]
+                norm = tf + k1 * (1 - b + b * lengths[doc_id] / average)
+                scores[doc_id] = scores.get(doc_id, 0) + idf * (tf * (k1 + 1) / norm + delta)
+    return scores
+
+
+def test_search_engine_bm25_matches_reference():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    texts = [
+        "vaccine trial results vaccine",
+        "vaccine",
+        "long report about masks masks masks and one vaccine mention in passing",
+        "masks outdoors",
+    ]
+    for i, text in enumerate(texts):
+        corpus.add_document(RedditDocument(f"T{i}", "A", "2022/01/01", f"http://u{i}", text, 0))
+    for scorer, delta in [(BM25Scorer(), 0.0), (BM25PlusScorer(), 1.0)]:
+        search_engine = SearchEngine(corpus, scorer=scorer)
+        expected = bm25_reference(corpus, ["vaccine", "masks"], delta=delta)
+        results = search_engine.search(["vaccine", "masks"], top_n=10)
+        assert results["Score"].dtype == np.float32
+        assert dict(zip(results["Document ID"], results["Score"])) == pytest.approx(expected)
+        assert list(results["Document ID"]) == sorted(expected, key=lambda d: -expected[d])
+    # Les longueurs suivent les ajouts et retraits incrémentaux
+    corpus.add_document(RedditDocument("T4", "A", "2022/01/01", "http://u4", "masks vaccine", 0))
+    corpus.remove_document(0)
+    results = search_engine.search(["vaccine", "masks"], top_n=10)
+    expected = bm25_reference(corpus, ["vaccine", "masks"], delta=1.0)
+    assert dict(zip(results["Document ID"], results["Score"])) == pytest.approx(expected)
+    _, doc_ids, scores = search_engine.search_batch([["vaccine", "masks"]], top_n=10)
+    assert dict(zip(doc_ids, scores)) == pytest.approx(expected)
+
+
+def test_search_engine_caches_results_until_the_index_changes():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    for i in range(4):
+        corpus.add_document(
+            RedditDocument(f"T{i}", f"Author {i % 2}", "2022/01/01", f"http://u{i}", "virus", 0)
+        )
+    search_engine = SearchEngine(corpus)
+    first = search_engine.search(["Virus"], author_filter="author 1")
+    # Mêmes termes normalisés et même filtre : le résultat vient du cache
+    again = search_engine.search(["virus", "VIRUS"], author_filter="AUTHOR 1")
+    assert again.equals(first)
+    assert search_engine.cache.stats["hits"] == 1
+    again.loc[0, "Score"] = -1
+    assert search_engine.search(["virus"], author_filter="author 1").equals(first)
+
+    corpus.add_document(RedditDocument("T4", "Author 1", "2022/01/01", "http://u4", "virus", 0))
+    updated = search_engine.search(["virus"], author_filter="author 1")
+    assert list(updated["Document ID"]) == [1, 3, 4]
+    assert search_engine.cache.stats["misses"] == 2
+
+
+def test_search_engine_cache_follows_scorer_parameters():
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    texts = ["virus", "virus virus virus mask mask mask mask", "virus mask"]
+    for i, text in enumerate(texts):
+        corpus.add_document(RedditDocument(f"T{i}", "A", "2022/01/01", f"http://u{i}", text, 0))
+    search_engine = SearchEngine(corpus, scorer=BM25Scorer())
+    before = search_engine.search(["virus"])
+    search_engine.scorer.b = 0.0
+    after = search_engine.search(["virus"])
+    assert search_engine.cache.stats["hits"] == 0
+    assert after.equals(SearchEngine(corpus, scorer=BM25Scorer(b=0.0)).search(["virus"]))
+    assert not np.allclose(after["Score"], before["Score"])
+
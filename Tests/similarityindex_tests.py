@@ -0,0 +1,63 @@
+import numpy as np
+from Classes.Corpus import Corpus
+from Classes.Document import RedditDocument
+from Classes.SearchEngine import SearchEngine
+from Classes.SimilarityIndex import SimilarityIndex
+
+TOPICS = [
+    ["vaccine", "dose", "booster", "trial", "pfizer", "moderna"],
+    ["mask", "school", "children", "classroom", "teacher", "outdoor"],
+    ["lockdown", "economy", "jobs", "restaurant", "closure", "business"],
+    ["variant", "omicron", "delta", "mutation", "spike", "sequencing"],
+]
+
+
+def build_engine(ndoc=200, seed=0):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    rng = np.random.default_rng(seed)
+    for i in range(ndoc):
+        words = rng.choice(TOPICS[i % len(TOPICS)], size=12)
+        corpus.add_document(
+            RedditDocument(f"T{i}", "A", "2022/01/01", f"http://u{i}", " ".join(words), 0)
+        )
+    return SearchEngine(corpus)
+
+
+def exact_similar(engine, doc_id, k):
+    matrix = engine.mat_TFxIDF
+    dot = np.asarray((matrix @ matrix[doc_id].T).todense()).ravel()
+    scores = dot / np.maximum(engine.doc_norms * engine.doc_norms[doc_id], 1e-12)
+    scores[doc_id] = -1
+    return np.argsort(-scores, kind="stable")[:k]
+
+
+### Tests pour la classe SimilarityIndex ###
+def test_similarity_index_matches_exact_when_probing_every_list():
+    engine = build_engine()
+    index = SimilarityIndex(engine, dim=8, n_lists=6, n_probe=1)
+    for doc_id in [0, 5, 42]:
+        doc_ids, scores = index.similar(doc_id, k=10, n_probe=index.n_lists)
+        assert doc_ids.tolist() == exact_similar(engine, doc_id, 10).tolist()
+        assert np.all(np.diff(scores) <= 0)
+        # Les voisins approchés restent dans le même thème
+        approximate, _ = index.similar(doc_id, k=10)
+        assert all(other % len(TOPICS) == doc_id % len(TOPICS) for other in approximate)
+
+
+def test_similar_documents_follows_corpus_and_is_saved(tmp_path):
+    engine = build_engine()
+    engine.build_similarity_index(dim=8, n_lists=4, n_probe=1)
+    corpus = engine.corpus
+    corpus.remove_document(4)
+    new_id = corpus.add_document(
+        RedditDocument("N", "B", "2022/01/01", "http://new", "vaccine dose booster trial", 0)
+    )
+    results = engine.similar_documents(0, top_n=300)
+    assert new_id in set(results["Document ID"])
+    assert 4 not in set(results["Document ID"]) and 0 not in set(results["Document ID"])
+
+    engine.save(tmp_path / "index")
+    loaded = SearchEngine.load(tmp_path / "index", corpus)
+    assert loaded.similarity_index is not None
+    assert loaded.similar_documents(0, top_n=5).equals(engine.similar_documents(0, top_n=5))
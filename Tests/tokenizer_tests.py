@@ -0,0 +1,29 @@
+from tokenizer import NO_STOPWORDS, token_ids, tokenize, tokenize_with_offsets
+from utils import clean_text, remove_stopwords
+
+
+### Tests pour le module tokenizer ###
+def test_tokenize_normalises_and_filters_stopwords():
+    text = "The COVID-19 vaccine, it's here!\nÉtude_2021 sur l'ARN"
+    assert tokenize(text) == ["covid", "vaccine", "s", "étude", "sur", "l", "arn"]
+    assert tokenize(text, NO_STOPWORDS)[:2] == ["the", "covid"]
+    assert clean_text(text) == " ".join(tokenize(text, NO_STOPWORDS))
+    assert remove_stopwords(text) == " ".join(tokenize(text))
+
+
+def test_tokenize_with_offsets_and_token_ids():
+    text = "Le Virus, the virus"
+    assert tokenize_with_offsets(text) == [("le", 0, 2), ("virus", 3, 8), ("virus", 14, 19)]
+    vocab = {"virus": 0}
+    assert token_ids(text, vocab) == [0, 0]
+    assert token_ids(text, vocab, add_missing=True) == [1, 0, 0]
+    assert vocab == {"virus": 0, "le": 1}
+
+
+def test_tokenize_and_offsets_agree_when_lowercasing_changes_length():
+    text = "İstanbul et Ankara"
+    words = tokenize(text, NO_STOPWORDS)
+    assert words == ["i̇stanbul", "et", "ankara"]
+    offsets = tokenize_with_offsets(text, NO_STOPWORDS)
+    assert [word for word, _, _ in offsets] == words
+    assert [text[start:end] for _, start, end in offsets] == ["İstanbul", "et", "Ankara"]
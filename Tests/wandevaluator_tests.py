@@ -0,0 +1,79 @@
+import numpy as np
+from Classes.Corpus import Corpus
+from Classes.Document import RedditDocument
+from Classes.Scorer import BM25PlusScorer, BM25Scorer, CosineScorer
+from Classes.SearchEngine import SearchEngine, top_k
+from Classes.WandEvaluator import WandEvaluator
+
+WORDS = ["virus", "vaccine", "mask", "trial", "booster", "lockdown", "variant", "school"]
+FREQUENCIES = [0.4, 0.2, 0.15, 0.1, 0.06, 0.04, 0.03, 0.02]
+
+
+def build_engine(scorer, ndoc=300, seed=0):
+    Corpus.reset_instance()
+    corpus = Corpus("Test Corpus")
+    rng = np.random.default_rng(seed)
+    for i in range(ndoc):
+        # Mots de fréquences très différentes pour que l'élagage ait prise
+        words = rng.choice(WORDS, size=rng.integers(3, 30), p=FREQUENCIES)
+        corpus.add_document(
+            RedditDocument(
+                f"T{i}", "A", f"{2020 + i % 3}/01/01", f"http://u{i}", " ".join(words), 0
+            )
+        )
+    return SearchEngine(corpus, scorer=scorer)
+
+
+def exhaustive(engine, term_ids, k):
+    doc_ids, scores = engine.scorer.score(engine, term_ids)
+    selected = top_k(scores, k)
+    return doc_ids[selected], scores[selected]
+
+
+### Tests pour la classe WandEvaluator ###
+def test_wand_matches_exhaustive_scoring():
+    for scorer in [CosineScorer(), BM25Scorer(), BM25PlusScorer()]:
+        engine = build_engine(scorer)
+        evaluator = WandEvaluator(engine)
+        for query in [WORDS[:2], WORDS[2:6], WORDS, ["school"]]:
+            term_ids = engine.query_term_ids(query)
+            for k in [1, 5, 20]:
+                doc_ids, scores, stats = evaluator.top_k(term_ids, k)
+                expected_ids, expected_scores = exhaustive(engine, term_ids, k)
+                assert doc_ids.tolist() == expected_ids.tolist()
+                assert scores.tolist() == expected_scores.tolist()
+                assert stats["visited"] + stats["skipped"] == stats["postings"]
+
+
+def test_wand_skips_postings_and_search_prune_is_identical():
+    engine = build_engine(BM25Scorer())
+    term_ids = engine.query_term_ids(["virus", "school", "variant"])
+    _, _, stats = WandEvaluator(engine).top_k(term_ids, 3)
+    assert stats["skipped"] > 0
+    assert stats["evaluated"] < len(engine.scorer.score(engine, term_ids)[0])
+
+    # Documents retirés et segment delta de l'index
+    engine.corpus.remove_document(5)
+    for i in range(3):
+        engine.corpus.add_document(
+            RedditDocument(f"N{i}", "B", "2021/06/01", f"http://n{i}", "school virus " * (i + 1), 0)
+        )
+    for filters in [{}, {"year_filter": 2021}, {"author_filter": "a"}]:
+        pruned = engine.search(["virus", "school"], top_n=7, prune=True, **filters)
+        full = engine.search(["virus", "school"], top_n=7, **filters)
+        assert pruned["Document ID"].tolist() == full["Document ID"].tolist()
+        assert pruned["Score"].tolist() == full["Score"].tolist()
+    assert engine.query_stats["postings"] > 0
+
+
+def test_wand_reuses_clean_scratch_buffers():
+    engine = build_engine(BM25Scorer())
+    evaluator = engine.evaluator
+    term_ids = engine.query_term_ids(WORDS[:5])
+    first = evaluator.top_k(term_ids, 5)
+    sums = evaluator.sums
+    assert not sums.any() and not evaluator.pending.any() and not evaluator.evaluated.any()
+    second = evaluator.top_k(term_ids, 5)
+    assert evaluator.sums is sums
+    assert first[0].tolist() == second[0].tolist()
+    assert np.array_equal(first[1], second[1])
@@ -0,0 +1,100 @@
+import re
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Un mot : suite de lettres (accentuées comprises) ; chiffres, ponctuation et
+# soulignés séparent les mots
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+")
+
+STOPWORDS = frozenset(ENGLISH_STOP_WORDS)
+NO_STOPWORDS = frozenset()
+
+
+def search_text(text):
+    """
+    Retourne le texte dans lequel chercher les mots, commun à `tokenize` et
+    `tokenize_with_offsets` pour qu'ils découpent un texte de la même façon.
+
+    Mettre tout le texte en minuscules avant la recherche est plus rapide que de
+    convertir chaque mot, et donne les mêmes mots aux mêmes positions tant que chaque
+    caractère reste un seul caractère. Sinon (« İ » devient « i » suivi d'un point
+    combinant, qui n'est pas une lettre et couperait le mot), les mots sont cherchés
+    dans le texte d'origine puis mis en minuscules un à un.
+
+    Args:
+        text (str): Texte à découper.
+
+    Returns:
+        tuple:
+            - text (str): Texte à parcourir, de même longueur que `text`.
+            - lower_words (bool): Si chaque mot trouvé doit encore être mis en
+              minuscules.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered, False
+    return text, True
+
+
+def tokenize(text, stopwords=STOPWORDS):
+    """
+    Découpe un texte en mots normalisés (en minuscules), sans les mots vides, en un
+    seul parcours par une expression régulière précompilée.
+
+    C'est le découpage utilisé dans tout le projet (moteur de recherche, index
+    positionnel, statistiques, détection de doublons) : un même texte donne partout
+    les mêmes mots.
+
+    Args:
+        text (str): Texte à découper.
+        stopwords (frozenset, optional): Mots à ignorer. Par défaut, les mots vides
+            anglais ; `NO_STOPWORDS` pour tout garder.
+
+    Returns:
+        list: Mots du texte, dans l'ordre.
+    """
+    text, lower_words = search_text(text)
+    words = TOKEN_PATTERN.findall(text)
+    if lower_words:
+        words = map(str.lower, words)
+    return [word for word in words if word not in stopwords]
+
+
+def tokenize_with_offsets(text, stopwords=STOPWORDS):
+    """
+    Découpe un texte comme `tokenize`, en conservant la position de chaque mot.
+
+    Args:
+        text (str): Texte à découper.
+        stopwords (frozenset, optional): Mots à ignorer.
+
+    Returns:
+        list: Triplets `(mot, début, fin)`, les positions étant des indices de
+              caractères dans `text`.
+    """
+    tokens = []
+    text, lower_words = search_text(text)
+    for match in TOKEN_PATTERN.finditer(text):
+        word = match.group().lower() if lower_words else match.group()
+        if word not in stopwords:
+            tokens.append((word, match.start(), match.end()))
+    return tokens
+
+
+def token_ids(text, vocab, add_missing=False, stopwords=STOPWORDS):
+    """
+    Découpe un texte et retourne directement les identifiants de ses mots dans un
+    vocabulaire.
+
+    Args:
+        text (str): Texte à découper.
+        vocab (dict): Vocabulaire associant chaque mot à son identifiant.
+        add_missing (bool, optional): Ajouter au vocabulaire les mots inconnus (avec
+            l'identifiant suivant) plutôt que de les ignorer.
+        stopwords (frozenset, optional): Mots à ignorer.
+
+    Returns:
+        list: Identifiants des mots du texte, dans l'ordre.
+    """
+    if add_missing:
+        return [vocab.setdefault(word, len(vocab)) for word in tokenize(text, stopwords)]
+    return [vocab[word] for word in tokenize(text, stopwords) if word in vocab]
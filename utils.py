@@ -1,27 +1,18 @@
-import re
-from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from tokenizer import NO_STOPWORDS, tokenize
+
 
 def clean_text(text):
-    text = text.lower()
-    text = re.sub(r"\d+", "", text)
-    text = re.sub(r"[^\w\s]", "", text)
-    text = text.replace("\n", " ")
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    return " ".join(tokenize(text, NO_STOPWORDS))
 
 
 def build_vocabulary(full_text):
-    cleaned_text = clean_text(full_text)
-    words = cleaned_text.split()
-    return set(words)
+    return set(tokenize(full_text, NO_STOPWORDS))
 
 
 def count_occurrences(full_text):
-    cleaned_text = clean_text(full_text)
-    words = cleaned_text.split()
     frequency_table = {}
 
-    for word in words:
+    for word in tokenize(full_text, NO_STOPWORDS):
         if word in frequency_table:
             frequency_table[word] += 1
         else:
@@ -34,8 +25,7 @@ def count_document_frequency(documents):
     document_frequency = {}
 
     for document in documents:
-        cleaned_text = clean_text(document)
-        words = set(cleaned_text.split())
+        words = set(tokenize(document, NO_STOPWORDS))
 
         for word in words:
             if word in document_frequency:
@@ -46,6 +36,4 @@ def count_document_frequency(documents):
     return document_frequency
 
 def remove_stopwords(text):
-    words = text.split()
-    filtered_words = [word for word in words if word.lower() not in ENGLISH_STOP_WORDS]
-    return " ".join(filtered_words)
\ No newline at end of file
+    return " ".join(tokenize(text))